@@ -0,0 +1,533 @@
+"""
+A deterministic, in-memory stand-in for the ``prisma.models.<Model>.prisma()`` actions.
+
+It implements the subset of the Prisma Client Python query API the services
+use (filters, nested includes, ordering, cursors and nested writes), keeps the
+rows of every table in plain dictionaries and returns real ``prisma.models``
+instances, so the services run unchanged but without a database. The time
+spent inside the stand-in itself is accumulated in ``InMemoryDatabase.elapsed``
+so that benchmarks can report the services' own overhead separately.
+
+Foreign keys are not enforced: deleting a row leaves rows that referenced it
+in place, whereas Postgres would reject the delete.
+
+The generated client is still required (run ``prisma generate``), but no
+database connection is made.
+"""
+
+import contextlib
+import itertools
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import prisma
+import prisma.models
+
+# model -> relation field -> (related model, kind, foreign key). "many" keeps
+# the foreign key on the related rows, "one" on the model's own rows; "m2m"
+# relations go through a join set named by the third item.
+RELATIONS: Dict[str, Dict[str, Tuple[str, str, str]]] = {
+    "User": {
+        "profiles": ("Profile", "many", "userId"),
+        "bookings": ("Booking", "many", "userId"),
+        "notifications": ("Notification", "many", "userId"),
+    },
+    "Profile": {
+        "user": ("User", "one", "userId"),
+        "favorites": ("Professional", "m2m", "UserFavorites"),
+    },
+    "Professional": {
+        "availableSlots": ("Slot", "many", "professionalId"),
+        "favoritesBy": ("Profile", "m2m", "UserFavorites"),
+    },
+    "Slot": {
+        "professional": ("Professional", "one", "professionalId"),
+        "bookings": ("Booking", "many", "slotId"),
+    },
+    "Booking": {
+        "user": ("User", "one", "userId"),
+        "slot": ("Slot", "one", "slotId"),
+    },
+    "Notification": {
+        "user": ("User", "one", "userId"),
+    },
+}
+
+SCALARS: Dict[str, Tuple[str, ...]] = {
+    "User": ("id", "email", "password", "role"),
+    "Profile": ("id", "userId", "firstName", "lastName", "phoneNumber"),
+    "Professional": ("id", "email", "specialty"),
+    "Slot": ("id", "startTime", "endTime", "professionalId", "isActive"),
+    "Booking": ("id", "userId", "slotId", "createdAt", "status"),
+    "Notification": ("id", "userId", "message", "createdAt", "read"),
+}
+
+DEFAULTS: Dict[str, Dict[str, Callable[[], Any]]] = {
+    "Profile": {"phoneNumber": lambda: None},
+    "Slot": {"isActive": lambda: True},
+    "Booking": {"createdAt": datetime.now},
+    "Notification": {"createdAt": datetime.now, "read": lambda: False},
+}
+
+
+class FakeRecordNotFoundError(LookupError):
+    pass
+
+
+def _value(value: Any) -> Any:
+    # Enum members compare by their string value, like Prisma's query engine.
+    return getattr(value, "value", value)
+
+
+def _scalar_matches(actual: Any, condition: Any) -> bool:
+    if not isinstance(condition, dict):
+        return _value(actual) == _value(condition)
+    actual = _value(actual)
+    for operator, expected in condition.items():
+        if expected is None and operator != "equals":
+            continue
+        if operator == "equals":
+            ok = actual == _value(expected)
+        elif operator == "not":
+            ok = not _scalar_matches(actual, expected)
+        elif operator == "in":
+            ok = actual in [_value(item) for item in expected]
+        elif operator == "not_in":
+            ok = actual not in [_value(item) for item in expected]
+        elif operator == "lt":
+            ok = actual is not None and actual < expected
+        elif operator == "lte":
+            ok = actual is not None and actual <= expected
+        elif operator == "gt":
+            ok = actual is not None and actual > expected
+        elif operator == "gte":
+            ok = actual is not None and actual >= expected
+        elif operator == "contains":
+            ok = actual is not None and expected in actual
+        elif operator == "startswith":
+            ok = actual is not None and actual.startswith(expected)
+        elif operator == "endswith":
+            ok = actual is not None and actual.endswith(expected)
+        elif operator == "mode":
+            continue
+        else:
+            raise ValueError(f"Unsupported filter operator {operator!r}")
+        if not ok:
+            return False
+    return True
+
+
+class InMemoryDatabase:
+    """
+    Tables of rows keyed by id, plus the implicit many-to-many join sets.
+    """
+
+    def __init__(self) -> None:
+        self.tables: Dict[str, Dict[int, Dict[str, Any]]] = {
+            model: {} for model in SCALARS
+        }
+        self.joins: Dict[str, set] = {"UserFavorites": set()}
+        self._ids = {model: itertools.count(1) for model in SCALARS}
+        self.elapsed = 0.0
+        self.queries = 0
+
+    # -- data loading -----------------------------------------------------
+
+    def insert(self, model: str, **values: Any) -> Dict[str, Any]:
+        """
+        Inserts a row directly, filling defaults and the id. Used to build datasets.
+        """
+        row = {field: None for field in SCALARS[model]}
+        for field, default in DEFAULTS.get(model, {}).items():
+            row[field] = default()
+        row.update(values)
+        if row.get("id") is None:
+            row["id"] = next(self._ids[model])
+        else:
+            self._ids[model] = itertools.count(
+                max(row["id"] + 1, next(self._ids[model]))
+            )
+        self.tables[model][row["id"]] = row
+        return row
+
+    def favorite(self, profile_id: int, professional_id: int) -> None:
+        self.joins["UserFavorites"].add((profile_id, professional_id))
+
+    # -- relations ----------------------------------------------------------
+
+    def _related(
+        self, model: str, row: Dict[str, Any], field: str
+    ) -> List[Dict[str, Any]]:
+        target, kind, key = RELATIONS[model][field]
+        table = self.tables[target]
+        if kind == "many":
+            return [other for other in table.values() if other[key] == row["id"]]
+        if kind == "one":
+            other = table.get(row[key])
+            return [other] if other is not None else []
+        pairs = self.joins[key]
+        if model == "Profile":
+            ids = [pro for profile, pro in pairs if profile == row["id"]]
+        else:
+            ids = [profile for profile, pro in pairs if pro == row["id"]]
+        return [table[other_id] for other_id in sorted(ids) if other_id in table]
+
+    def _related_index(
+        self, model: str, field: str
+    ) -> Callable[[Dict[str, Any]], List[Dict[str, Any]]]:
+        # Groups the related table once per query instead of scanning it for
+        # every parent row.
+        target, kind, key = RELATIONS[model][field]
+        if kind != "many":
+            return lambda row: self._related(model, row, field)
+        grouped: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+        for other in self.tables[target].values():
+            grouped[other[key]].append(other)
+        return lambda row: grouped.get(row["id"], [])
+
+    # -- filtering ----------------------------------------------------------
+
+    def matches(self, model: str, row: Dict[str, Any], where: Optional[dict]) -> bool:
+        if not where:
+            return True
+        for field, condition in where.items():
+            if condition is None:
+                continue
+            if field == "AND":
+                conditions = condition if isinstance(condition, list) else [condition]
+                if not all(self.matches(model, row, c) for c in conditions):
+                    return False
+            elif field == "OR":
+                if not any(self.matches(model, row, c) for c in condition):
+                    return False
+            elif field == "NOT":
+                conditions = condition if isinstance(condition, list) else [condition]
+                if any(self.matches(model, row, c) for c in conditions):
+                    return False
+            elif field in RELATIONS[model]:
+                if not self._relation_matches(model, row, field, condition):
+                    return False
+            elif field in SCALARS[model]:
+                if not _scalar_matches(row[field], condition):
+                    return False
+            else:
+                raise ValueError(f"Unknown field {field!r} on {model}")
+        return True
+
+    def _relation_matches(
+        self, model: str, row: Dict[str, Any], field: str, condition: dict
+    ) -> bool:
+        target, kind, _ = RELATIONS[model][field]
+        related = self._related(model, row, field)
+        if kind == "one":
+            if "is" in condition or "is_not" in condition:
+                if "is" in condition:
+                    return any(
+                        self.matches(target, r, condition["is"]) for r in related
+                    )
+                return not any(
+                    self.matches(target, r, condition["is_not"]) for r in related
+                )
+            return any(self.matches(target, r, condition) for r in related)
+        if "some" in condition:
+            return any(self.matches(target, r, condition["some"]) for r in related)
+        if "every" in condition:
+            return all(self.matches(target, r, condition["every"]) for r in related)
+        if "none" in condition:
+            return not any(self.matches(target, r, condition["none"]) for r in related)
+        raise ValueError(f"Unsupported relation filter on {model}.{field}")
+
+    def select(
+        self,
+        model: str,
+        rows: List[Dict[str, Any]],
+        where: Optional[dict] = None,
+        order: Any = None,
+        cursor: Optional[dict] = None,
+        skip: Optional[int] = None,
+        take: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        rows = [row for row in rows if self.matches(model, row, where)]
+        orders = order if isinstance(order, list) else [order] if order else []
+        for clause in reversed(orders):
+            ((field, direction),) = clause.items()
+            rows.sort(
+                key=lambda row: (row[field] is None, _value(row[field])),
+                reverse=direction == "desc",
+            )
+        if cursor:
+            position = next(
+                (i for i, row in enumerate(rows) if self.matches(model, row, cursor)),
+                len(rows),
+            )
+            rows = rows[position:]
+        if skip:
+            rows = rows[skip:]
+        if take is not None:
+            rows = rows[:take]
+        return rows
+
+    def shape(
+        self, model: str, rows: List[Dict[str, Any]], include: Optional[dict]
+    ) -> List[Dict[str, Any]]:
+        """
+        Copies rows and attaches the included relations, recursively.
+        """
+        shaped = [dict(row) for row in rows]
+        for field, args in (include or {}).items():
+            if not args:
+                continue
+            args = args if isinstance(args, dict) else {}
+            target, kind, _ = RELATIONS[model][field]
+            related = self._related_index(model, field)
+            selected = [
+                self.select(
+                    target,
+                    related(original),
+                    where=args.get("where"),
+                    order=args.get("order_by"),
+                    cursor=args.get("cursor"),
+                    skip=args.get("skip"),
+                    take=args.get("take"),
+                )
+                for original in rows
+            ]
+            # Nested includes are resolved once for the related rows of every
+            # parent together, then handed back to their parents in order.
+            nested = iter(
+                self.shape(
+                    target,
+                    [other for others in selected for other in others],
+                    args.get("include"),
+                )
+            )
+            for row, others in zip(shaped, selected):
+                others = [next(nested) for _ in others]
+                row[field] = (
+                    (others[0] if others else None) if kind == "one" else others
+                )
+        return shaped
+
+    # -- writes ---------------------------------------------------------------
+
+    def write(self, model: str, row: Dict[str, Any], data: dict) -> None:
+        nested = []
+        for field, value in data.items():
+            if field in RELATIONS[model]:
+                nested.append((field, value))
+            elif field in SCALARS[model]:
+                row[field] = _value(value)
+            else:
+                raise ValueError(f"Unknown field {field!r} on {model}")
+        for field, operations in nested:
+            self._write_relation(model, row, field, operations)
+
+    def _write_relation(
+        self, model: str, row: Dict[str, Any], field: str, operations: dict
+    ) -> None:
+        target, kind, key = RELATIONS[model][field]
+        for operation, value in operations.items():
+            items = value if isinstance(value, list) else [value]
+            if kind == "m2m":
+                pairs = self.joins[key]
+                ids = [
+                    other["id"]
+                    for item in items
+                    for other in self.tables[target].values()
+                    if self.matches(target, other, item)
+                ]
+                own = (
+                    (lambda other_id: (row["id"], other_id))
+                    if model == "Profile"
+                    else (lambda other_id: (other_id, row["id"]))
+                )
+                if operation == "set":
+                    pairs.difference_update(
+                        {
+                            pair
+                            for pair in pairs
+                            if pair[0 if model == "Profile" else 1] == row["id"]
+                        }
+                    )
+                    operation = "connect"
+                if operation == "connect":
+                    pairs.update(own(other_id) for other_id in ids)
+                elif operation == "disconnect":
+                    pairs.difference_update(own(other_id) for other_id in ids)
+                else:
+                    raise ValueError(f"Unsupported nested write {operation!r}")
+            elif kind == "many" and operation == "create":
+                for item in items:
+                    self.write(target, self.insert(target, **{key: row["id"]}), item)
+            elif kind == "one" and operation == "connect":
+                ((unique, unique_value),) = items[0].items()
+                row[key] = unique_value if unique == "id" else None
+            else:
+                raise ValueError(f"Unsupported nested write {operation!r} on {field}")
+
+
+class FakeActions:
+    """
+    Mirrors the async actions returned by ``prisma.models.<Model>.prisma()``.
+    """
+
+    def __init__(self, db: InMemoryDatabase, model: type) -> None:
+        self._db = db
+        self._model = model
+        self._name = model.__name__
+
+    @contextlib.contextmanager
+    def _timed(self) -> Iterator[None]:
+        self._db.queries += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._db.elapsed += time.perf_counter() - started
+
+    def _parse(self, rows: List[Dict[str, Any]]) -> List[Any]:
+        return [self._model.model_validate(row) for row in rows]
+
+    def _table(self) -> List[Dict[str, Any]]:
+        return list(self._db.tables[self._name].values())
+
+    async def find_many(
+        self,
+        take: Optional[int] = None,
+        skip: Optional[int] = None,
+        where: Optional[dict] = None,
+        cursor: Optional[dict] = None,
+        include: Optional[dict] = None,
+        order: Any = None,
+        distinct: Optional[List[str]] = None,
+    ) -> List[Any]:
+        with self._timed():
+            rows = self._db.select(
+                self._name, self._table(), where, order, cursor, skip, take
+            )
+            rows = self._db.shape(self._name, rows, include)
+        return self._parse(rows)
+
+    async def find_first(
+        self,
+        skip: Optional[int] = None,
+        where: Optional[dict] = None,
+        cursor: Optional[dict] = None,
+        include: Optional[dict] = None,
+        order: Any = None,
+        distinct: Optional[List[str]] = None,
+    ) -> Optional[Any]:
+        results = await self.find_many(
+            take=1, skip=skip, where=where, cursor=cursor, include=include, order=order
+        )
+        return results[0] if results else None
+
+    async def find_unique(
+        self, where: dict, include: Optional[dict] = None
+    ) -> Optional[Any]:
+        return await self.find_first(where=where, include=include)
+
+    async def count(self, where: Optional[dict] = None, **kwargs: Any) -> int:
+        with self._timed():
+            return len(self._db.select(self._name, self._table(), where))
+
+    async def create(self, data: dict, include: Optional[dict] = None) -> Any:
+        with self._timed():
+            row = self._db.insert(self._name)
+            self._db.write(self._name, row, data)
+            (shaped,) = self._db.shape(self._name, [row], include)
+        return self._parse([shaped])[0]
+
+    async def create_many(
+        self, data: List[dict], *, skip_duplicates: Optional[bool] = None
+    ) -> int:
+        with self._timed():
+            for item in data:
+                self._db.write(self._name, self._db.insert(self._name), item)
+        return len(data)
+
+    async def update(
+        self, data: dict, where: dict, include: Optional[dict] = None
+    ) -> Optional[Any]:
+        with self._timed():
+            rows = self._db.select(self._name, self._table(), where, take=1)
+            if not rows:
+                return None
+            self._db.write(self._name, rows[0], data)
+            (shaped,) = self._db.shape(self._name, rows, include)
+        return self._parse([shaped])[0]
+
+    async def update_many(self, data: dict, where: dict) -> int:
+        with self._timed():
+            rows = self._db.select(self._name, self._table(), where)
+            for row in rows:
+                self._db.write(self._name, row, data)
+        return len(rows)
+
+    async def delete(
+        self, where: dict, include: Optional[dict] = None
+    ) -> Optional[Any]:
+        with self._timed():
+            rows = self._db.select(self._name, self._table(), where, take=1)
+            if not rows:
+                return None
+            (shaped,) = self._db.shape(self._name, rows, include)
+            del self._db.tables[self._name][rows[0]["id"]]
+        return self._parse([shaped])[0]
+
+    async def delete_many(self, where: Optional[dict] = None) -> int:
+        with self._timed():
+            rows = self._db.select(self._name, self._table(), where)
+            for row in rows:
+                del self._db.tables[self._name][row["id"]]
+        return len(rows)
+
+
+class FakeClient:
+    """
+    Stands in for the registered client where services use it directly (raw SQL).
+    """
+
+    def __init__(self, db: InMemoryDatabase) -> None:
+        self._db = db
+
+    async def execute_raw(self, query: str, *args: Any) -> int:
+        return 0
+
+    def is_connected(self) -> bool:
+        return True
+
+
+@contextlib.contextmanager
+def installed(db: InMemoryDatabase) -> Iterator[InMemoryDatabase]:
+    """
+    Routes ``prisma.models.<Model>.prisma()`` and ``prisma.get_client()`` to the
+    in-memory database for the duration of the block.
+
+    Args:
+        db (InMemoryDatabase): The database the services should read and write.
+
+    Yields:
+        InMemoryDatabase: The same database, for convenience.
+    """
+    originals = {
+        name: getattr(prisma.models, name).__dict__.get("prisma") for name in SCALARS
+    }
+    original_get_client = prisma.get_client
+    client = FakeClient(db)
+    try:
+        for name in SCALARS:
+            model = getattr(prisma.models, name)
+            model.prisma = classmethod(lambda cls, client=None: FakeActions(db, cls))
+        prisma.get_client = lambda: client
+        yield db
+    finally:
+        for name, original in originals.items():
+            model = getattr(prisma.models, name)
+            if original is None:
+                del model.prisma
+            else:
+                model.prisma = original
+        prisma.get_client = original_get_client
@@ -0,0 +1,408 @@
+"""
+Replays a realistic mix of traffic against a running Availability Checker and
+reports throughput and latency percentiles per route.
+
+The ids used in requests are sampled from the database the app is connected
+to, which is normally seeded with benchmarks/seed.sql first. Every virtual
+user has its own seeded random generator, so the same arguments produce the
+same sequence of requests. Reports are JSON and can be compared between builds:
+
+    python -m benchmarks.loadtest run --users 50 --duration 60 --report before.json
+    python -m benchmarks.loadtest run --users 50 --duration 60 --report after.json
+    python -m benchmarks.loadtest compare before.json after.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import asyncpg
+import httpx
+import project.events
+from dotenv import load_dotenv
+
+# Scenario name -> relative weight of the default traffic mix.
+DEFAULT_MIX = {
+    "check_availability": 30,
+    "all_availability": 2,
+    "list_schedules": 20,
+    "book": 10,
+    "fetch_notifications": 28,
+    "read_notification": 10,
+}
+
+SAMPLE_SIZE = 20_000
+
+
+@dataclass
+class Targets:
+    """
+    Ids sampled from the database that requests are built from.
+    """
+
+    professional_ids: List[int]
+    user_ids: List[int]
+    slots: List[Tuple[int, int]]
+    notification_ids: List[int]
+
+
+async def load_targets(database_url: str) -> Targets:
+    """
+    Samples the ids requests are made for, so that they hit existing rows.
+
+    Args:
+        database_url (str): The connection string of the database the app uses.
+
+    Returns:
+        Targets: Professional, user, upcoming active slot and notification ids.
+    """
+    connection = await asyncpg.connect(project.events.listener_dsn(database_url))
+    try:
+        professionals = await connection.fetch(
+            'SELECT "id" FROM "Professional" ORDER BY random() LIMIT $1', SAMPLE_SIZE
+        )
+        users = await connection.fetch(
+            'SELECT "id" FROM "User" ORDER BY random() LIMIT $1', SAMPLE_SIZE
+        )
+        slots = await connection.fetch(
+            'SELECT "id", "professionalId" FROM "Slot" '
+            'WHERE "isActive" AND "startTime" > now() ORDER BY random() LIMIT $1',
+            SAMPLE_SIZE,
+        )
+        notifications = await connection.fetch(
+            'SELECT "id" FROM "Notification" ORDER BY random() LIMIT $1', SAMPLE_SIZE
+        )
+    finally:
+        await connection.close()
+    targets = Targets(
+        sorted(row["id"] for row in professionals),
+        sorted(row["id"] for row in users),
+        sorted((row["id"], row["professionalId"]) for row in slots),
+        sorted(row["id"] for row in notifications),
+    )
+    if not (targets.professional_ids and targets.user_ids and targets.slots):
+        raise SystemExit("The database is empty; seed it with benchmarks/seed.sql")
+    return targets
+
+
+# A request: (route template used in the report, method, url, query parameters)
+Request = Tuple[str, str, str, Dict[str, Any]]
+
+
+def _check_availability(rng: random.Random, targets: Targets) -> Request:
+    start = datetime.now(timezone.utc).replace(microsecond=0)
+    return (
+        "GET /availability",
+        "GET",
+        "/availability",
+        {
+            "professionalId": rng.choice(targets.professional_ids),
+            "startDate": start.isoformat(),
+            "endDate": (start + timedelta(days=7)).isoformat(),
+        },
+    )
+
+
+def _all_availability(rng: random.Random, targets: Targets) -> Request:
+    return ("GET /availability/all", "GET", "/availability/all", {})
+
+
+def _list_schedules(rng: random.Random, targets: Targets) -> Request:
+    professional_id = rng.choice(targets.professional_ids)
+    return (
+        "GET /schedules/{professionalId}",
+        "GET",
+        f"/schedules/{professional_id}",
+        {},
+    )
+
+
+def _book(rng: random.Random, targets: Targets) -> Request:
+    slot_id, professional_id = rng.choice(targets.slots)
+    return (
+        "POST /book",
+        "POST",
+        "/book",
+        {
+            "userId": rng.choice(targets.user_ids),
+            "professionalId": professional_id,
+            "slotId": slot_id,
+        },
+    )
+
+
+def _fetch_notifications(rng: random.Random, targets: Targets) -> Request:
+    return (
+        "GET /notifications",
+        "GET",
+        "/notifications",
+        {"user_id": rng.choice(targets.user_ids)},
+    )
+
+
+def _read_notification(rng: random.Random, targets: Targets) -> Request:
+    notification_id = rng.choice(targets.notification_ids)
+    return (
+        "PATCH /notifications/{id}",
+        "PATCH",
+        f"/notifications/{notification_id}",
+        {"read": "true", "updater_role": "REGISTERED_USER"},
+    )
+
+
+SCENARIOS: Dict[str, Callable[[random.Random, Targets], Request]] = {
+    "check_availability": _check_availability,
+    "all_availability": _all_availability,
+    "list_schedules": _list_schedules,
+    "book": _book,
+    "fetch_notifications": _fetch_notifications,
+    "read_notification": _read_notification,
+}
+
+
+def parse_mix(entries: Optional[List[str]]) -> Dict[str, int]:
+    """
+    Applies ``scenario=weight`` overrides to the default mix; a weight of 0 disables a scenario.
+    """
+    mix = dict(DEFAULT_MIX)
+    for entry in entries or ():
+        name, _, weight = entry.partition("=")
+        if name not in SCENARIOS or not weight.isdigit():
+            raise SystemExit(
+                f"Invalid --mix {entry!r}; expected one of {sorted(SCENARIOS)}=<weight>"
+            )
+        mix[name] = int(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+class Recorder:
+    """
+    Collects the latency and outcome of every request made after the warmup.
+    """
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    def record(self, route: str, status: str, seconds: float) -> None:
+        if not self.recording:
+            return
+        self.latencies[route].append(seconds * 1000)
+        self.statuses[route][status] += 1
+        if not status.isdigit() or int(status) >= 500:
+            self.errors[route] += 1
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    targets: Targets,
+    mix: Dict[str, int],
+    rng: random.Random,
+    recorder: Recorder,
+    deadline: float,
+    think_time: float,
+) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.monotonic() < deadline:
+        route, method, url, params = SCENARIOS[rng.choices(names, weights)[0]](
+            rng, targets
+        )
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, params=params)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        recorder.record(route, status, time.perf_counter() - started)
+        if think_time:
+            await asyncio.sleep(rng.expovariate(1 / think_time))
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], errors: int, seconds: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": len(ordered) / seconds,
+        "mean_ms": sum(ordered) / len(ordered),
+        "p50_ms": _percentile(ordered, 50),
+        "p95_ms": _percentile(ordered, 95),
+        "p99_ms": _percentile(ordered, 99),
+        "max_ms": ordered[-1],
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    targets = await load_targets(args.database_url)
+    recorder = Recorder()
+    started_at = datetime.now(timezone.utc).isoformat()
+    limits = httpx.Limits(
+        max_connections=args.users, max_keepalive_connections=args.users
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        deadline = time.monotonic() + args.warmup + args.duration
+        users = [
+            asyncio.create_task(
+                virtual_user(
+                    client,
+                    targets,
+                    mix,
+                    random.Random(f"{args.seed}:{index}"),
+                    recorder,
+                    deadline,
+                    args.think_time,
+                )
+            )
+            for index in range(args.users)
+        ]
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+        started = time.monotonic()
+        await asyncio.gather(*users)
+        elapsed = time.monotonic() - started
+    routes = {
+        route: {
+            **summarize(latencies, recorder.errors[route], elapsed),
+            "statuses": dict(recorder.statuses[route]),
+        }
+        for route, latencies in sorted(recorder.latencies.items())
+    }
+    every = [
+        latency for latencies in recorder.latencies.values() for latency in latencies
+    ]
+    return {
+        "meta": {
+            "label": args.label,
+            "base_url": args.base_url,
+            "users": args.users,
+            "duration_seconds": elapsed,
+            "warmup_seconds": args.warmup,
+            "think_time_seconds": args.think_time,
+            "seed": args.seed,
+            "mix": mix,
+            "started_at": started_at,
+            "python": platform.python_version(),
+        },
+        "total": (
+            summarize(every, sum(recorder.errors.values()), elapsed) if every else {}
+        ),
+        "routes": routes,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{'route':<32} {'requests':>9} {'errors':>7} {'rps':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    rows = list(report["routes"].items()) + [("total", report["total"])]
+    for route, result in rows:
+        if not result:
+            continue
+        print(
+            f"{route:<32} {result['requests']:>9} {result['errors']:>7} "
+            f"{result['throughput_rps']:>8.1f} {result['p50_ms']:>9.1f} "
+            f"{result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f}"
+        )
+
+
+def compare(before: Dict[str, Any], after: Dict[str, Any]) -> None:
+    """
+    Prints the relative change of throughput and latency percentiles per route.
+    """
+    print(
+        f"{before['meta'].get('label') or 'before'} -> {after['meta'].get('label') or 'after'}"
+    )
+    print(f"{'route':<32} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    routes = sorted(set(before["routes"]) | set(after["routes"])) + ["total"]
+    for route in routes:
+        old = before["total"] if route == "total" else before["routes"].get(route)
+        new = after["total"] if route == "total" else after["routes"].get(route)
+        if not old or not new:
+            print(f"{route:<32} {'only in ' + ('after' if new else 'before'):>9}")
+            continue
+        changes = [
+            f"{(new[key] - old[key]) / old[key]:>+9.1%}" if old[key] else f"{'n/a':>9}"
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+        ]
+        print(f"{route:<32} " + " ".join(changes))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Runs a load test.")
+    run_parser.add_argument("--base-url", default="http://localhost:8080")
+    run_parser.add_argument(
+        "--database-url",
+        default=os.environ.get("DATABASE_URL"),
+        help="Database to sample ids from (default: DATABASE_URL).",
+    )
+    run_parser.add_argument(
+        "--users", type=int, default=20, help="Concurrent virtual users."
+    )
+    run_parser.add_argument(
+        "--duration", type=float, default=60.0, help="Seconds to record."
+    )
+    run_parser.add_argument(
+        "--warmup", type=float, default=5.0, help="Seconds before recording starts."
+    )
+    run_parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.0,
+        help="Mean pause between a user's requests in seconds (0 for closed-loop load).",
+    )
+    run_parser.add_argument("--seed", type=int, default=1)
+    run_parser.add_argument("--timeout", type=float, default=30.0)
+    run_parser.add_argument(
+        "--mix",
+        action="append",
+        metavar="SCENARIO=WEIGHT",
+        help=f"Overrides a weight of the default mix {DEFAULT_MIX}.",
+    )
+    run_parser.add_argument(
+        "--label", help="Name of the build under test, e.g. a commit."
+    )
+    run_parser.add_argument("--report", help="Writes the JSON report to this file.")
+    compare_parser = commands.add_parser("compare", help="Compares two reports.")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.before) as f, open(args.after) as g:
+            compare(json.load(f), json.load(g))
+        return 0
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
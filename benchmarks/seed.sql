@@ -0,0 +1,66 @@
+-- Resets the database to a reproducible dataset for benchmarks/loadtest.py.
+--
+-- Every table is emptied and ids restart at 1. Slots cover the coming days,
+-- 16 half-hour slots from 08:00 per professional and day. Every user has the
+-- password "password". Run after `prisma db push`, e.g.:
+--
+--   psql "$DATABASE_URL" -v professionals=200 -v days=28 -f benchmarks/seed.sql
+
+\set ON_ERROR_STOP on
+\if :{?professionals} \else \set professionals 100 \endif
+\if :{?users} \else \set users 2000 \endif
+\if :{?days} \else \set days 14 \endif
+\if :{?booked} \else \set booked 0.3 \endif
+\if :{?seed} \else \set seed 0.42 \endif
+
+BEGIN;
+
+SELECT setseed(:seed);
+
+TRUNCATE "Booking", "Notification", "_UserFavorites", "Profile", "Slot", "Professional", "User"
+    RESTART IDENTITY CASCADE;
+
+INSERT INTO "Professional" ("email", "specialty")
+SELECT 'professional' || g || '@example.com',
+       (ARRAY['Cardiology', 'Dermatology', 'Pediatrics', 'Physiotherapy', 'Dentistry'])[1 + g % 5]
+FROM generate_series(1, :professionals) AS g;
+
+INSERT INTO "User" ("email", "password", "role")
+SELECT 'user' || g || '@example.com',
+       '$2b$12$N90UOCshe/ZsKl8G4iWpOu978T5b8A./pP0iVZlEf2qY/cuWMbN/S',
+       'REGISTERED_USER'::"Role"
+FROM generate_series(1, :users) AS g;
+
+INSERT INTO "Profile" ("userId", "firstName", "lastName")
+SELECT "id", 'User', "id"::text FROM "User";
+
+-- "A" references Professional and "B" Profile (Prisma orders the implicit
+-- many-to-many columns by model name).
+INSERT INTO "_UserFavorites" ("A", "B")
+SELECT DISTINCT 1 + floor(random() * :professionals)::int, p."id"
+FROM "Profile" AS p, generate_series(1, 3);
+
+INSERT INTO "Slot" ("startTime", "endTime", "professionalId", "isActive")
+SELECT t.start, t.start + interval '30 minutes', p."id", random() < 0.9
+FROM "Professional" AS p,
+     generate_series(0, :days - 1) AS d,
+     generate_series(0, 15) AS h,
+     LATERAL (
+         SELECT date_trunc('day', now()) + d * interval '1 day'
+                + interval '8 hours' + h * interval '30 minutes' AS start
+     ) AS t;
+
+INSERT INTO "Booking" ("userId", "slotId", "status")
+SELECT 1 + floor(random() * :users)::int,
+       s."id",
+       (ARRAY['PENDING', 'CONFIRMED', 'CANCELLED']::"BookingStatus"[])[1 + floor(random() * 3)::int]
+FROM "Slot" AS s
+WHERE random() < :booked;
+
+INSERT INTO "Notification" ("userId", "message", "createdAt", "read")
+SELECT u."id", 'Notification ' || g, now() - g * interval '6 hours', random() < 0.5
+FROM "User" AS u, generate_series(1, 10) AS g;
+
+COMMIT;
+
+ANALYZE;
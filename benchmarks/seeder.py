@@ -0,0 +1,359 @@
+"""
+Bulk-loads a large synthetic dataset with Postgres ``COPY``.
+
+Professionals get weekly working-hour patterns that are turned into slots
+around today, bookings favour popular professionals and busy users, and every
+booking leaves the notifications the app would have sent. Rows are produced by
+generators and streamed to ``COPY``, so memory use does not grow with the
+scale. Ids are assigned here rather than by the database, which lets related
+tables be generated independently; the id sequences are moved past them
+afterwards, so the app can keep inserting as usual.
+
+At ``--scale 1`` the dataset has 1,000 professionals, 20,000 users and about
+700,000 slots; rows grow linearly with the scale. The same scale and
+seed always produce the same rows (relative to the day the seeder runs):
+
+    python -m benchmarks.seeder --reset --scale 5 --seed 7
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+import asyncpg
+import bcrypt
+import project.events
+from dotenv import load_dotenv
+
+PROFESSIONALS_PER_SCALE = 1_000
+USERS_PER_SCALE = 20_000
+
+SPECIALTIES = [
+    ("General Practice", 30),
+    ("Physiotherapy", 15),
+    ("Dentistry", 15),
+    ("Dermatology", 8),
+    ("Pediatrics", 8),
+    ("Psychology", 8),
+    ("Cardiology", 5),
+    ("Ophthalmology", 5),
+    ("Orthopedics", 4),
+    ("Neurology", 2),
+]
+
+# Weekly working-hour patterns: (weekdays, first hour, last hour, lunch break
+# hour or None, slot minutes) with their relative frequency.
+PATTERNS = [
+    ((0, 1, 2, 3, 4), 9, 17, 12, 30, 40),
+    ((0, 1, 2, 3, 4), 8, 16, 12, 60, 20),
+    ((0, 1, 2, 3), 10, 19, 14, 30, 15),
+    ((0, 2, 4), 8, 18, 13, 45, 10),
+    ((1, 3, 5), 9, 15, None, 30, 10),
+    ((0, 1, 2, 3, 4, 5), 7, 13, None, 20, 5),
+]
+
+BOOKING_STATUSES = ("PENDING", "CONFIRMED", "CANCELLED")
+NOTIFICATION_TEMPLATES = [
+    "Reminder: you have an appointment on {day}.",
+    "Your profile was viewed by a professional.",
+    "New availability from your favorite professionals.",
+]
+
+TABLES = [
+    "Professional",
+    "User",
+    "Profile",
+    "_UserFavorites",
+    "Slot",
+    "Booking",
+    "Notification",
+]
+SERIAL_TABLES = ["Professional", "User", "Profile", "Slot", "Booking", "Notification"]
+
+
+class Dataset:
+    """
+    Deterministic generators for every table. Each generator derives its random
+    state from the seed, so tables can be generated in any order and slots can
+    be generated again (identically) while generating bookings.
+
+    Args:
+        scale (float): Scale factor; 1 is 1,000 professionals and 20,000 users.
+        seed (int): Seed of every random choice.
+        past_days (int): Days of history before today that get slots and bookings.
+        future_days (int): Days after today that get slots.
+        password (str): Password of every user; it is hashed once.
+    """
+
+    def __init__(
+        self,
+        scale: float,
+        seed: int,
+        past_days: int,
+        future_days: int,
+        password: str,
+    ) -> None:
+        self.seed = seed
+        self.professionals = max(1, round(PROFESSIONALS_PER_SCALE * scale))
+        self.users = max(1, round(USERS_PER_SCALE * scale))
+        self.first_day = date.today() - timedelta(days=past_days)
+        self.days = past_days + future_days
+        self.now = self._at(date.today(), 12)
+        # Hashing millions of passwords would take days; every user shares one.
+        self.password_hash = bcrypt.hashpw(
+            password.encode("utf-8"), bcrypt.gensalt()
+        ).decode("utf-8")
+        rng = self._rng("popularity")
+        # Pareto weights make a few professionals much more sought after.
+        self.popularity = [rng.paretovariate(1.5) for _ in range(self.professionals)]
+
+    @staticmethod
+    def _at(day: date, hour: int) -> datetime:
+        return datetime(day.year, day.month, day.day, hour)
+
+    def _rng(self, *parts: Any) -> random.Random:
+        return random.Random(":".join(str(part) for part in (self.seed,) + parts))
+
+    def _user(self, rng: random.Random) -> int:
+        # Squaring skews activity towards low ids, i.e. a core of busy users.
+        return 1 + int(self.users * rng.random() ** 2)
+
+    def professional_rows(self) -> Iterator[Tuple[Any, ...]]:
+        rng = self._rng("professionals")
+        names, weights = zip(*SPECIALTIES)
+        for professional_id in range(1, self.professionals + 1):
+            specialty = rng.choices(names, weights)[0]
+            yield (
+                professional_id,
+                f"professional{professional_id}@example.com",
+                specialty,
+            )
+
+    def user_rows(self) -> Iterator[Tuple[Any, ...]]:
+        rng = self._rng("users")
+        for user_id in range(1, self.users + 1):
+            role = "REGISTERED_USER" if rng.random() < 0.98 else "GUEST"
+            yield (user_id, f"user{user_id}@example.com", self.password_hash, role)
+
+    def profile_rows(self) -> Iterator[Tuple[Any, ...]]:
+        rng = self._rng("profiles")
+        for user_id in range(1, self.users + 1):
+            phone = f"+1555{rng.randrange(10**7):07d}" if rng.random() < 0.7 else None
+            yield (user_id, user_id, "User", str(user_id), phone)
+
+    def favorite_rows(self) -> Iterator[Tuple[Any, ...]]:
+        # Columns of the implicit many-to-many table: "A" is the Professional,
+        # "B" the Profile (Prisma orders them by model name).
+        rng = self._rng("favorites")
+        ids = range(1, self.professionals + 1)
+        for profile_id in range(1, self.users + 1):
+            count = min(self.professionals, int(rng.expovariate(1 / 1.5)))
+            for professional_id in sorted(
+                set(rng.choices(ids, self.popularity, k=count))
+            ):
+                yield (professional_id, profile_id)
+
+    def _slots(self) -> Iterator[Tuple[int, int, datetime, datetime, bool]]:
+        # (slot id, professional id, start, end, is active), in id order.
+        slot_id = 0
+        weights = [pattern[-1] for pattern in PATTERNS]
+        for professional_id in range(1, self.professionals + 1):
+            rng = self._rng("slots", professional_id)
+            weekdays, first, last, lunch, minutes, _ = rng.choices(PATTERNS, weights)[0]
+            # Professionals take the odd day off.
+            away = {day for day in range(self.days) if rng.random() < 0.05}
+            for offset in range(self.days):
+                day = self.first_day + timedelta(days=offset)
+                if day.weekday() not in weekdays or offset in away:
+                    continue
+                start = self._at(day, first)
+                end_of_day = self._at(day, last)
+                if lunch is not None:
+                    lunch_start = self._at(day, lunch)
+                    lunch_end = lunch_start + timedelta(hours=1)
+                while start + timedelta(minutes=minutes) <= end_of_day:
+                    end = start + timedelta(minutes=minutes)
+                    if lunch is not None and start < lunch_end and end > lunch_start:
+                        start = lunch_end
+                        continue
+                    slot_id += 1
+                    yield slot_id, professional_id, start, end, rng.random() < 0.97
+                    start = end
+
+    def slot_rows(self) -> Iterator[Tuple[Any, ...]]:
+        for slot_id, professional_id, start, end, active in self._slots():
+            yield (slot_id, start, end, professional_id, active)
+
+    def _bookings(self) -> Iterator[Tuple[int, int, int, datetime, str, datetime]]:
+        # (booking id, user id, slot id, created at, status, slot start)
+        rng = self._rng("bookings")
+        top = max(self.popularity)
+        booking_id = 0
+        for slot_id, professional_id, start, _, active in self._slots():
+            if not active:
+                continue
+            # Popular professionals fill most of their slots, and the past is
+            # fuller than the future, which is still being booked.
+            demand = 0.25 + 0.6 * self.popularity[professional_id - 1] / top
+            if start > self.now:
+                demand *= max(0.2, 1 - (start - self.now).days / 30)
+            if rng.random() >= demand:
+                continue
+            created = start - timedelta(hours=rng.randint(2, 24 * 21))
+            if start < self.now:
+                status = "CONFIRMED" if rng.random() < 0.85 else "CANCELLED"
+            else:
+                status = rng.choices(BOOKING_STATUSES, (25, 65, 10))[0]
+            booking_id += 1
+            yield booking_id, self._user(rng), slot_id, min(
+                created, self.now
+            ), status, start
+
+    def booking_rows(self) -> Iterator[Tuple[Any, ...]]:
+        for booking_id, user_id, slot_id, created, status, _ in self._bookings():
+            yield (booking_id, user_id, slot_id, created, status)
+
+    def notification_rows(self) -> Iterator[Tuple[Any, ...]]:
+        rng = self._rng("notifications")
+        notification_id = 0
+
+        def row(user_id: int, message: str, created: datetime) -> Tuple[Any, ...]:
+            nonlocal notification_id
+            notification_id += 1
+            # Older notifications are more likely to have been read.
+            age_days = (self.now - created).days
+            read = rng.random() < min(0.95, 0.2 + age_days / 10)
+            return (notification_id, user_id, message, created, read)
+
+        for _, user_id, _, created, status, start in self._bookings():
+            day = start.strftime("%Y-%m-%d %H:%M")
+            yield row(user_id, f"Your booking for {day} is {status.lower()}.", created)
+            if status == "CANCELLED":
+                continue
+            reminder = start - timedelta(days=1)
+            if reminder < self.now and rng.random() < 0.5:
+                yield row(user_id, NOTIFICATION_TEMPLATES[0].format(day=day), reminder)
+        for user_id in range(1, self.users + 1):
+            for _ in range(int(rng.expovariate(1 / 2))):
+                created = self.now - timedelta(minutes=rng.randrange(self.days * 1440))
+                message = rng.choice(NOTIFICATION_TEMPLATES[1:])
+                yield row(user_id, message, created)
+
+
+COLUMNS = {
+    "Professional": ("id", "email", "specialty"),
+    "User": ("id", "email", "password", "role"),
+    "Profile": ("id", "userId", "firstName", "lastName", "phoneNumber"),
+    "_UserFavorites": ("A", "B"),
+    "Slot": ("id", "startTime", "endTime", "professionalId", "isActive"),
+    "Booking": ("id", "userId", "slotId", "createdAt", "status"),
+    "Notification": ("id", "userId", "message", "createdAt", "read"),
+}
+
+
+def rows_for(dataset: Dataset, table: str) -> Iterator[Tuple[Any, ...]]:
+    return {
+        "Professional": dataset.professional_rows,
+        "User": dataset.user_rows,
+        "Profile": dataset.profile_rows,
+        "_UserFavorites": dataset.favorite_rows,
+        "Slot": dataset.slot_rows,
+        "Booking": dataset.booking_rows,
+        "Notification": dataset.notification_rows,
+    }[table]()
+
+
+class _Counted:
+    # Counts the records COPY consumed without materializing them.
+
+    def __init__(self, records: Iterable[Tuple[Any, ...]]) -> None:
+        self._records = records
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        for record in self._records:
+            self.count += 1
+            yield record
+
+
+async def seed(
+    connection: asyncpg.Connection,
+    dataset: Dataset,
+    reset: bool,
+) -> None:
+    """
+    Streams the dataset into the database with one ``COPY`` per table.
+
+    Args:
+        connection (asyncpg.Connection): Connection to the database created by ``prisma db push``.
+        dataset (Dataset): The rows to load.
+        reset (bool): Empties every table first; otherwise they must be empty already.
+    """
+    if reset:
+        names = ", ".join(f'"{table}"' for table in TABLES)
+        await connection.execute(f"TRUNCATE {names} RESTART IDENTITY CASCADE")
+    for table in TABLES:
+        if await connection.fetchval(f'SELECT EXISTS (SELECT 1 FROM "{table}")'):
+            raise SystemExit(f'"{table}" is not empty; pass --reset to empty it first')
+    for table in TABLES:
+        started = time.perf_counter()
+        records = _Counted(rows_for(dataset, table))
+        async with connection.transaction():
+            await connection.copy_records_to_table(
+                table, records=records, columns=COLUMNS[table]
+            )
+        elapsed = time.perf_counter() - started
+        print(
+            f"{table:<16} {records.count:>12,} rows  {elapsed:>7.1f} s  "
+            f"{records.count / elapsed:>10,.0f} rows/s",
+            file=sys.stderr,
+        )
+    for table in SERIAL_TABLES:
+        await connection.execute(
+            f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+            f'COALESCE((SELECT max("id") FROM "{table}"), 0) + 1, false)'
+        )
+    await connection.execute("ANALYZE")
+
+
+async def run(args: argparse.Namespace) -> None:
+    dataset = Dataset(
+        args.scale, args.seed, args.past_days, args.future_days, args.password
+    )
+    connection = await asyncpg.connect(project.events.listener_dsn(args.database_url))
+    try:
+        await seed(connection, dataset, args.reset)
+    finally:
+        await connection.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("DATABASE_URL"),
+        help="Defaults to DATABASE_URL.",
+    )
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--past-days", type=int, default=60)
+    parser.add_argument("--future-days", type=int, default=30)
+    parser.add_argument("--password", default="password")
+    parser.add_argument(
+        "--reset", action="store_true", help="Empties every table before loading."
+    )
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
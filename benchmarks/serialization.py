@@ -0,0 +1,204 @@
+"""
+Measures the CPU time spent per response on the routes that return large
+models, using the app in project.server with the in-memory Prisma stand-in
+from benchmarks.fake_prisma (no database or server process is needed).
+
+Two sections are reported per route:
+
+* ``request``: CPU time of a whole request through the ASGI app, minus the
+  time spent inside the stand-in. Save it with --json on two builds and
+  compare them with --compare to see the effect of a change end to end.
+* ``encode``: for the same service result, FastAPI's ``response_model``
+  handling (validation, conversion and JSONResponse encoding) next to
+  project.responses.ModelResponse, which serializes the model directly.
+
+Usage (from the repository root, after ``prisma generate``):
+
+    python -m benchmarks.serialization --professionals 200 --slots 100
+    python -m benchmarks.serialization --json after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import project.fetchNotifications_service
+import project.getAvailability_service
+import project.listSchedules_service
+import project.responses
+import project.server
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from benchmarks.fake_prisma import InMemoryDatabase, installed
+from benchmarks.services import Dataset, build_dataset
+
+
+def routes(
+    data: Dataset,
+) -> Dict[str, Tuple[Callable[[], str], Callable[[], Awaitable[Any]]]]:
+    """
+    Returns, per route template, functions giving a request URL and calling the
+    route's service directly. Both pick fresh arguments on every call.
+    """
+    return {
+        "/availability/all": (
+            lambda: "/availability/all",
+            lambda: project.getAvailability_service.getAvailability(
+                project.getAvailability_service.FetchAvailabilityRequest()
+            ),
+        ),
+        "/schedules/{professionalId}": (
+            lambda: f"/schedules/{data.professional()}",
+            lambda: project.listSchedules_service.listSchedules(data.professional()),
+        ),
+        "/notifications": (
+            lambda: f"/notifications?user_id={data.user()}",
+            lambda: project.fetchNotifications_service.fetchNotifications(
+                data.user(), None, None, None, None
+            ),
+        ),
+    }
+
+
+def _response_field(path: str) -> Any:
+    for route in project.server.app.routes:
+        if (
+            isinstance(route, APIRoute)
+            and route.path == path
+            and "GET" in route.methods
+        ):
+            return route.response_field
+    raise LookupError(path)
+
+
+async def _cpu(call: Callable[[], Awaitable[Any]], db: InMemoryDatabase) -> float:
+    # Collections triggered by earlier samples' garbage would land on random
+    # samples, so every sample starts clean and runs without the collector.
+    gc.collect()
+    gc.disable()
+    try:
+        stand_in = db.elapsed
+        started = time.process_time()
+        await call()
+        return (time.process_time() - started - (db.elapsed - stand_in)) * 1000
+    finally:
+        gc.enable()
+
+
+def _summary(samples: List[float], size: int) -> Dict[str, float]:
+    return {
+        "calls": len(samples),
+        "response_bytes": size,
+        "cpu_mean_ms": statistics.fmean(samples),
+        "cpu_median_ms": statistics.median(samples),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "scale": {"professionals": args.professionals, "slots": args.slots},
+        "request": {},
+        "encode": {},
+    }
+    with installed(InMemoryDatabase()) as db:
+        data = build_dataset(db, args.professionals, args.slots, args.booked, args.seed)
+        transport = httpx.ASGITransport(app=project.server.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            for path, (make_url, call_service) in routes(data).items():
+                samples, size = [], 0
+
+                async def request() -> None:
+                    nonlocal size
+                    response = await client.get(make_url())
+                    response.raise_for_status()
+                    size = len(response.content)
+
+                for index in range(args.warmup + args.iterations):
+                    sample = await _cpu(request, db)
+                    if index >= args.warmup:
+                        samples.append(sample)
+                report["request"][path] = _summary(samples, size)
+
+                content = await call_service()
+                field = _response_field(path)
+
+                async def response_model() -> None:
+                    value = await serialize_response(
+                        field=field, response_content=content
+                    )
+                    JSONResponse(value)
+
+                async def model_response() -> None:
+                    project.responses.ModelResponse(content)
+
+                report["encode"][path] = {}
+                for name, call in (
+                    ("response_model", response_model),
+                    ("ModelResponse", model_response),
+                ):
+                    timings = [
+                        await _cpu(call, db)
+                        for _ in range(args.warmup + args.iterations)
+                    ][args.warmup :]
+                    report["encode"][path][name] = _summary(
+                        timings, len(project.responses.ModelResponse(content).body)
+                    )
+    return report
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print("CPU per request (ms, median)")
+    for path, result in report["request"].items():
+        line = f"  {path:<30} {result['cpu_median_ms']:>9.3f}  {result['response_bytes']:>9} bytes"
+        before = (baseline or {}).get("request", {}).get(path)
+        if before:
+            change = result["cpu_median_ms"] / before["cpu_median_ms"] - 1
+            line += f"  was {before['cpu_median_ms']:.3f} ({change:+.1%})"
+        print(line)
+    print("CPU per response encoding (ms, median)")
+    for path, results in report["encode"].items():
+        old, new = results["response_model"], results["ModelResponse"]
+        print(
+            f"  {path:<30} response_model {old['cpu_median_ms']:>9.3f}  "
+            f"ModelResponse {new['cpu_median_ms']:>9.3f}  "
+            f"({old['cpu_median_ms'] / max(new['cpu_median_ms'], 1e-9):.1f}x)"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--professionals", type=int, default=100)
+    parser.add_argument("--slots", type=int, default=50)
+    parser.add_argument("--booked", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--json", help="Writes the report to this file.")
+    parser.add_argument("--compare", help="A report of another build to compare with.")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    report = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
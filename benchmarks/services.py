@@ -0,0 +1,410 @@
+"""
+Benchmarks the service functions against the in-memory Prisma stand-in in
+benchmarks.fake_prisma, so that the pure-Python cost of every service (model
+construction, loops, sorting) can be tracked without a database.
+
+Each scenario calls one service with randomly picked, seeded arguments. The
+report shows the time per call, the part of it spent inside the stand-in and
+the remainder, which is the service's own overhead and the number to watch. The
+overhead includes parsing the results into ``prisma.models`` instances, which
+the real client does as well.
+
+Usage (from the repository root, after ``prisma generate``):
+
+    python -m benchmarks.services --scale medium
+    python -m benchmarks.services --professionals 200 --slots 40 --booked 0.5
+    python -m benchmarks.services --scale small --json baseline.json
+    python -m benchmarks.services --scale small --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import prisma.enums
+import project.bookAppointment_service
+import project.checkAvailability_service
+import project.createNotification_service
+import project.createSchedule_service
+import project.deleteSchedule_service
+import project.fetchNotifications_service
+import project.getAvailability_service
+import project.getCommonAvailability_service
+import project.getUser_service
+import project.getUserProfile_service
+import project.listSchedules_service
+import project.listUserFavorites_service
+import project.updateNotificationStatus_service
+
+from benchmarks.fake_prisma import InMemoryDatabase, installed
+
+# professionals, slots per professional, share of slots with bookings
+SCALES = {
+    "small": (20, 20, 0.3),
+    "medium": (100, 50, 0.3),
+    "large": (400, 100, 0.3),
+}
+
+SPECIALTIES = ["Cardiology", "Dermatology", "Pediatrics", "Physiotherapy", "Dentistry"]
+USERS_PER_PROFESSIONAL = 5
+FAVORITES_PER_PROFILE = 3
+NOTIFICATIONS_PER_USER = 5
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 16
+# Aware, like the datetimes the Prisma client returns. Monday next week, so that
+# the slots are upcoming and within reach of scenarios counting days from now.
+_TODAY = datetime.now(timezone.utc).replace(hour=8, minute=0, second=0, microsecond=0)
+START = _TODAY + timedelta(days=7 - _TODAY.weekday())
+
+
+@dataclass
+class Dataset:
+    """
+    The ids the scenarios pick their arguments from.
+    """
+
+    rng: random.Random
+    professional_ids: List[int]
+    user_ids: List[int]
+    slot_ids: List[int]
+    notification_ids: List[int]
+    next_start: Dict[int, datetime] = field(default_factory=dict)
+
+    def professional(self) -> int:
+        return self.rng.choice(self.professional_ids)
+
+    def user(self) -> int:
+        return self.rng.choice(self.user_ids)
+
+    def slot(self) -> int:
+        return self.rng.choice(self.slot_ids)
+
+    def notification(self) -> int:
+        return self.rng.choice(self.notification_ids)
+
+
+def build_dataset(
+    db: InMemoryDatabase, professionals: int, slots: int, booked: float, seed: int
+) -> Dataset:
+    """
+    Fills the database with a deterministic dataset of the given size.
+
+    Args:
+        db (InMemoryDatabase): The empty database to fill.
+        professionals (int): Number of professionals.
+        slots (int): Number of slots per professional, 30 minutes each on consecutive days.
+        booked (float): Share of slots that have a booking, between 0 and 1.
+        seed (int): Seed for every random choice, including the ones scenarios make later.
+
+    Returns:
+        Dataset: The ids of the created rows.
+    """
+    rng = random.Random(seed)
+    professional_ids = []
+    for index in range(professionals):
+        row = db.insert(
+            "Professional",
+            email=f"professional{index}@example.com",
+            specialty=SPECIALTIES[index % len(SPECIALTIES)],
+        )
+        professional_ids.append(row["id"])
+    user_ids, profile_ids = [], []
+    for index in range(professionals * USERS_PER_PROFESSIONAL):
+        user = db.insert(
+            "User",
+            email=f"user{index}@example.com",
+            password="not-a-real-hash",
+            role=prisma.enums.Role.REGISTERED_USER.value,
+        )
+        profile = db.insert(
+            "Profile", userId=user["id"], firstName="User", lastName=str(index)
+        )
+        for professional_id in rng.sample(
+            professional_ids, min(FAVORITES_PER_PROFILE, len(professional_ids))
+        ):
+            db.favorite(profile["id"], professional_id)
+        user_ids.append(user["id"])
+        profile_ids.append(profile["id"])
+    notification_ids = []
+    for user_id in user_ids:
+        for index in range(NOTIFICATIONS_PER_USER):
+            row = db.insert(
+                "Notification",
+                userId=user_id,
+                message=f"Notification {index}",
+                createdAt=START - timedelta(hours=index),
+                read=rng.random() < 0.5,
+            )
+            notification_ids.append(row["id"])
+    slot_ids = []
+    statuses = [status.value for status in prisma.enums.BookingStatus]
+    for professional_id in professional_ids:
+        for index in range(slots):
+            day, position = divmod(index, SLOTS_PER_DAY)
+            start = START + timedelta(days=day, minutes=SLOT_MINUTES * position)
+            slot = db.insert(
+                "Slot",
+                professionalId=professional_id,
+                startTime=start,
+                endTime=start + timedelta(minutes=SLOT_MINUTES),
+                isActive=rng.random() < 0.9,
+            )
+            slot_ids.append(slot["id"])
+            if rng.random() < booked:
+                db.insert(
+                    "Booking",
+                    userId=rng.choice(user_ids),
+                    slotId=slot["id"],
+                    createdAt=START - timedelta(days=1),
+                    status=rng.choice(statuses),
+                )
+    next_start = {
+        professional_id: START + timedelta(days=slots // SLOTS_PER_DAY + 1)
+        for professional_id in professional_ids
+    }
+    return Dataset(
+        rng, professional_ids, user_ids, slot_ids, notification_ids, next_start
+    )
+
+
+async def _create_schedule(data: Dataset) -> Any:
+    professional_id = data.professional()
+    start = data.next_start[professional_id]
+    data.next_start[professional_id] = start + timedelta(minutes=SLOT_MINUTES)
+    return await project.createSchedule_service.createSchedule(
+        professional_id, start, start + timedelta(minutes=SLOT_MINUTES), "consult", True
+    )
+
+
+async def _book_appointment(data: Dataset, db: InMemoryDatabase) -> Any:
+    slot_id = data.slot()
+    professional_id = db.tables["Slot"][slot_id]["professionalId"]
+    return await project.bookAppointment_service.bookAppointment(
+        data.user(), professional_id, slot_id
+    )
+
+
+def scenarios(
+    data: Dataset, db: InMemoryDatabase
+) -> Dict[str, Callable[[], Awaitable[Any]]]:
+    """
+    Returns the benchmarked calls by name. Every call picks fresh arguments. Reads
+    run before writes, and deleteSchedule last, as it leaves bookings without a slot.
+    """
+    week = (START, START + timedelta(days=7))
+    days = max(1, len(data.slot_ids) // len(data.professional_ids) // SLOTS_PER_DAY)
+    return {
+        "checkAvailability": lambda: project.checkAvailability_service.checkAvailability(
+            data.professional(), *week, None
+        ),
+        "checkAvailability(specialty)": lambda: project.checkAvailability_service.checkAvailability(
+            None, *week, data.rng.choice(SPECIALTIES)
+        ),
+        "getCommonAvailability": lambda: project.getCommonAvailability_service.getCommonAvailability(
+            data.rng.sample(data.professional_ids, min(3, len(data.professional_ids))),
+            (START + timedelta(days=data.rng.randrange(days))).date(),
+            None,
+        ),
+        "getAvailability": lambda: project.getAvailability_service.getAvailability(
+            project.getAvailability_service.FetchAvailabilityRequest()
+        ),
+        "getAvailability(nextFreeTime)": lambda: project.getAvailability_service.getAvailability(
+            project.getAvailability_service.FetchAvailabilityRequest(
+                fields=["nextFreeTime"], window=14
+            )
+        ),
+        "listSchedules": lambda: project.listSchedules_service.listSchedules(
+            data.professional()
+        ),
+        "fetchNotifications": lambda: project.fetchNotifications_service.fetchNotifications(
+            data.user(), None, None, None, None
+        ),
+        "getUser": lambda: project.getUser_service.getUser(data.user()),
+        "getUserProfile": lambda: project.getUserProfile_service.getUserProfile(
+            data.user()
+        ),
+        "listUserFavorites": lambda: project.listUserFavorites_service.listUserFavorites(
+            data.user()
+        ),
+        "bookAppointment": lambda: _book_appointment(data, db),
+        "createSchedule": lambda: _create_schedule(data),
+        "createNotification": lambda: project.createNotification_service.createNotification(
+            "Reminder", [data.user()], "Your appointment is tomorrow."
+        ),
+        "updateNotificationStatus": lambda: project.updateNotificationStatus_service.updateNotificationStatus(
+            data.notification(),
+            True,
+            project.updateNotificationStatus_service.Role.REGISTERED_USER,
+        ),
+        "deleteSchedule": lambda: project.deleteSchedule_service.deleteSchedule(
+            data.slot(), prisma.enums.Role.ADMIN
+        ),
+    }
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def measure(
+    db: InMemoryDatabase,
+    call: Callable[[], Awaitable[Any]],
+    iterations: int,
+    max_seconds: float,
+    warmup: int,
+) -> Dict[str, float]:
+    """
+    Times a scenario and splits every call into stand-in time and service overhead.
+
+    Args:
+        db (InMemoryDatabase): The database the stand-in reads, used for its time and query counters.
+        call (Callable[[], Awaitable[Any]]): The scenario.
+        iterations (int): Maximum number of timed calls.
+        max_seconds (float): Stops early once the timed calls took this long.
+        warmup (int): Untimed calls made first.
+
+    Returns:
+        Dict[str, float]: Call count, queries per call and timings in milliseconds.
+    """
+    for _ in range(warmup):
+        await call()
+    totals, overheads = [], []
+    queries = db.queries
+    deadline = time.perf_counter() + max_seconds
+    while len(totals) < iterations and time.perf_counter() < deadline:
+        stand_in = db.elapsed
+        started = time.perf_counter()
+        await call()
+        total = time.perf_counter() - started
+        totals.append(total * 1000)
+        overheads.append((total - (db.elapsed - stand_in)) * 1000)
+    return {
+        "calls": len(totals),
+        "queries_per_call": (db.queries - queries) / len(totals),
+        "mean_ms": statistics.fmean(totals),
+        "p50_ms": _percentile(totals, 50),
+        "p95_ms": _percentile(totals, 95),
+        "overhead_mean_ms": statistics.fmean(overheads),
+        "overhead_p50_ms": _percentile(overheads, 50),
+        "overhead_p95_ms": _percentile(overheads, 95),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    professionals, slots, booked = SCALES[args.scale]
+    professionals = args.professionals or professionals
+    slots = args.slots or slots
+    booked = booked if args.booked is None else args.booked
+    results = {}
+    with installed(InMemoryDatabase()) as db:
+        data = build_dataset(db, professionals, slots, booked, args.seed)
+        for name, call in scenarios(data, db).items():
+            if args.only and not any(pattern in name for pattern in args.only):
+                continue
+            results[name] = await measure(
+                db, call, args.iterations, args.max_seconds, args.warmup
+            )
+            print(_format_row(name, results[name]), file=sys.stderr)
+    return {
+        "scale": {
+            "professionals": professionals,
+            "slots": slots,
+            "booked": booked,
+            "seed": args.seed,
+        },
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def _format_row(name: str, result: Dict[str, float]) -> str:
+    return (
+        f"{name:<30} {result['calls']:>6} calls  {result['queries_per_call']:>5.1f} q/call  "
+        f"p50 {result['p50_ms']:>9.3f} ms  p95 {result['p95_ms']:>9.3f} ms  "
+        f"overhead p50 {result['overhead_p50_ms']:>9.3f} ms"
+    )
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Lists the scenarios whose median service overhead grew by more than the threshold.
+
+    Args:
+        report (Dict[str, Any]): The current report.
+        baseline (Dict[str, Any]): A report saved earlier with --json, at the same scale.
+        threshold (float): Allowed relative growth, e.g. 0.2 for 20%.
+
+    Returns:
+        List[str]: One line per regressed scenario; empty when there is none.
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or before["overhead_p50_ms"] <= 0:
+            continue
+        ratio = result["overhead_p50_ms"] / before["overhead_p50_ms"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: overhead p50 {before['overhead_p50_ms']:.3f} ms -> "
+                f"{result['overhead_p50_ms']:.3f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--professionals", type=int, help="Overrides the scale.")
+    parser.add_argument(
+        "--slots", type=int, help="Slots per professional; overrides the scale."
+    )
+    parser.add_argument(
+        "--booked",
+        type=float,
+        help="Share of slots with a booking; overrides the scale.",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--max-seconds", type=float, default=5.0)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument(
+        "--only", action="append", help="Only run scenarios containing this text."
+    )
+    parser.add_argument("--json", help="Writes the report to this file.")
+    parser.add_argument(
+        "--compare", help="A saved report; exits with 1 if a scenario regressed."
+    )
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    # Slow query logging and similar warnings would only measure the stand-in.
+    logging.disable(logging.WARNING)
+    report = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Measures how long a fresh worker process takes from starting the interpreter
+to serving its first response, which is what a cold start on Cloud Run or a
+restarted uvicorn worker waits for.
+
+Every run spawns a new interpreter that imports project.server and sends one
+request through the ASGI app in-process (no database or server is needed as
+long as the route does not query it), and reports three phases:
+
+* ``interpreter``: starting Python itself, measured with an empty program
+* ``import``: ``import project.server``, i.e. the app and all its routers
+* ``first_response``: the first request, including FastAPI's lazy setup
+
+With --importtime the slowest top-level packages from ``python -X importtime``
+are listed as well, which shows where the import phase goes. Reports can be
+saved with --json and compared between builds with --compare:
+
+    python -m benchmarks.startup --runs 20 --importtime 15 --json before.json
+    python -m benchmarks.startup --runs 20 --compare before.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child process; prints the phase timings as JSON. The request goes
+# through httpx's ASGI transport, which does not run the app's lifespan, so the
+# database is never connected.
+_CHILD = """
+import time
+started = time.perf_counter()
+import project.server
+imported = time.perf_counter()
+import asyncio, httpx, json
+
+async def first_response():
+    transport = httpx.ASGITransport(app=project.server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+        response = await client.get({path!r})
+        response.raise_for_status()
+
+asyncio.run(first_response())
+responded = time.perf_counter()
+print(json.dumps({{
+    "import": (imported - started) * 1000,
+    "first_response": (responded - imported) * 1000,
+}}))
+"""
+
+
+def _spawn(args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def measure(path: str, runs: int) -> Dict[str, List[float]]:
+    """
+    Starts ``runs`` fresh interpreters and returns the duration of every phase in milliseconds.
+    """
+    samples: Dict[str, List[float]] = defaultdict(list)
+    child = _CHILD.format(path=path)
+    for _ in range(runs):
+        started = time.perf_counter()
+        _spawn(["-c", "pass"])
+        samples["interpreter"].append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        phases = json.loads(_spawn(["-c", child]).stdout.splitlines()[-1])
+        samples["total"].append((time.perf_counter() - started) * 1000)
+        for phase, duration in phases.items():
+            samples[phase].append(duration)
+    return samples
+
+
+def import_times(limit: int) -> List[Dict[str, Any]]:
+    """
+    Returns the top-level packages whose modules take longest to import with
+    project.server, summing the self time ``python -X importtime`` reports for
+    each of their modules.
+    """
+    stderr = _spawn(["-X", "importtime", "-c", "import project.server"]).stderr
+    packages: Dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        package = fields[2].strip().split(".")[0]
+        packages[package] += int(fields[0]) / 1000
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return [{"package": name, "self_ms": ms} for name, ms in ranked[:limit]]
+
+
+def summarize(samples: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        phase: {
+            "runs": len(values),
+            "median_ms": statistics.median(values),
+            "min_ms": min(values),
+            "max_ms": max(values),
+        }
+        for phase, values in samples.items()
+    }
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"Cold start to first response of GET {report['path']} (ms)")
+    for phase in ("interpreter", "import", "first_response", "total"):
+        result = report["phases"][phase]
+        line = (
+            f"  {phase:<16} median {result['median_ms']:>8.1f}  "
+            f"min {result['min_ms']:>8.1f}  max {result['max_ms']:>8.1f}"
+        )
+        before = (baseline or {}).get("phases", {}).get(phase)
+        if before:
+            change = result["median_ms"] / before["median_ms"] - 1
+            line += f"  was {before['median_ms']:.1f} ({change:+.1%})"
+        print(line)
+    if report.get("imports"):
+        print("Slowest imports by package (ms)")
+        for entry in report["imports"]:
+            print(f"  {entry['package']:<30} {entry['self_ms']:>8.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--path",
+        default="/openapi.json",
+        help="Route requested first; it must not need the database.",
+    )
+    parser.add_argument(
+        "--importtime",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Also lists the N slowest top-level imports.",
+    )
+    parser.add_argument("--json", help="Writes the report to this file.")
+    parser.add_argument("--compare", help="A report of another build to compare with.")
+    args = parser.parse_args(argv)
+
+    report: Dict[str, Any] = {
+        "path": args.path,
+        "python": sys.version.split()[0],
+        "phases": summarize(measure(args.path, args.runs)),
+    }
+    if args.importtime:
+        report["imports"] = import_times(args.importtime)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@ from typing import List
 
 import prisma
 import prisma.models
+import project.events
+import project.favorites
 from pydantic import BaseModel
 
 
@@ -23,11 +25,12 @@ class AddFavoriteResponse(BaseModel):
     favorites: List[Professional]
 
 
-async def addUserFavorite(professional_id: int) -> AddFavoriteResponse:
+async def addUserFavorite(user_id: int, professional_id: int) -> AddFavoriteResponse:
     """
     Adds a professional to the user's list of favorites. Requires the professional's ID. Returns updated list of favorites.
 
     Args:
+        user_id (int): ID of the user whose list of favorites is changed.
         professional_id (int): ID of the professional to be added to the user's list of favorites.
 
     Returns:
@@ -35,22 +38,23 @@ async def addUserFavorite(professional_id: int) -> AddFavoriteResponse:
 
     Example:
         pro_id = 3
-        response = addUserFavorite(pro_id)
+        response = addUserFavorite(1, pro_id)
         > AddFavoriteResponse(favorites=[...])  # Assuming there are already some favorites in the list
     """
-    current_user_id = 1
-    professional = await prisma.models.Professional.prisma().find_unique(
-        where={"id": professional_id}
+    favorites = await project.favorites.load(user_id)
+    if favorites is None:
+        raise ValueError("User profile does not exist.")
+    # The update fails to connect a professional that does not exist, and then
+    # returns None like for a missing profile.
+    updated_profile = await prisma.models.Profile.prisma().update(
+        where={"id": favorites.profileId},
+        data={"favorites": {"connect": [{"id": professional_id}]}},
+        include={"favorites": True},
     )
-    if not professional:
+    if updated_profile is None:
         raise ValueError("Professional with the provided ID does not exist.")
-    await prisma.models.Profile.prisma().update(
-        where={"userId": current_user_id},
-        data={"favorites": {"connect": {"id": professional_id}}},
-    )
-    updated_profile = await prisma.models.Profile.prisma().find_unique(
-        where={"userId": current_user_id}, include={"favorites": True}
-    )
+    await project.events.publish(project.events.USER_CHANGED, userId=user_id)
+    project.favorites.put(user_id, project.favorites.version(user_id), updated_profile)
     favorites_list = [
         Professional(id=fav.id, email=fav.email, specialty=fav.specialty)
         for fav in updated_profile.favorites
@@ -0,0 +1,201 @@
+"""
+Admission control: sheds load before it reaches the routes.
+
+Every request passes, in this order:
+
+* the client's token bucket (ADMISSION_CLIENT_RATE/_BURST, keyed on the client
+  address), answered with 429 when empty;
+* the worker's global token bucket (ADMISSION_GLOBAL_RATE/_BURST), answered with
+  503 when empty. The last ADMISSION_BOOKING_RESERVE share of its tokens is kept
+  for booking writes, so a burst of reads cannot lock out ``POST /book``;
+* the concurrency limit of its route, if the route has one (the expensive
+  reads in ROUTE_CONCURRENCY), answered with 503 when all places are taken.
+
+Rejections carry a ``Retry-After`` header and an ``{"error": ...}`` body. All
+limits are per worker process; a rate of 0 disables a bucket, a concurrency
+limit of 0 disables the limit.
+"""
+
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+import project.metrics
+import project.middleware
+import project.settings
+from fastapi.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# (method, route template) -> concurrent requests allowed per worker.
+ROUTE_CONCURRENCY: Dict[Tuple[str, str], int] = {
+    ("GET", "/availability/all"): (
+        project.settings.ADMISSION_AVAILABILITY_ALL_CONCURRENCY
+    ),
+    ("GET", "/analytics/utilization"): (
+        project.settings.ADMISSION_ANALYTICS_CONCURRENCY
+    ),
+    ("GET", "/analytics/bookings.parquet"): (
+        project.settings.ADMISSION_ANALYTICS_CONCURRENCY
+    ),
+    ("GET", "/analytics/bookings.arrow"): (
+        project.settings.ADMISSION_ANALYTICS_CONCURRENCY
+    ),
+    ("POST", "/users/import"): project.settings.ADMISSION_IMPORT_CONCURRENCY,
+}
+
+# Booking writes: they may use the reserved share of the global bucket.
+PRIORITY_ROUTES = {("POST", "/book"), ("POST", "/holds"), ("POST", "/bookings/confirm")}
+
+_CLIENT_PRUNE_SIZE = 10_000
+
+
+class TokenBucket:
+    """
+    A token bucket holding up to ``burst`` tokens, refilled at ``rate`` tokens per second.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (float): Capacity, i.e. the largest burst let through at once.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now: float, reserve: float = 0.0) -> float:
+        """
+        Takes a token if more than ``reserve`` tokens are left.
+
+        Args:
+            now (float): The current time.monotonic().
+            reserve (float): Tokens that must stay in the bucket after this one is taken.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until one will be available.
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= reserve + 1:
+            self.tokens -= 1
+            return 0.0
+        return (reserve + 1 - self.tokens) / self.rate
+
+    def idle(self, now: float) -> bool:
+        # A bucket that refilled completely behaves like a new one.
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+def _route(scope: Scope) -> Optional[str]:
+    # Routing happens after the middleware, so the route is matched here as well.
+    # It is kept in the scope, like the router does, so that rejected requests
+    # are labelled with their route by the metrics middleware too.
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            scope["route"] = route
+            return getattr(route, "path", None)
+    return None
+
+
+def _client(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class AdmissionMiddleware:
+    """
+    Rejects requests beyond the per-client and global rates or the per-route
+    concurrency limits, before they reach the routes. See the module docstring.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        settings = project.settings
+        self.global_bucket = (
+            TokenBucket(settings.ADMISSION_GLOBAL_RATE, settings.ADMISSION_GLOBAL_BURST)
+            if settings.ADMISSION_GLOBAL_RATE > 0
+            else None
+        )
+        self.reserve = (
+            settings.ADMISSION_GLOBAL_BURST * settings.ADMISSION_BOOKING_RESERVE
+        )
+        self.client_buckets: Dict[str, TokenBucket] = {}
+        self.in_flight: Dict[Tuple[str, Optional[str]], int] = {}
+
+    def _client_bucket(self, client: str, now: float) -> Optional[TokenBucket]:
+        settings = project.settings
+        if settings.ADMISSION_CLIENT_RATE <= 0:
+            return None
+        bucket = self.client_buckets.get(client)
+        if bucket is None:
+            if len(self.client_buckets) > _CLIENT_PRUNE_SIZE:
+                for key, old in list(self.client_buckets.items()):
+                    if old.idle(now):
+                        del self.client_buckets[key]
+            bucket = TokenBucket(
+                settings.ADMISSION_CLIENT_RATE, settings.ADMISSION_CLIENT_BURST
+            )
+            self.client_buckets[client] = bucket
+        return bucket
+
+    async def _reject(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        status_code: int,
+        reason: str,
+        retry_after: float,
+        template: Optional[str],
+    ) -> None:
+        project.metrics.ADMISSION_REJECTIONS.labels(
+            scope["method"], template or project.middleware.UNMATCHED_ROUTE, reason
+        ).inc()
+        response = JSONResponse(
+            {"error": "Too many requests, please retry later."},
+            status_code=status_code,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        template = _route(scope)
+        key = (scope["method"], template)
+        now = time.monotonic()
+
+        bucket = self._client_bucket(_client(scope), now)
+        if bucket is not None:
+            wait = bucket.take(now)
+            if wait:
+                await self._reject(
+                    scope, receive, send, 429, "client_rate", wait, template
+                )
+                return
+        if self.global_bucket is not None:
+            wait = self.global_bucket.take(
+                now, 0.0 if key in PRIORITY_ROUTES else self.reserve
+            )
+            if wait:
+                await self._reject(
+                    scope, receive, send, 503, "global_rate", wait, template
+                )
+                return
+
+        limit = ROUTE_CONCURRENCY.get(key)
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+        if self.in_flight.get(key, 0) >= limit:
+            await self._reject(scope, receive, send, 503, "concurrency", 1, template)
+            return
+        self.in_flight[key] = self.in_flight.get(key, 0) + 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight[key] -= 1
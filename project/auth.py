@@ -0,0 +1,113 @@
+"""
+Authentication of requests with the tokens issued by ``POST /auth/login``.
+
+Routes for signed-in users depend on :func:`current_user`, which reads an
+``Authorization: Bearer <token>`` header, and routes for admins on
+:func:`require_admin`. The user's role is read from the database rather than
+from the token, so that a change of role applies at once and refreshed tokens,
+which carry no role, work the same. Tokens are signed with JWT_SECRET; while it
+is unset, no tokens are issued and routes needing one answer 503.
+
+Calendar apps subscribing to a schedule feed cannot send such a header. The
+schedule exports take a per-professional :func:`feed_token` in their URL
+instead, which admins get from ``GET /schedules/{professionalId}/feed``. They are
+signed with SCHEDULE_FEED_SECRET, and while it is unset the exports answer 503.
+"""
+
+import hashlib
+import hmac
+from typing import Optional
+
+import prisma.enums
+import prisma.models
+import project.settings
+from fastapi import Depends, Header, HTTPException
+
+ALGORITHM = "HS256"
+
+_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
+
+def signing_key() -> str:
+    """
+    Returns the key tokens are signed with, raising ValueError if JWT_SECRET is unset.
+    """
+    if not project.settings.JWT_SECRET:
+        raise ValueError("Authentication is not configured, set JWT_SECRET.")
+    return project.settings.JWT_SECRET
+
+
+async def current_user(
+    authorization: Optional[str] = Header(None),
+) -> prisma.models.User:
+    """
+    Returns the user whose token the request carries, answering 401 if it has no
+    valid one.
+    """
+    import jwt
+
+    if not project.settings.JWT_SECRET:
+        raise HTTPException(status_code=503, detail="Authentication is not configured.")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=401,
+            detail="Send the token from POST /auth/login as a Bearer token.",
+            headers=_CHALLENGE,
+        )
+    try:
+        payload = jwt.decode(token, project.settings.JWT_SECRET, algorithms=[ALGORITHM])
+    except jwt.InvalidTokenError:
+        raise HTTPException(
+            status_code=401, detail="Invalid or expired token.", headers=_CHALLENGE
+        )
+    user = await prisma.models.User.prisma().find_unique(
+        where={"id": payload.get("user_id")}
+    )
+    if user is None:
+        raise HTTPException(
+            status_code=401, detail="Invalid or expired token.", headers=_CHALLENGE
+        )
+    return user
+
+
+async def require_admin(
+    user: prisma.models.User = Depends(current_user),
+) -> prisma.models.User:
+    """
+    Returns the signed-in user if they are an admin, answering 403 otherwise.
+    """
+    if user.role != prisma.enums.Role.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can do this.")
+    return user
+
+
+def feed_token(professional_id: int) -> str:
+    """
+    Returns the token of a professional's schedule exports: a signature of their
+    id with SCHEDULE_FEED_SECRET, valid until the secret changes. Raises ValueError
+    if the secret is unset.
+    """
+    if not project.settings.SCHEDULE_FEED_SECRET:
+        raise ValueError("Schedule feeds are not configured, set SCHEDULE_FEED_SECRET.")
+    return hmac.new(
+        project.settings.SCHEDULE_FEED_SECRET.encode("utf-8"),
+        f"schedule-feed:{professional_id}".encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def check_feed_token(professional_id: int, token: Optional[str]) -> None:
+    """
+    Answers 403 unless the token is the feed token of the professional, or 503 if
+    SCHEDULE_FEED_SECRET is unset.
+    """
+    if not project.settings.SCHEDULE_FEED_SECRET:
+        raise HTTPException(
+            status_code=503, detail="Schedule feeds are not configured."
+        )
+    if not token or not hmac.compare_digest(token, feed_token(professional_id)):
+        raise HTTPException(
+            status_code=403,
+            detail="Invalid feed token, get the feed's address from GET /schedules/{professionalId}/feed.",
+        )
@@ -3,6 +3,8 @@ from typing import Optional
 import prisma
 import prisma.enums
 import prisma.models
+import project.events
+import project.holds
 from pydantic import BaseModel
 
 
@@ -17,7 +19,7 @@ class BookingResponse(BaseModel):
 
 
 async def bookAppointment(
-    userId: int, professionalId: int, slotId: int
+    userId: int, professionalId: int, slotId: int, holdId: Optional[str] = None
 ) -> BookingResponse:
     """
     Accepts user-selected time slots and professional details and sends this info to the Schedule Management System for processing and confirming the booking. This function performs validations to ensure the slot is still available and compatible with the professional’s schedule, using transaction mechanisms to maintain consistency. Expect confirmation of booking or error message in response.
@@ -26,24 +28,37 @@ async def bookAppointment(
         userId (int): The ID of the user who is making a booking.
         professionalId (int): The ID of the professional whose slot is being booked.
         slotId (int): The ID of the slot that is being attempted to book.
+        holdId (Optional[str]): The ID of the user's hold on the slot, if they placed one. The slot was validated when it was held, so it is booked without checking it again.
 
     Returns:
         BookingResponse: Response model for the booking process. It provides details on the success or failure of the booking and, in case of success, the booking details.
     """
-    slot = await prisma.models.Slot.prisma().find_unique(
-        where={"id": slotId}, include={"professional": True, "bookings": True}
-    )
-    if not slot or not slot.isActive or slot.professionalId != professionalId:
-        return BookingResponse(
-            status="error", message="Invalid slot or mismatch of professional ID"
+    if holdId is not None:
+        hold = await project.holds.take(holdId, userId, slotId)
+        if hold is None or hold.professionalId != professionalId:
+            return BookingResponse(
+                status="error", message="Hold expired or does not match the slot"
+            )
+    else:
+        holder = project.holds.holder(slotId)
+        if holder is not None and holder != userId:
+            return BookingResponse(
+                status="error", message="Slot is held by another user"
+            )
+        slot = await prisma.models.Slot.prisma().find_unique(
+            where={"id": slotId}, include={"professional": True, "bookings": True}
         )
-    if any(
-        (
-            booking.status == prisma.enums.BookingStatus.CONFIRMED
-            for booking in slot.bookings
-        )
-    ):
-        return BookingResponse(status="error", message="Slot is already booked")
+        if not slot or not slot.isActive or slot.professionalId != professionalId:
+            return BookingResponse(
+                status="error", message="Invalid slot or mismatch of professional ID"
+            )
+        if any(
+            (
+                booking.status == prisma.enums.BookingStatus.CONFIRMED
+                for booking in slot.bookings
+            )
+        ):
+            return BookingResponse(status="error", message="Slot is already booked")
     new_booking = await prisma.models.Booking.prisma().create(
         data={
             "userId": userId,
@@ -52,6 +67,12 @@ async def bookAppointment(
         }
     )
     if new_booking:
+        await project.events.publish(
+            project.events.BOOKING_CHANGED,
+            professionalId=professionalId,
+            slotId=slotId,
+            userId=userId,
+        )
         return BookingResponse(
             bookingId=new_booking.id,
             status="pending",
@@ -3,6 +3,10 @@ from typing import Optional
 
 import prisma
 import prisma.models
+import project.database
+import project.events
+import project.holds
+import project.singleflight
 from pydantic import BaseModel
 
 
@@ -14,6 +18,13 @@ class AvailabilityResponse(BaseModel):
     availability: str
 
 
+_in_flight = project.singleflight.Group("checkAvailability")
+project.events.subscribe(project.events.SCHEDULE_CHANGED, lambda _: _in_flight.reset())
+project.events.subscribe(project.events.BOOKING_CHANGED, lambda _: _in_flight.reset())
+project.events.subscribe(project.events.HOLD_PLACED, lambda _: _in_flight.reset())
+project.events.subscribe(project.events.HOLD_RELEASED, lambda _: _in_flight.reset())
+
+
 async def checkAvailability(
     professionalId: Optional[int],
     startDate: Optional[datetime],
@@ -32,13 +43,35 @@ async def checkAvailability(
     Returns:
     AvailabilityResponse: This model describes the availability state of a professional, indicating if they are currently available, busy, or unavailable.
     """
-    query = prisma.models.Professional.prisma().find_many(
+    # Popular pages send bursts of identical requests: they share one query.
+    key = (professionalId, startDate, endDate, specialty)
+    return await _in_flight.do(
+        key,
+        lambda: _checkAvailability(professionalId, startDate, endDate, specialty),
+    )
+
+
+async def _checkAvailability(
+    professionalId: Optional[int],
+    startDate: Optional[datetime],
+    endDate: Optional[datetime],
+    specialty: Optional[str],
+) -> AvailabilityResponse:
+    client = (
+        project.database.reader(project.database.professional_key(professionalId))
+        if professionalId is not None
+        else project.database.reader(project.database.ALL_PROFESSIONALS_KEY)
+    )
+    # Slots held during someone's checkout are not available to others.
+    held = project.holds.held_slot_ids()
+    query = prisma.models.Professional.prisma(client).find_many(
         where={
             "id": professionalId,
             "specialty": specialty,
             "availableSlots": {
                 "some": {
                     "isActive": True,
+                    "id": {"not_in": held} if held else None,
                     "startTime": {"gte": startDate} if startDate else None,
                     "endTime": {"lte": endDate} if endDate else None,
                 }
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from typing import List, Literal
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.events
+from pydantic import BaseModel
+
+# Most bookings a single request may confirm or decline.
+MAX_BATCH_SIZE = 500
+
+
+class ConfirmBookingsResponse(BaseModel):
+    """
+    The bookings whose status was changed, and the requested ones that were not because they are not pending, belong to another professional or compete for a slot with a booking confirmed first.
+    """
+
+    updated: List[int]
+    skipped: List[int]
+    status: prisma.enums.BookingStatus
+
+
+async def confirmBookings(
+    professionalId: int,
+    decision: Literal["confirm", "decline"],
+    bookingIds: List[int],
+) -> ConfirmBookingsResponse:
+    """
+    Confirms or declines many pending bookings of a professional at once. All bookings change status in a single update, in a transaction holding locks on the bookings and their slots, and every user whose booking changed gets a notification. A slot can only be confirmed once: of several pending bookings for the same slot only the first is confirmed, and none is if the slot already has a confirmed booking.
+
+    Args:
+        professionalId (int): The professional whose bookings are confirmed or declined.
+        decision (Literal["confirm", "decline"]): Whether to confirm the bookings or decline (cancel) them.
+        bookingIds (List[int]): The IDs of the pending bookings, at most MAX_BATCH_SIZE.
+
+    Returns:
+        ConfirmBookingsResponse: The bookings whose status was changed, and the requested ones that were not because they are not pending, belong to another professional or compete for a slot with a booking confirmed first.
+    """
+    if len(bookingIds) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} bookings can be changed at once.")
+    status = (
+        prisma.enums.BookingStatus.CONFIRMED
+        if decision == "confirm"
+        else prisma.enums.BookingStatus.CANCELLED
+    )
+    where = {
+        "id": {"in": bookingIds},
+        "status": prisma.enums.BookingStatus.PENDING,
+        "slot": {"is": {"professionalId": professionalId}},
+    }
+    if decision == "confirm":
+        where["slot"]["is"]["bookings"] = {
+            "none": {"status": prisma.enums.BookingStatus.CONFIRMED}
+        }
+    async with prisma.get_client().tx(timeout=timedelta(seconds=30)) as tx:
+        # Lock the requested bookings and their slots (in a fixed order, against
+        # deadlocks), so that concurrent confirmations for the same slot and the
+        # sweeper wait for this one and then see its changes.
+        await tx.query_raw(
+            """
+            SELECT b.id
+            FROM "Booking" b
+            JOIN "Slot" s ON s.id = b."slotId"
+            WHERE b.id = ANY(string_to_array($1, ',')::int[])
+                AND s."professionalId" = $2
+            ORDER BY s.id, b.id
+            FOR UPDATE
+            """,
+            ",".join(str(booking_id) for booking_id in bookingIds),
+            professionalId,
+        )
+        candidates = await prisma.models.Booking.prisma(tx).find_many(
+            where=where, order={"id": "asc"}
+        )
+        if decision == "confirm":
+            # Both bookings of a slot would pass the filter of the same update.
+            first_per_slot = {}
+            for booking in candidates:
+                first_per_slot.setdefault(booking.slotId, booking)
+            candidates = list(first_per_slot.values())
+        if candidates:
+            where["id"] = {"in": [booking.id for booking in candidates]}
+            await prisma.models.Booking.prisma(tx).update_many(
+                where=where, data={"status": status}
+            )
+            # Only report and notify the bookings this update actually changed.
+            candidates = await prisma.models.Booking.prisma(tx).find_many(
+                where={"id": where["id"], "status": status}, order={"id": "asc"}
+            )
+        if candidates:
+            kind, verb = (
+                ("CONFIRMATION", "confirmed")
+                if decision == "confirm"
+                else ("CANCELLATION", "declined")
+            )
+            await prisma.models.Notification.prisma(tx).create_many(
+                data=[
+                    {
+                        "userId": booking.userId,
+                        "message": f"{kind}: Your booking #{booking.id} was {verb}.",
+                    }
+                    for booking in candidates
+                ]
+            )
+    ids = [booking.id for booking in candidates]
+    if ids:
+        user_ids = sorted({booking.userId for booking in candidates})
+        await project.events.publish(
+            project.events.BOOKING_CHANGED,
+            professionalId=professionalId,
+            userIds=user_ids,
+        )
+        await project.events.publish(
+            project.events.NOTIFICATION_CHANGED, userIds=user_ids
+        )
+    updated = set(ids)
+    return ConfirmBookingsResponse(
+        updated=ids,
+        skipped=[booking_id for booking_id in bookingIds if booking_id not in updated],
+        status=status,
+    )
@@ -2,6 +2,7 @@ from typing import List
 
 import prisma
 import prisma.models
+import project.events
 from pydantic import BaseModel
 
 
@@ -39,6 +40,10 @@ async def createNotification(
         )
         created_notifications.append(notification)
     if created_notifications:
+        await project.events.publish(
+            project.events.NOTIFICATION_CHANGED,
+            userIds=[notification.userId for notification in created_notifications],
+        )
         return NotificationCreationResponse(
             success=True,
             notificationId=created_notifications[0].id,
@@ -2,6 +2,7 @@ from datetime import datetime
 
 import prisma
 import prisma.models
+import project.events
 from pydantic import BaseModel
 
 
@@ -56,6 +57,11 @@ async def createSchedule(
             "isActive": isActive,
         }
     )
+    await project.events.publish(
+        project.events.SCHEDULE_CHANGED,
+        professionalId=professionalId,
+        slotId=new_slot.id,
+    )
     notification_status = await send_notification(
         professionalId, "New schedule created for you."
     )
@@ -4,6 +4,7 @@ from typing import List
 import prisma
 import prisma.enums
 import prisma.models
+import project.events
 from pydantic import BaseModel
 
 
@@ -66,6 +67,7 @@ async def createUserProfile(
     profile = await prisma.models.Profile.prisma().create(
         data={"userId": user.id, "firstName": firstName, "lastName": lastName}
     )
+    await project.events.publish(project.events.USER_CHANGED, userId=user.id)
     user_profile_response = UserProfileResponse(
         user_id=user.id,
         name=f"{firstName} {lastName}",
@@ -1,9 +1,10 @@
 from typing import Optional
 
-import bcrypt
 import prisma
 import prisma.enums
 import prisma.models
+import project.events
+import project.passwords
 from pydantic import BaseModel
 
 
@@ -37,13 +38,12 @@ async def createUser(
     )
     if existing_user:
         return CreateUserResponse(success=False, message="Email already in use")
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt)
+    hashed_password = await project.passwords.hash_password(password)
     try:
         user = await prisma.models.User.prisma().create(
             data={
                 "email": email,
-                "password": hashed_password.decode("utf-8"),
+                "password": hashed_password,
                 "role": role,
                 "profiles": {
                     "create": {
@@ -53,6 +53,7 @@ async def createUser(
                 },
             }
         )
+        await project.events.publish(project.events.USER_CHANGED, userId=user.id)
         return CreateUserResponse(
             success=True,
             message="prisma.models.User created successfully",
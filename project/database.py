@@ -0,0 +1,246 @@
+"""
+The Prisma clients shared by all services, configured from project.settings.
+
+``db_client`` is the auto-registered client for the primary database. When
+``DATABASE_REPLICA_URL`` is set, ``replica_client`` connects to the read
+replica and read-only services pick their client with :func:`reader`.
+"""
+
+import logging
+import os
+import sys
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Type
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import prisma.errors
+import project.events
+import project.metrics
+import project.settings
+from prisma import Prisma
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Prisma error codes for a query that gave up waiting for a pool connection,
+# and for one that exceeded the socket (per-query) timeout.
+POOL_TIMEOUT_CODE = "P2024"
+QUERY_TIMEOUT_CODE = "P1008"
+
+
+def datasource_url(
+    url: str, pool_size: int, pool_timeout: int, query_timeout: int
+) -> str:
+    """
+    Adds Prisma's connection pool parameters to a Postgres connection string.
+    Parameters already present in the URL and settings left at 0 are not changed.
+
+    Args:
+        url (str): The DATABASE_URL connection string.
+        pool_size (int): Maximum number of pooled connections (connection_limit).
+        pool_timeout (int): Seconds a query waits for a free connection (pool_timeout).
+        query_timeout (int): Seconds a single query may run before it fails (socket_timeout).
+
+    Returns:
+        str: The connection string with the pool parameters applied.
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    for key, value in (
+        ("connection_limit", pool_size),
+        ("pool_timeout", pool_timeout),
+        ("socket_timeout", query_timeout),
+    ):
+        if value:
+            query.setdefault(key, str(value))
+    return urlunsplit(parts._replace(query=urlencode(query, safe="/:")))
+
+
+# Number of queries made while handling the current request, set up by
+# project.middleware for every request: a one item list so that tasks spawned
+# by the request (which get a copy of the context) count into the same total.
+query_count: ContextVar[Optional[List[int]]] = ContextVar("query_count", default=None)
+
+
+def _calling_service() -> str:
+    # Walks up the stack to the first project module outside this one, i.e.
+    # the service function that issued the query.
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("project.") and module != __name__:
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class Client(Prisma):
+    """
+    Prisma client that records the duration of every query per model and operation,
+    logs slow queries with the service function that made them, counts queries per
+    request and counts pool and query timeouts in project.metrics.
+    """
+
+    async def _execute(
+        self,
+        *,
+        method: Any,
+        arguments: dict,
+        model: Optional[Type[BaseModel]] = None,
+        root_selection: Optional[List[str]] = None,
+    ) -> Any:
+        counter = query_count.get()
+        if counter is not None:
+            counter[0] += 1
+        started = time.perf_counter()
+        try:
+            return await super()._execute(
+                method=method,
+                arguments=arguments,
+                model=model,
+                root_selection=root_selection,
+            )
+        except prisma.errors.DataError as e:
+            if e.code == POOL_TIMEOUT_CODE:
+                project.metrics.DB_TIMEOUTS.labels(kind="pool").inc()
+            elif e.code == QUERY_TIMEOUT_CODE:
+                project.metrics.DB_TIMEOUTS.labels(kind="query").inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            model_name = model.__name__ if model is not None else "raw"
+            project.metrics.DB_QUERY_DURATION.labels(model_name, method).observe(
+                elapsed
+            )
+            if elapsed * 1000 >= project.settings.SLOW_QUERY_MS:
+                logger.warning(
+                    "Slow query %s.%s took %.1f ms in %s",
+                    model_name,
+                    method,
+                    elapsed * 1000,
+                    _calling_service(),
+                )
+
+
+def _datasource(url: Optional[str]) -> Optional[dict]:
+    if not url:
+        return None
+    return {
+        "url": datasource_url(
+            url,
+            project.settings.DB_POOL_SIZE,
+            project.settings.DB_POOL_TIMEOUT_SECONDS,
+            project.settings.DB_QUERY_TIMEOUT_SECONDS,
+        )
+    }
+
+
+def _http_timeout() -> float:
+    # The engine must report pool and query timeouts before the HTTP request
+    # to it gives up (Prisma's default HTTP timeout is 30 seconds).
+    return max(
+        30.0,
+        project.settings.DB_POOL_TIMEOUT_SECONDS
+        + project.settings.DB_QUERY_TIMEOUT_SECONDS
+        + 5.0,
+    )
+
+
+db_client = Client(
+    auto_register=True,
+    datasource=_datasource(os.environ.get("DATABASE_URL")),
+    http={"timeout": _http_timeout()},
+)
+replica_client: Optional[Client] = (
+    Client(
+        datasource=_datasource(project.settings.DATABASE_REPLICA_URL),
+        http={"timeout": _http_timeout()},
+    )
+    if project.settings.DATABASE_REPLICA_URL
+    else None
+)
+project.metrics.DB_POOL_SIZE.set(project.settings.DB_POOL_SIZE)
+
+# Read-your-writes stickiness: key -> time.monotonic() until which reads
+# about that key must go to the primary.
+_sticky_until: Dict[str, float] = {}
+_STICKY_PRUNE_SIZE = 10_000
+
+# Key of reads about all professionals, written by every schedule or booking change.
+ALL_PROFESSIONALS_KEY = "professional:*"
+
+
+def user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def professional_key(professional_id: int) -> str:
+    return f"professional:{professional_id}"
+
+
+def mark_written(*keys: str) -> None:
+    """
+    Pins reads about the given keys to the primary for REPLICA_STICKY_SECONDS.
+
+    Args:
+        *keys (str): Keys built with user_key() or professional_key().
+    """
+    now = time.monotonic()
+    if len(_sticky_until) > _STICKY_PRUNE_SIZE:
+        for key, deadline in list(_sticky_until.items()):
+            if deadline <= now:
+                del _sticky_until[key]
+    deadline = now + project.settings.REPLICA_STICKY_SECONDS
+    for key in keys:
+        _sticky_until[key] = deadline
+
+
+def reader(*keys: str) -> Prisma:
+    """
+    Picks the client for a read-only query: the replica, unless none is configured
+    or connected, or one of the keys was written within the stickiness window.
+
+    Args:
+        *keys (str): Keys built with user_key() or professional_key() for the data being read.
+
+    Returns:
+        Prisma: The client to pass to ``prisma.models.<Model>.prisma()``.
+    """
+    if replica_client is None or not replica_client.is_connected():
+        return db_client
+    now = time.monotonic()
+    for key in keys:
+        deadline = _sticky_until.get(key)
+        if deadline is not None and deadline > now:
+            return db_client
+    return replica_client
+
+
+def _on_write(payload: Dict[str, Any]) -> None:
+    keys = []
+    if payload.get("professionalId") is not None:
+        keys.append(professional_key(payload["professionalId"]))
+    if payload.get("userId") is not None:
+        keys.append(user_key(payload["userId"]))
+    keys.extend(user_key(user_id) for user_id in payload.get("userIds", ()))
+    mark_written(*keys)
+
+
+def _on_availability_changed(payload: Dict[str, Any]) -> None:
+    # Responses tagged with project.versions must not be read from a replica
+    # that may not have the changes the version already counts.
+    mark_written(ALL_PROFESSIONALS_KEY)
+
+
+# Every write path publishes a change event, so stickiness follows the events
+# and also covers writes handled by other workers.
+for _kind in (
+    project.events.SCHEDULE_CHANGED,
+    project.events.BOOKING_CHANGED,
+    project.events.NOTIFICATION_CHANGED,
+    project.events.USER_CHANGED,
+):
+    project.events.subscribe(_kind, _on_write)
+for _kind in (project.events.SCHEDULE_CHANGED, project.events.BOOKING_CHANGED):
+    project.events.subscribe(_kind, _on_availability_changed)
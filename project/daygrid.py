@@ -0,0 +1,186 @@
+"""
+Free time of professionals as one bitset per professional and day.
+
+A day (UTC) is divided into TICKS_PER_DAY ticks of TICK_MINUTES. Bit ``i`` of a
+professional's bitset is set when the tick starting ``i * TICK_MINUTES`` minutes
+after midnight lies entirely inside one of their active slots without a booking
+that is not cancelled. Bitsets are plain Python ints, so the free time shared
+by several professionals is the ``&`` of theirs, and windows are read back from
+the runs of set bits.
+
+Bitsets are cached per professional and day and dropped when a schedule or
+booking change event names the professional, so they also follow the writes
+of other workers. Slots held during checkout (project.holds) are taken out of
+the cached bitsets on every lookup, as holds expire without an event.
+"""
+
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+import prisma.models
+import project.database
+import project.events
+import project.holds
+
+TICK_MINUTES = 5
+TICKS_PER_DAY = 24 * 60 // TICK_MINUTES
+FULL_DAY = (1 << TICKS_PER_DAY) - 1
+
+_TICK = timedelta(minutes=TICK_MINUTES)
+_CACHE_SIZE = 100_000
+
+# (professional id, day) -> bitset, least recently used first.
+_cache: OrderedDict[Tuple[int, date], int] = OrderedDict()
+# Days cached per professional, to drop them all when the professional changes.
+_cached_days: Dict[int, set] = {}
+# Bumped per professional on every invalidation, so that bitsets computed from
+# data read before a change are not cached after the change dropped them.
+_versions: Dict[int, int] = {}
+
+
+def _invalidate(payload: Dict[str, Any]) -> None:
+    professional_id = payload.get("professionalId")
+    if professional_id is None:
+        return
+    _versions[professional_id] = _versions.get(professional_id, 0) + 1
+    for day in _cached_days.pop(professional_id, ()):
+        _cache.pop((professional_id, day), None)
+
+
+def _clear(payload: Dict[str, Any]) -> None:
+    for professional_id in _cached_days:
+        _versions[professional_id] = _versions.get(professional_id, 0) + 1
+    _cache.clear()
+    _cached_days.clear()
+
+
+project.events.subscribe(project.events.SCHEDULE_CHANGED, _invalidate)
+project.events.subscribe(project.events.BOOKING_CHANGED, _invalidate)
+project.events.subscribe(project.events.RESYNC, _clear)
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, time(), tzinfo=timezone.utc)
+
+
+def _utc(value: datetime) -> datetime:
+    # Prisma returns aware datetimes in UTC; naive ones are taken to be UTC.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def interval_bits(midnight: datetime, start: datetime, end: datetime) -> int:
+    """
+    Returns the bitset of the ticks of a day lying entirely between start and end.
+
+    Args:
+        midnight (datetime): Start of the day, as returned by day_start().
+        start (datetime): Start of the interval.
+        end (datetime): End of the interval.
+
+    Returns:
+        int: The bitset, 0 if the interval covers no whole tick of the day.
+    """
+    first = max(0, -((midnight - _utc(start)) // _TICK))
+    last = min(TICKS_PER_DAY, (_utc(end) - midnight) // _TICK)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def windows(bits: int, day: date) -> List[Tuple[datetime, datetime]]:
+    """
+    Converts a bitset back into the free windows it describes.
+
+    Args:
+        bits (int): A bitset of the given day.
+        day (date): The day (UTC).
+
+    Returns:
+        List[Tuple[datetime, datetime]]: Start and end of every run of set bits, in order.
+    """
+    midnight = day_start(day)
+    result = []
+    offset = 0
+    while bits:
+        # Skip the unset bits below the next run, then measure the run.
+        gap = (bits & -bits).bit_length() - 1
+        bits >>= gap
+        offset += gap
+        run = (bits ^ (bits + 1)).bit_length() - 1
+        result.append((midnight + offset * _TICK, midnight + (offset + run) * _TICK))
+        bits >>= run
+        offset += run
+    return result
+
+
+async def free_bits(professional_ids: Iterable[int], day: date) -> Dict[int, int]:
+    """
+    Returns the free time of professionals on a day, from the cache where possible
+    and otherwise from a single query for all missing professionals.
+
+    Args:
+        professional_ids (Iterable[int]): The professionals.
+        day (date): The day (UTC).
+
+    Returns:
+        Dict[int, int]: The bitset of every professional, 0 for those without free time.
+    """
+    result: Dict[int, int] = {}
+    missing = []
+    for professional_id in professional_ids:
+        bits = _cache.get((professional_id, day))
+        if bits is None:
+            missing.append(professional_id)
+        else:
+            _cache.move_to_end((professional_id, day))
+            result[professional_id] = bits
+    if not missing:
+        return _without_holds(result, day_start(day))
+
+    versions = {
+        professional_id: _versions.get(professional_id, 0)
+        for professional_id in missing
+    }
+    midnight = day_start(day)
+    slots = await prisma.models.Slot.prisma(
+        project.database.reader(
+            *(
+                project.database.professional_key(professional_id)
+                for professional_id in missing
+            )
+        )
+    ).find_many(
+        where={
+            "professionalId": {"in": missing},
+            "isActive": True,
+            "startTime": {"lt": midnight + timedelta(days=1)},
+            "endTime": {"gt": midnight},
+            "bookings": {"none": {"status": {"not": "CANCELLED"}}},
+        },
+    )
+    for professional_id in missing:
+        result[professional_id] = 0
+    for slot in slots:
+        result[slot.professionalId] |= interval_bits(
+            midnight, slot.startTime, slot.endTime
+        )
+
+    for professional_id in missing:
+        if _versions.get(professional_id, 0) != versions[professional_id]:
+            continue
+        _cache[(professional_id, day)] = result[professional_id]
+        _cached_days.setdefault(professional_id, set()).add(day)
+    while len(_cache) > _CACHE_SIZE:
+        (professional_id, old_day), _ = _cache.popitem(last=False)
+        _cached_days.get(professional_id, set()).discard(old_day)
+    return _without_holds(result, midnight)
+
+
+def _without_holds(result: Dict[int, int], midnight: datetime) -> Dict[int, int]:
+    for professional_id in result:
+        for hold in project.holds.held_slots(professional_id):
+            result[professional_id] &= ~interval_bits(
+                midnight, hold.startTime, hold.endTime
+            )
+    return result
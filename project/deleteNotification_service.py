@@ -1,5 +1,6 @@
 import prisma
 import prisma.models
+import project.events
 from pydantic import BaseModel
 
 
@@ -27,6 +28,9 @@ async def deleteNotification(id: int) -> DeleteNotificationResponse:
     )
     if notification:
         await prisma.models.Notification.prisma().delete(where={"id": id})
+        await project.events.publish(
+            project.events.NOTIFICATION_CHANGED, userIds=[notification.userId]
+        )
         return DeleteNotificationResponse(
             success=True, message="Notification deleted successfully."
         )
@@ -3,6 +3,7 @@ import datetime
 import prisma
 import prisma.enums
 import prisma.models
+import project.events
 from pydantic import BaseModel
 
 
@@ -58,14 +59,29 @@ async def deleteSchedule(
                 "read": False,
             }
         )
+    if bookings:
+        await project.events.publish(
+            project.events.NOTIFICATION_CHANGED,
+            userIds=sorted({booking.userId for booking in bookings}),
+        )
     if all(
         (booking.status == prisma.enums.BookingStatus.CANCELLED for booking in bookings)
     ):
         await prisma.models.Slot.prisma().delete(where={"id": scheduleId})
+        await project.events.publish(
+            project.events.SCHEDULE_CHANGED,
+            professionalId=slot.professionalId,
+            slotId=scheduleId,
+        )
         return DeleteScheduleResponse(
             success=True,
             message="Schedule deleted successfully with all booked slots released and notifications sent.",
         )
+    await project.events.publish(
+        project.events.SCHEDULE_CHANGED,
+        professionalId=slot.professionalId,
+        slotId=scheduleId,
+    )
     return DeleteScheduleResponse(
         success=False, message="Unable to fully delete schedule due to active bookings."
     )
@@ -1,14 +1,18 @@
+from typing import Optional
+
 import prisma
 import prisma.models
+import project.purge
 from pydantic import BaseModel
 
 
 class DeleteUserProfileResponse(BaseModel):
     """
-    Provides a confirmation message indicating that the user profile and all related data have been successfully deleted.
+    Provides a confirmation message indicating that the user profile and all related data have been successfully deleted. Users with a large history are deleted in the background, and purgeId identifies the job for GET /purges/{purgeId}.
     """
 
     message: str
+    purgeId: Optional[str] = None
 
 
 async def deleteUserProfile(userId: int) -> DeleteUserProfileResponse:
@@ -24,10 +28,12 @@ async def deleteUserProfile(userId: int) -> DeleteUserProfileResponse:
     user = await prisma.models.User.prisma().find_unique(where={"id": userId})
     if not user:
         return DeleteUserProfileResponse(message="No user found with the given ID.")
-    await prisma.models.Booking.prisma().delete_many(where={"userId": userId})
-    await prisma.models.Notification.prisma().delete_many(where={"userId": userId})
-    await prisma.models.Profile.prisma().delete_many(where={"userId": userId})
-    await prisma.models.User.prisma().delete(where={"id": userId})
+    job = await project.purge.purge(userId)
+    if job is not None:
+        return DeleteUserProfileResponse(
+            message="User profile and all related data are being deleted in the background.",
+            purgeId=job.id,
+        )
     return DeleteUserProfileResponse(
         message="User profile and all related data successfully deleted."
     )
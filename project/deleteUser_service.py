@@ -1,15 +1,19 @@
+from typing import Optional
+
 import prisma
 import prisma.models
+import project.purge
 from pydantic import BaseModel
 
 
 class DeleteUserResponseModel(BaseModel):
     """
-    Response model for the delete user operation. It indicates whether the deletion was successful and provides an appropriate message.
+    Response model for the delete user operation. It indicates whether the deletion was successful and provides an appropriate message. Users with a large history are deleted in the background, and purgeId identifies the job for GET /purges/{purgeId}.
     """
 
     success: bool
     message: str
+    purgeId: Optional[str] = None
 
 
 async def deleteUser(userId: int) -> DeleteUserResponseModel:
@@ -23,16 +27,18 @@ async def deleteUser(userId: int) -> DeleteUserResponseModel:
         DeleteUserResponseModel: Response model for the delete user operation. It indicates whether the deletion was successful and provides an appropriate message.
     """
     try:
-        user = await prisma.models.User.prisma().find_unique(
-            where={"id": userId}, include={"notifications": True, "bookings": True}
-        )
+        user = await prisma.models.User.prisma().find_unique(where={"id": userId})
         if user is None:
             return DeleteUserResponseModel(
                 success=False, message="prisma.models.User not found."
             )
-        await prisma.models.Booking.prisma().delete_many(where={"userId": userId})
-        await prisma.models.Notification.prisma().delete_many(where={"userId": userId})
-        await prisma.models.User.prisma().delete(where={"id": userId})
+        job = await project.purge.purge(userId)
+        if job is not None:
+            return DeleteUserResponseModel(
+                success=True,
+                message="prisma.models.User is being deleted in the background.",
+                purgeId=job.id,
+            )
         return DeleteUserResponseModel(
             success=True, message="prisma.models.User successfully deleted."
         )
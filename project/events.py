@@ -0,0 +1,222 @@
+"""
+Change events shared between uvicorn workers.
+
+Write paths call :func:`publish` once their changes are committed. The event is
+applied to the current worker immediately and broadcast to every other worker
+(and container) over Postgres ``NOTIFY``. Each worker keeps one ``LISTEN``
+connection open (see :func:`listen`) and hands incoming events to the handlers
+registered with :func:`subscribe`, which is how in-process state such as caches,
+indexes and counters stays coherent when the app runs with several workers.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import prisma
+import project.settings
+
+if TYPE_CHECKING:
+    import asyncpg
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_CHANGED = "schedule_changed"
+BOOKING_CHANGED = "booking_changed"
+NOTIFICATION_CHANGED = "notification_changed"
+USER_CHANGED = "user_changed"
+# Temporary slot holds (see project.holds), kept in memory by every worker.
+HOLD_PLACED = "hold_placed"
+HOLD_RELEASED = "hold_released"
+# Progress of background user deletions (see project.purge).
+PURGE_PROGRESS = "purge_progress"
+# Dispatched locally after the listener (re)connects: events may have been
+# missed while it was down, so subscribers should drop whatever they cached.
+# Carries the current value of VERSION_SEQUENCE as "version".
+RESYNC = "resync"
+
+# Sequence numbering changes for all workers and containers. The events in
+# VERSIONED carry its next value as their "version" (see project.versions).
+VERSION_SEQUENCE = "availability_version"
+VERSIONED = {SCHEDULE_CHANGED, BOOKING_CHANGED, HOLD_PLACED, HOLD_RELEASED}
+
+# Identifies this process so that it can skip its own notifications, which it
+# has already applied when publishing.
+WORKER_ID = uuid.uuid4().hex
+
+# Connection string parameters understood by Prisma but not by asyncpg.
+_PRISMA_ONLY_PARAMS = {
+    "schema",
+    "connection_limit",
+    "pool_timeout",
+    "socket_timeout",
+    "connect_timeout",
+    "pgbouncer",
+    "statement_cache_size",
+}
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+_MAX_MESSAGE_BYTES = 7999
+
+Handler = Callable[[Dict[str, Any]], None]
+
+_handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+
+def subscribe(kind: str, handler: Handler) -> None:
+    """
+    Registers a handler for an event kind. Handlers run on the event loop and must not block.
+
+    Args:
+        kind (str): The event kind, e.g. SCHEDULE_CHANGED.
+        handler (Handler): Called with the event payload every time the event is published by any worker.
+    """
+    _handlers[kind].append(handler)
+
+
+def _dispatch(kind: str, payload: Dict[str, Any]) -> None:
+    for handler in _handlers.get(kind, ()):
+        try:
+            handler(payload)
+        except Exception:
+            logger.exception("Error applying %s event", kind)
+
+
+def _messages(kind: str, payload: Dict[str, Any]) -> List[str]:
+    message = json.dumps(
+        {"kind": kind, "origin": WORKER_ID, "payload": payload}, default=str
+    )
+    if len(message.encode("utf-8")) <= _MAX_MESSAGE_BYTES:
+        return [message]
+    # Too long for one notification: send the halves of its longest list of ids
+    # as separate events, which handlers apply like the whole one.
+    lists = [
+        key
+        for key, value in payload.items()
+        if isinstance(value, list) and len(value) > 1
+    ]
+    if not lists:
+        raise ValueError(f"The {kind} event is too large to broadcast.")
+    key = max(lists, key=lambda key: len(payload[key]))
+    half = len(payload[key]) // 2
+    return _messages(kind, {**payload, key: payload[key][:half]}) + _messages(
+        kind, {**payload, key: payload[key][half:]}
+    )
+
+
+async def publish(kind: str, **payload: Any) -> None:
+    """
+    Applies an event locally and broadcasts it to the other workers. Payloads are
+    sent as JSON through pg_notify, so they should only carry ids and small values.
+    Events of the VERSIONED kinds get the next value of VERSION_SEQUENCE added as
+    ``version``.
+    Payloads over the notification size limit are split along their longest list
+    (e.g. userIds) into several notifications.
+
+    Args:
+        kind (str): The event kind, e.g. BOOKING_CHANGED.
+        **payload: JSON serializable event details, e.g. professionalId=3.
+
+    Raises:
+        ValueError: If the payload is too large even when split.
+    """
+    if kind in VERSIONED:
+        try:
+            row = await prisma.get_client().query_first(
+                f"SELECT nextval('{VERSION_SEQUENCE}') AS version"
+            )
+            payload["version"] = int(row["version"])
+        except Exception:
+            logger.exception("Failed to number %s event", kind)
+    messages = _messages(kind, payload)
+    _dispatch(kind, payload)
+    try:
+        for message in messages:
+            await prisma.get_client().execute_raw(
+                "SELECT pg_notify($1, $2)", project.settings.EVENTS_CHANNEL, message
+            )
+    except Exception:
+        logger.exception("Failed to broadcast %s event", kind)
+
+
+def _on_notification(
+    connection: "asyncpg.Connection", pid: int, channel: str, message: str
+) -> None:
+    try:
+        event = json.loads(message)
+    except ValueError:
+        logger.warning("Ignoring malformed event on %s: %r", channel, message)
+        return
+    if event.get("origin") == WORKER_ID:
+        return
+    _dispatch(event["kind"], event.get("payload") or {})
+
+
+async def _current_version(connection: "asyncpg.Connection") -> int:
+    import asyncpg
+
+    try:
+        await connection.execute(f"CREATE SEQUENCE IF NOT EXISTS {VERSION_SEQUENCE}")
+    except asyncpg.UniqueViolationError:
+        # Created by another worker at the same time.
+        pass
+    return await connection.fetchval(
+        f"SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM {VERSION_SEQUENCE}"
+    )
+
+
+def listener_dsn(url: str) -> str:
+    """
+    Converts a Prisma connection string into one asyncpg accepts by dropping the Prisma specific query parameters.
+    """
+    parts = urlsplit(url)
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query)
+        if key not in _PRISMA_ONLY_PARAMS
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query, safe="/:")))
+
+
+async def listen() -> None:
+    """
+    Keeps a LISTEN connection open and applies events published by other workers.
+    Runs until cancelled, reconnecting whenever the connection drops.
+    """
+    # Imported here rather than at module level: the listener runs in the
+    # background, so asyncpg stays off the path to the first response.
+    import asyncpg
+
+    channel = project.settings.EVENTS_CHANNEL
+    while True:
+        try:
+            connection = await asyncpg.connect(listener_dsn(os.environ["DATABASE_URL"]))
+        except Exception:
+            logger.exception("Event listener failed to connect")
+            await asyncio.sleep(project.settings.EVENTS_RECONNECT_SECONDS)
+            continue
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            await connection.add_listener(channel, _on_notification)
+            _dispatch(RESYNC, {"version": await _current_version(connection)})
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(
+                        closed.wait(), project.settings.EVENTS_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    await connection.execute("SELECT 1")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Event listener connection lost")
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(project.settings.EVENTS_RECONNECT_SECONDS)
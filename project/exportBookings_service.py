@@ -0,0 +1,191 @@
+import base64
+import io
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple
+
+import prisma.enums
+import prisma.models
+import project.database
+
+# Bookings per record batch (and Parquet row group), read with one query each.
+CHUNK_SIZE = 50_000
+
+STATUSES = [status.value for status in prisma.enums.BookingStatus]
+
+_STATUS_ARRAY = "ARRAY[%s]" % ", ".join(f"'{status}'" for status in STATUSES)
+
+# One row per chunk of bookings holding one column per field, as the big-endian
+# binary values of the chunk concatenated in booking order, like the utilization
+# query does. Statuses are their index in STATUSES. Chunks follow each other by
+# booking id, so every query is an index range scan however far the export has come.
+_CHUNK_QUERY = f"""
+SELECT
+    max(id) AS last_id,
+    string_agg(int4send(id), ''::bytea ORDER BY id) AS ids,
+    string_agg(int4send("userId"), ''::bytea ORDER BY id) AS users,
+    string_agg(int4send("slotId"), ''::bytea ORDER BY id) AS slots,
+    string_agg(int4send("professionalId"), ''::bytea ORDER BY id) AS professionals,
+    string_agg(int2send(status), ''::bytea ORDER BY id) AS statuses,
+    string_agg(int8send(created), ''::bytea ORDER BY id) AS created,
+    string_agg(int8send(starts), ''::bytea ORDER BY id) AS starts,
+    string_agg(int8send(ends), ''::bytea ORDER BY id) AS ends
+FROM (
+    SELECT
+        b.id,
+        b."userId",
+        b."slotId",
+        s."professionalId",
+        (array_position({_STATUS_ARRAY}, b.status::text) - 1)::int2 AS status,
+        (extract(epoch FROM b."createdAt") * 1000000)::bigint AS created,
+        (extract(epoch FROM s."startTime") * 1000000)::bigint AS starts,
+        (extract(epoch FROM s."endTime") * 1000000)::bigint AS ends
+    FROM "Booking" b
+    JOIN "Slot" s ON s.id = b."slotId"
+    WHERE b.id > $1
+        AND b."createdAt" >= $2::text::timestamp
+        AND b."createdAt" < $3::text::timestamp
+    ORDER BY b.id
+    LIMIT $4
+) bookings
+"""
+
+
+def _column(value: Optional[str], dtype: str) -> Any:
+    import numpy as np
+
+    # Prisma returns bytea values base64 encoded.
+    return np.frombuffer(base64.b64decode(value or ""), dtype=dtype)
+
+
+def _schema() -> Any:
+    import pyarrow as pa
+
+    timestamp = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            ("bookingId", pa.int32()),
+            ("userId", pa.int32()),
+            ("slotId", pa.int32()),
+            ("professionalId", pa.int32()),
+            ("specialty", pa.dictionary(pa.int32(), pa.string())),
+            ("status", pa.dictionary(pa.int8(), pa.string())),
+            ("createdAt", timestamp),
+            ("startTime", timestamp),
+            ("endTime", timestamp),
+        ]
+    )
+
+
+def _specialties(professionals: List[prisma.models.Professional]) -> Tuple[Any, ...]:
+    import numpy as np
+
+    # Professional IDs in order with the index of their specialty in the sorted
+    # names, ending with an ID matching none for professionals created meanwhile.
+    names = sorted({professional.specialty for professional in professionals})
+    ordered = sorted(professionals, key=lambda professional: professional.id)
+    ids = np.array([professional.id for professional in ordered] + [-1], np.int32)
+    codes = np.array(
+        [names.index(professional.specialty) for professional in ordered] + [0],
+        np.int32,
+    )
+    return ids, codes, names
+
+
+def _batch(row: Dict[str, Any], specialties: Tuple[Any, ...], schema: Any) -> Any:
+    import numpy as np
+    import pyarrow as pa
+
+    ids, codes, names = specialties
+    professionals = _column(row["professionals"], ">i4").astype(np.int32)
+    positions = np.minimum(np.searchsorted(ids[:-1], professionals), len(ids) - 1)
+    specialty = pa.DictionaryArray.from_arrays(
+        pa.array(codes[positions], mask=ids[positions] != professionals),
+        pa.array(names, pa.string()),
+    )
+    status = pa.DictionaryArray.from_arrays(
+        pa.array(_column(row["statuses"], ">i2").astype(np.int8)),
+        pa.array(STATUSES, pa.string()),
+    )
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(_column(row["ids"], ">i4").astype(np.int32)),
+            pa.array(_column(row["users"], ">i4").astype(np.int32)),
+            pa.array(_column(row["slots"], ">i4").astype(np.int32)),
+            pa.array(professionals),
+            specialty,
+            status,
+            pa.array(_column(row["created"], ">i8").astype(np.int64), schema[6].type),
+            pa.array(_column(row["starts"], ">i8").astype(np.int64), schema[7].type),
+            pa.array(_column(row["ends"], ">i8").astype(np.int64), schema[8].type),
+        ],
+        schema=schema,
+    )
+
+
+async def _export(
+    format: Literal["parquet", "arrow"],
+    startDate: Optional[date],
+    endDate: Optional[date],
+) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    client = project.database.reader()
+    specialties = _specialties(
+        await prisma.models.Professional.prisma(client).find_many()
+    )
+    schema = _schema()
+    # The writers write to a buffer that is handed out and emptied after every
+    # batch, so that no more than one chunk is held in memory.
+    sink = io.BytesIO()
+    writer = (
+        pq.ParquetWriter(sink, schema, compression="zstd")
+        if format == "parquet"
+        else pa.ipc.new_stream(sink, schema)
+    )
+    last_id = 0
+    try:
+        while True:
+            rows = await client.query_raw(
+                _CHUNK_QUERY,
+                last_id,
+                startDate.isoformat() if startDate else "-infinity",
+                (endDate + timedelta(days=1)).isoformat() if endDate else "infinity",
+                CHUNK_SIZE,
+            )
+            row = rows[0] if rows else {}
+            if row.get("last_id") is None:
+                break
+            last_id = row["last_id"]
+            writer.write_batch(_batch(row, specialties, schema))
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    finally:
+        writer.close()
+    yield sink.getvalue()
+
+
+async def exportBookings(
+    requesterRole: prisma.enums.Role,
+    format: Literal["parquet", "arrow"],
+    startDate: Optional[date] = None,
+    endDate: Optional[date] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Exports all bookings, joined with their slot and the professional's specialty, as a Parquet file or an Arrow IPC stream for analysis. Bookings are read CHUNK_SIZE at a time in order of their ID and every chunk is written as one record batch (Parquet row group) before the next is read, so that a full history streams in constant memory. Only admins may export bookings.
+
+    Args:
+        requesterRole (prisma.enums.Role): The role of the person making the request. Must be Admin.
+        format (Literal["parquet", "arrow"]): Parquet (zstd compressed) or the Arrow IPC streaming format.
+        startDate (Optional[date]): Only export bookings made from this day (UTC).
+        endDate (Optional[date]): Only export bookings made up to this day (UTC), inclusive.
+
+    Returns:
+        AsyncIterator[bytes]: The chunks of the file, to be streamed. Columns are bookingId, userId, slotId, professionalId, specialty, status, createdAt, startTime and endTime.
+    """
+    if requesterRole != prisma.enums.Role.ADMIN:
+        raise ValueError("Only admins can export bookings.")
+    if startDate and endDate and startDate > endDate:
+        raise ValueError("startDate must not be after endDate.")
+    return _export(format, startDate, endDate)
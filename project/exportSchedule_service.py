@@ -0,0 +1,136 @@
+import csv
+import io
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Literal, Optional
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.database
+from project.listSchedules_service import booking_status
+
+# Slots read per query while exporting.
+BATCH_SIZE = 500
+
+CSV_COLUMNS = ["slotId", "startTime", "endTime", "isActive", "bookingStatus"]
+
+
+async def _slots(
+    professionalId: int, startDate: Optional[datetime], endDate: Optional[datetime]
+) -> AsyncIterator[List[prisma.models.Slot]]:
+    # Keyset pagination: every batch starts after the last slot of the previous one.
+    client = project.database.reader(project.database.professional_key(professionalId))
+    where = {
+        "professionalId": professionalId,
+        "startTime": {"gte": startDate} if startDate else None,
+        "endTime": {"lte": endDate} if endDate else None,
+    }
+    cursor = None
+    while True:
+        slots = await prisma.models.Slot.prisma(client).find_many(
+            where=where,
+            include={"bookings": True},
+            order=[{"startTime": "asc"}, {"id": "asc"}],
+            take=BATCH_SIZE,
+            skip=1 if cursor else None,
+            cursor=cursor,
+        )
+        if slots:
+            yield slots
+        if len(slots) < BATCH_SIZE:
+            return
+        cursor = {"id": slots[-1].id}
+
+
+def _ics_time(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _summary(slot: prisma.models.Slot) -> str:
+    if not slot.isActive:
+        return "Unavailable"
+    statuses = {booking.status for booking in slot.bookings or ()}
+    if prisma.enums.BookingStatus.CONFIRMED in statuses:
+        return "Booked"
+    if prisma.enums.BookingStatus.PENDING in statuses:
+        return "Booking requested"
+    return "Available"
+
+
+def _event(slot: prisma.models.Slot, stamp: str) -> str:
+    summary = _summary(slot)
+    # Free slots do not block the time in the professional's calendar.
+    transparency = "TRANSPARENT" if summary == "Available" else "OPAQUE"
+    return (
+        "BEGIN:VEVENT\r\n"
+        f"UID:slot-{slot.id}@availability-checker\r\n"
+        f"DTSTAMP:{stamp}\r\n"
+        f"DTSTART:{_ics_time(slot.startTime)}\r\n"
+        f"DTEND:{_ics_time(slot.endTime)}\r\n"
+        f"SUMMARY:{summary}\r\n"
+        f"TRANSP:{transparency}\r\n"
+        "END:VEVENT\r\n"
+    )
+
+
+async def _ics(
+    professionalId: int, startDate: Optional[datetime], endDate: Optional[datetime]
+) -> AsyncIterator[str]:
+    stamp = _ics_time(datetime.now(timezone.utc))
+    yield (
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"
+        "PRODID:-//Availability Checker//Schedules//EN\r\n"
+        f"X-WR-CALNAME:Schedule of professional {professionalId}\r\n"
+    )
+    async for slots in _slots(professionalId, startDate, endDate):
+        yield "".join(_event(slot, stamp) for slot in slots)
+    yield "END:VCALENDAR\r\n"
+
+
+async def _csv(
+    professionalId: int, startDate: Optional[datetime], endDate: Optional[datetime]
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    async for slots in _slots(professionalId, startDate, endDate):
+        for slot in slots:
+            writer.writerow(
+                [
+                    slot.id,
+                    slot.startTime.isoformat(),
+                    slot.endTime.isoformat(),
+                    slot.isActive,
+                    booking_status(slot).value,
+                ]
+            )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def exportSchedule(
+    professionalId: int,
+    format: Literal["ics", "csv"],
+    startDate: Optional[datetime] = None,
+    endDate: Optional[datetime] = None,
+) -> AsyncIterator[str]:
+    """
+    Exports the schedule slots of a professional as an iCalendar feed, to subscribe to from calendar apps, or as CSV. The slots are read in batches of BATCH_SIZE and the export is produced batch by batch, so that long histories can be streamed in constant memory.
+
+    Args:
+        professionalId (int): The unique identifier of the professional whose schedule is exported.
+        format (Literal["ics", "csv"]): iCalendar (one event per slot, summarized as Available, Booking requested, Booked or Unavailable) or CSV (one row per slot with its booking status, as listed by listSchedules).
+        startDate (Optional[datetime]): Only export slots starting from this date.
+        endDate (Optional[datetime]): Only export slots ending up to this date.
+
+    Returns:
+        AsyncIterator[str]: The chunks of the export, to be streamed.
+    """
+    if format == "ics":
+        return _ics(professionalId, startDate, endDate)
+    return _csv(professionalId, startDate, endDate)
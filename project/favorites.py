@@ -0,0 +1,132 @@
+"""
+Cache of users' favorite professionals.
+
+Favorites are read by several user routes and rarely change, so every worker
+keeps the favorites of recently seen users, along with the id of the profile
+they belong to, which the favorites mutations need. Entries are dropped on
+USER_CHANGED events naming the user (which every favorites mutation publishes)
+and after FAVORITES_CACHE_SECONDS, as professionals can be edited outside the
+API.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+import prisma.models
+import project.database
+import project.events
+import project.settings
+
+_CACHE_SIZE = 100_000
+
+
+@dataclass(frozen=True)
+class Favorites:
+    """
+    The favorite professionals of a user's profile.
+    """
+
+    profileId: int
+    professionals: Tuple[prisma.models.Professional, ...]
+
+    @property
+    def ids(self) -> FrozenSet[int]:
+        return frozenset(professional.id for professional in self.professionals)
+
+
+# user id -> (expiry as a time.monotonic() timestamp, favorites), least recently used first.
+_cache: OrderedDict[int, Tuple[float, Favorites]] = OrderedDict()
+# Bumped per user on every invalidation, so that favorites read before a change
+# are not cached after the change dropped them.
+_versions: Dict[int, int] = {}
+
+
+def _invalidate(payload: Dict[str, Any]) -> None:
+    user_ids = list(payload.get("userIds") or ())
+    if payload.get("userId") is not None:
+        user_ids.append(payload["userId"])
+    for user_id in user_ids:
+        _versions[user_id] = _versions.get(user_id, 0) + 1
+        _cache.pop(user_id, None)
+
+
+def _clear(payload: Dict[str, Any]) -> None:
+    for user_id in _cache:
+        _versions[user_id] = _versions.get(user_id, 0) + 1
+    _cache.clear()
+
+
+project.events.subscribe(project.events.USER_CHANGED, _invalidate)
+project.events.subscribe(project.events.RESYNC, _clear)
+
+
+def version(user_id: int) -> int:
+    """
+    Returns the version of a user's cached favorites, to be read before the
+    favorites are queried and passed to :func:`put` with them.
+    """
+    return _versions.get(user_id, 0)
+
+
+def get(user_id: int) -> Optional[Favorites]:
+    """
+    Returns the cached favorites of a user, or None if they are not cached.
+    """
+    entry = _cache.get(user_id)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del _cache[user_id]
+        return None
+    _cache.move_to_end(user_id)
+    return entry[1]
+
+
+def put(user_id: int, read_version: int, profile: prisma.models.Profile) -> Favorites:
+    """
+    Caches the favorites of a user, unless they changed since read_version was taken.
+
+    Args:
+        user_id (int): The user.
+        read_version (int): The result of :func:`version` before the profile was read.
+        profile (prisma.models.Profile): The user's profile, read with its favorites included.
+
+    Returns:
+        Favorites: The favorites of the profile.
+    """
+    favorites = Favorites(
+        profileId=profile.id, professionals=tuple(profile.favorites or ())
+    )
+    if _versions.get(user_id, 0) == read_version:
+        _cache[user_id] = (
+            time.monotonic() + project.settings.FAVORITES_CACHE_SECONDS,
+            favorites,
+        )
+        _cache.move_to_end(user_id)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return favorites
+
+
+async def load(user_id: int) -> Optional[Favorites]:
+    """
+    Returns the favorites of a user from the cache, or reads and caches them.
+
+    Args:
+        user_id (int): The user.
+
+    Returns:
+        Optional[Favorites]: The favorites, or None if the user has no profile.
+    """
+    favorites = get(user_id)
+    if favorites is not None:
+        return favorites
+    read_version = version(user_id)
+    profile = await prisma.models.Profile.prisma(
+        project.database.reader(project.database.user_key(user_id))
+    ).find_first(where={"userId": user_id}, include={"favorites": True})
+    if profile is None:
+        return None
+    return put(user_id, read_version, profile)
@@ -3,6 +3,7 @@ from typing import List, Optional
 
 import prisma
 import prisma.models
+import project.database
 from pydantic import BaseModel
 
 
@@ -47,8 +48,8 @@ async def fetchNotifications(
         GetNotificationsResponse: This model represents the list of notifications that match the query filters provided by the user.
     """
     query_params = {
-        "where": {"User": {"id": user_id}, "AND": []},
-        "order_by": {"createdAt": "desc"},
+        "where": {"user": {"id": user_id}, "AND": []},
+        "order": {"createdAt": "desc"},
     }
     if status:
         query_params["where"]["AND"].append({"read": status.lower() == "read"})
@@ -61,7 +62,9 @@ async def fetchNotifications(
         if end_date:
             date_filter["lte"] = end_date
         query_params["where"]["AND"].append({"createdAt": date_filter})
-    notifications = await prisma.models.Notification.prisma().find_many(**query_params)
+    notifications = await prisma.models.Notification.prisma(
+        project.database.reader(project.database.user_key(user_id))
+    ).find_many(**query_params)
     response_notifications = [
         Notification(
             id=n.id,
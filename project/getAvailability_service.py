@@ -1,17 +1,30 @@
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Literal, Optional, Set
 
 import prisma
+import prisma.enums
 import prisma.models
-from pydantic import BaseModel
+import project.database
+import project.holds
+from pydantic import BaseModel, Field
+
+# The fields of a professional that can be requested, and those returned by default.
+AvailabilityField = Literal[
+    "professionalId", "fullName", "specialty", "slots", "nextFreeTime"
+]
+DEFAULT_FIELDS = ("fullName", "specialty", "slots")
+
+# Longest window, in days, that can be requested.
+MAX_WINDOW_DAYS = 366
 
 
 class FetchAvailabilityRequest(BaseModel):
     """
-    Request model for fetching real-time availability data of professionals. As there are no specific request parameters required, this model is kept empty to signify it can handle generic queries for availability.
+    Request model for fetching real-time availability data of professionals. Both parameters are optional: fields lists the fields of each professional to return besides professionalId (fullName, specialty and slots by default; nextFreeTime on request), and window the number of days ahead whose slots are considered (all slots by default).
     """
 
-    pass
+    fields: Optional[List[AvailabilityField]] = None
+    window: Optional[int] = Field(default=None, ge=1, le=MAX_WINDOW_DAYS)
 
 
 class SlotDetails(BaseModel):
@@ -27,13 +40,14 @@ class SlotDetails(BaseModel):
 
 class ProfessionalAvailability(BaseModel):
     """
-    Stores individual professional's availability data including detailed slots and booking statuses.
+    Stores individual professional's availability data including detailed slots and booking statuses. Only the requested fields are set, and only those are returned.
     """
 
     professionalId: int
-    fullName: str
-    specialty: str
-    slots: List[SlotDetails]
+    fullName: Optional[str] = None
+    specialty: Optional[str] = None
+    slots: Optional[List[SlotDetails]] = None
+    nextFreeTime: Optional[datetime] = None
 
 
 class FetchAvailabilityResponse(BaseModel):
@@ -44,38 +58,102 @@ class FetchAvailabilityResponse(BaseModel):
     professionals: List[ProfessionalAvailability]
 
 
+def _fields(request: FetchAvailabilityRequest) -> Set[str]:
+    return set(DEFAULT_FIELDS if request.fields is None else request.fields)
+
+
+def depends_on_time(request: FetchAvailabilityRequest) -> bool:
+    """
+    Tells whether the response to a request changes as time passes, and not only
+    with the data: when it is limited to a window or has nextFreeTime.
+    """
+    return request.window is not None or "nextFreeTime" in _fields(request)
+
+
+def _is_free(slot: prisma.models.Slot) -> bool:
+    return not any(
+        booking.status != prisma.enums.BookingStatus.CANCELLED
+        for booking in slot.bookings or ()
+    )
+
+
 async def getAvailability(
     request: FetchAvailabilityRequest,
 ) -> FetchAvailabilityResponse:
     """
-    Fetches real-time availability data of professionals. This endpoint queries the Schedule Management module to retrieve current activity or scheduled data. It is expected to return a list of professionals along with their current availability status. The response is dynamically updated as the Schedule Management data changes.
+    Fetches real-time availability data of professionals. This endpoint queries the Schedule Management module to retrieve current activity or scheduled data. It is expected to return a list of professionals along with their current availability status. The response is dynamically updated as the Schedule Management data changes. Only the requested fields are read and returned: without slots, no slots or bookings are read, and nextFreeTime alone reads one slot per professional, the earliest upcoming active slot that is neither held nor booked.
 
     Args:
-        request (FetchAvailabilityRequest): Request model for fetching real-time availability data of professionals. As there are no specific request parameters required, this model is kept empty to signify it can handle generic queries for availability.
+        request (FetchAvailabilityRequest): The fields to return and the number of days ahead to consider, both optional.
 
     Returns:
         FetchAvailabilityResponse: Response model that provides a list of professionals along with associated availability details. The response includes dynamic updates from the Schedule Management module.
     """
-    professionals_data = await prisma.models.Professional.prisma().find_many(
-        include={"availableSlots": {"include": {"bookings": True}}}
+    fields = _fields(request)
+    now = datetime.now(timezone.utc)
+    held = project.holds.held_slot_ids()
+    slot_where: Dict[str, Any] = {
+        "isActive": True,
+        "id": {"not_in": held} if held else None,
+    }
+    if request.window is not None:
+        slot_where["endTime"] = {"gt": now}
+        slot_where["startTime"] = {"lt": now + timedelta(days=request.window)}
+    include: Optional[Dict[str, Any]] = None
+    if "slots" in fields:
+        include = {
+            "availableSlots": {"where": slot_where, "include": {"bookings": True}}
+        }
+    elif "nextFreeTime" in fields:
+        include = {
+            "availableSlots": {
+                "where": {
+                    **slot_where,
+                    "startTime": {**slot_where.get("startTime", {}), "gte": now},
+                    "bookings": {
+                        "none": {
+                            "status": {"not": prisma.enums.BookingStatus.CANCELLED}
+                        }
+                    },
+                },
+                "order_by": {"startTime": "asc"},
+                "take": 1,
+            }
+        }
+    # Responses that get an ETag are read from the primary right after changes.
+    client = (
+        project.database.reader()
+        if depends_on_time(request)
+        else project.database.reader(project.database.ALL_PROFESSIONALS_KEY)
+    )
+    professionals_data = await prisma.models.Professional.prisma(client).find_many(
+        include=include
     )
     professionals_availability = []
     for professional in professionals_data:
-        slots_list = []
-        for slot in professional.availableSlots:
-            if slot.isActive:
-                slot_details = SlotDetails(
+        values: Dict[str, Any] = {"professionalId": professional.id}
+        if "fullName" in fields:
+            values["fullName"] = professional.email
+        if "specialty" in fields:
+            values["specialty"] = professional.specialty
+        if "slots" in fields:
+            values["slots"] = [
+                SlotDetails(
                     startTime=slot.startTime,
                     endTime=slot.endTime,
                     isActive=slot.isActive,
                     bookings=len(slot.bookings),
                 )
-                slots_list.append(slot_details)
-        professional_availability = ProfessionalAvailability(
-            professionalId=professional.id,
-            fullName=professional.email,
-            specialty=professional.specialty,
-            slots=slots_list,
-        )
-        professionals_availability.append(professional_availability)
+                for slot in professional.availableSlots
+            ]
+        if "nextFreeTime" in fields:
+            values["nextFreeTime"] = min(
+                (
+                    slot.startTime
+                    for slot in professional.availableSlots
+                    if slot.startTime >= now and _is_free(slot)
+                ),
+                default=None,
+            )
+        professionals_availability.append(ProfessionalAvailability(**values))
     return FetchAvailabilityResponse(professionals=professionals_availability)
@@ -0,0 +1,66 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+import project.daygrid
+from pydantic import BaseModel
+
+# Most professionals a single request may intersect.
+MAX_PROFESSIONALS = 20
+
+
+class CommonWindow(BaseModel):
+    """
+    A period in which all requested professionals are free.
+    """
+
+    startTime: datetime
+    endTime: datetime
+
+
+class CommonAvailabilityResponse(BaseModel):
+    """
+    The periods of a day in which all requested professionals are free at the same time.
+    """
+
+    date: date
+    professionalIds: List[int]
+    tickMinutes: int
+    windows: List[CommonWindow]
+
+
+async def getCommonAvailability(
+    ids: List[int], day: date, minMinutes: Optional[int]
+) -> CommonAvailabilityResponse:
+    """
+    Finds the free time that several professionals share on one day, e.g. a doctor and an interpreter for a joint appointment. Free time is made of active slots without a booking that is not cancelled, on a grid of project.daygrid.TICK_MINUTES minute ticks: partly covered ticks at the ends of a slot do not count, and adjacent slots join into one window.
+
+    Args:
+        ids (List[int]): The professionals, at least one and at most MAX_PROFESSIONALS.
+        day (date): The day (UTC).
+        minMinutes (Optional[int]): Leaves out windows shorter than this many minutes.
+
+    Returns:
+        CommonAvailabilityResponse: The shared free windows of the day, in order.
+    """
+    professional_ids = list(dict.fromkeys(ids))
+    if not professional_ids:
+        raise ValueError("At least one professional id is required.")
+    if len(professional_ids) > MAX_PROFESSIONALS:
+        raise ValueError(
+            f"At most {MAX_PROFESSIONALS} professionals can be intersected at once."
+        )
+    free = await project.daygrid.free_bits(professional_ids, day)
+    common = project.daygrid.FULL_DAY
+    for professional_id in professional_ids:
+        common &= free[professional_id]
+    windows = [
+        CommonWindow(startTime=start, endTime=end)
+        for start, end in project.daygrid.windows(common, day)
+        if not minMinutes or (end - start).total_seconds() >= minMinutes * 60
+    ]
+    return CommonAvailabilityResponse(
+        date=day,
+        professionalIds=professional_ids,
+        tickMinutes=project.daygrid.TICK_MINUTES,
+        windows=windows,
+    )
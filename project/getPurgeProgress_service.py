@@ -0,0 +1,40 @@
+from typing import Optional
+
+import project.purge
+from pydantic import BaseModel
+
+
+class PurgeProgressResponse(BaseModel):
+    """
+    Progress of the background deletion of a user: its state (running, done or failed), how many bookings and notifications it deletes and how many are gone.
+    """
+
+    purgeId: str
+    userId: int
+    state: str
+    total: int
+    deleted: int
+    error: Optional[str]
+
+
+async def getPurgeProgress(purgeId: str) -> PurgeProgressResponse:
+    """
+    Reports how far the background deletion of a user with a large history has come. Such deletions are started by deleting the user or their profile, which return the purgeId.
+
+    Args:
+        purgeId (str): The ID of the deletion job, as returned when the user was deleted.
+
+    Returns:
+        PurgeProgressResponse: Progress of the background deletion of a user: its state (running, done or failed), how many bookings and notifications it deletes and how many are gone.
+    """
+    job = project.purge.get(purgeId)
+    if job is None:
+        raise ValueError("Purge not found.")
+    return PurgeProgressResponse(
+        purgeId=job.id,
+        userId=job.userId,
+        state=job.state,
+        total=job.total,
+        deleted=job.deleted,
+        error=job.error,
+    )
@@ -0,0 +1,37 @@
+import prisma
+import prisma.models
+import project.auth
+from pydantic import BaseModel
+
+
+class ScheduleFeedResponse(BaseModel):
+    """
+    The private addresses of a professional's schedule exports, for calendar apps to subscribe to.
+    """
+
+    professionalId: int
+    icsUrl: str
+    csvUrl: str
+
+
+async def getScheduleFeed(professionalId: int) -> ScheduleFeedResponse:
+    """
+    Returns the addresses of the iCalendar and CSV exports of a professional's schedule. They carry a token signed for this professional, as calendar apps cannot sign in, so they should only be shared with the professional.
+
+    Args:
+        professionalId (int): The unique identifier of the professional whose schedule feeds are requested.
+
+    Returns:
+        ScheduleFeedResponse: The private addresses of a professional's schedule exports, for calendar apps to subscribe to.
+    """
+    professional = await prisma.models.Professional.prisma().find_unique(
+        where={"id": professionalId}
+    )
+    if professional is None:
+        raise ValueError("Professional not found.")
+    token = project.auth.feed_token(professionalId)
+    return ScheduleFeedResponse(
+        professionalId=professionalId,
+        icsUrl=f"/schedules/{professionalId}.ics?token={token}",
+        csvUrl=f"/schedules/{professionalId}.csv?token={token}",
+    )
@@ -4,6 +4,8 @@ from typing import List
 import prisma
 import prisma.enums
 import prisma.models
+import project.database
+import project.favorites
 from pydantic import BaseModel
 
 
@@ -53,8 +55,22 @@ async def getUserProfile(user_id: int) -> UserProfileResponse:
         UserProfileResponse: Provides detailed user profile information including both personal details
                              and professional affiliations like booked appointments and favorite professionals.
     """
-    user_profile = await prisma.models.Profile.prisma().find_first(
-        where={"userId": user_id}, include={"user": True, "favorites": True}
+    cached = project.favorites.get(user_id)
+    read_version = project.favorites.version(user_id)
+    user_profile = await prisma.models.Profile.prisma(
+        project.database.reader(project.database.user_key(user_id))
+    ).find_first(
+        where={"userId": user_id},
+        include={
+            "user": {
+                "include": {
+                    "bookings": {
+                        "include": {"slot": {"include": {"professional": True}}}
+                    }
+                }
+            },
+            "favorites": cached is None,
+        },
     )
     if user_profile is None:
         return UserProfileResponse(
@@ -73,8 +89,10 @@ async def getUserProfile(user_id: int) -> UserProfileResponse:
                 professional_name=booking.slot.professional.email,
             )
         )
+    if cached is None:
+        cached = project.favorites.put(user_id, read_version, user_profile)
     favorites = []
-    for favorite in user_profile.favorites:
+    for favorite in cached.professionals:
         favorites.append(
             ProfessionalMini(
                 professional_id=favorite.id,
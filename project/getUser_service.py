@@ -4,6 +4,8 @@ from typing import List
 import prisma
 import prisma.enums
 import prisma.models
+import project.database
+import project.favorites
 from pydantic import BaseModel
 
 
@@ -41,12 +43,30 @@ class UserProfileResponse(BaseModel):
 
 
 async def fetch_full_user_profile(user_id: int) -> UserProfileResponse:
-    user = await prisma.models.User.prisma().find_unique(
-        where={"id": user_id}, include={"profiles": True, "bookings": True}
+    cached = project.favorites.get(user_id)
+    read_version = project.favorites.version(user_id)
+    user = await prisma.models.User.prisma(
+        project.database.reader(project.database.user_key(user_id))
+    ).find_unique(
+        where={"id": user_id},
+        include={
+            "profiles": (
+                True if cached is not None else {"include": {"favorites": True}}
+            ),
+            "bookings": {"include": {"slot": {"include": {"professional": True}}}},
+        },
     )
     if not user:
         raise ValueError("prisma.models.User not found!")
     profile = user.profiles[0] if user.profiles else None
+    if profile is None:
+        favorite_professionals = ()
+    elif cached is not None:
+        favorite_professionals = cached.professionals
+    else:
+        favorite_professionals = project.favorites.put(
+            user_id, read_version, profile
+        ).professionals
     booked_appointments = [
         BookingOverview(
             booking_id=b.id,
@@ -58,8 +78,7 @@ async def fetch_full_user_profile(user_id: int) -> UserProfileResponse:
     ]
     favorites = [
         ProfessionalMini(professional_id=p.id, name=p.email, specialty=p.specialty)
-        for p in profile.favorites
-        if profile
+        for p in favorite_professionals
     ]
     return UserProfileResponse(
         user_id=user.id,
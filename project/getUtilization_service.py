@@ -0,0 +1,256 @@
+import base64
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+import prisma.models
+import project.database
+import project.events
+import project.settings
+from pydantic import BaseModel
+
+# Longest window a single request may cover, in days.
+MAX_WINDOW_DAYS = 366
+
+# One row holding one column per array: each is the big-endian binary values of
+# all active slots in the window, concatenated in the same (scan) order because
+# every aggregate consumes the rows of a single pass. Moving them as bytea keeps
+# the engine and the client from building and parsing a JSON value per slot.
+_SLOT_COLUMNS_QUERY = """
+SELECT
+    string_agg(int4send("professionalId"), ''::bytea) AS professionals,
+    string_agg(int8send(start), ''::bytea) AS starts,
+    string_agg(int4send(seconds), ''::bytea) AS scheduled,
+    string_agg(int4send(CASE WHEN booked THEN seconds ELSE 0 END), ''::bytea) AS booked
+FROM (
+    SELECT
+        s."professionalId",
+        extract(epoch FROM s."startTime")::bigint AS start,
+        extract(epoch FROM s."endTime" - s."startTime")::int AS seconds,
+        EXISTS (
+            SELECT 1 FROM "Booking" b
+            WHERE b."slotId" = s.id AND b.status <> 'CANCELLED'
+        ) AS booked
+    FROM "Slot" s
+    WHERE s."isActive"
+        AND s."startTime" >= $1::text::timestamp
+        AND s."startTime" < $2::text::timestamp
+) slots
+"""
+
+_CACHE_SIZE = 64
+
+
+class UtilizationPeriod(BaseModel):
+    """
+    Scheduled and booked time of a professional or specialty in one day or week.
+    """
+
+    periodStart: date
+    scheduledMinutes: float
+    bookedMinutes: float
+    utilization: float
+
+
+class GroupUtilization(BaseModel):
+    """
+    Utilization of one professional or specialty over the whole window, with a breakdown per period.
+    """
+
+    professionalId: Optional[int] = None
+    specialty: str
+    scheduledMinutes: float
+    bookedMinutes: float
+    utilization: float
+    periods: List[UtilizationPeriod]
+
+
+class UtilizationResponse(BaseModel):
+    """
+    Booked minutes relative to scheduled minutes per professional or specialty and per day or week.
+    """
+
+    startDate: date
+    endDate: date
+    granularity: Literal["day", "week"]
+    groupBy: Literal["professional", "specialty"]
+    groups: List[GroupUtilization]
+
+
+# (startDate, endDate, granularity, groupBy) -> (expiry, response), least
+# recently used first. Cleared whenever a schedule or booking changes.
+_cache: OrderedDict[Tuple[date, date, str, str], Tuple[float, UtilizationResponse]] = (
+    OrderedDict()
+)
+# Bumped on every invalidation, so that a result computed from data read before
+# a change is not cached after the change cleared the cache.
+_generation = 0
+
+
+def _invalidate(payload: Dict[str, Any]) -> None:
+    global _generation
+    _generation += 1
+    _cache.clear()
+
+
+for _kind in (
+    project.events.SCHEDULE_CHANGED,
+    project.events.BOOKING_CHANGED,
+    project.events.RESYNC,
+):
+    project.events.subscribe(_kind, _invalidate)
+
+
+def _column(value: Optional[str], dtype: str) -> Any:
+    import numpy as np
+
+    # Prisma returns bytea values base64 encoded, and NULL for an empty window.
+    return np.frombuffer(base64.b64decode(value or ""), dtype=dtype)
+
+
+def _utilization(
+    row: Dict[str, Any],
+    specialties: Dict[int, str],
+    start_date: date,
+    end_date: date,
+    granularity: str,
+    group_by: str,
+) -> List[GroupUtilization]:
+    import numpy as np
+
+    professionals = _column(row.get("professionals"), ">i4").astype(np.int64)
+    days = _column(row.get("starts"), ">i8") // 86400
+    scheduled = _column(row.get("scheduled"), ">i4") / 60.0
+    booked = _column(row.get("booked"), ">i4") / 60.0
+    if not len(professionals):
+        return []
+
+    # Period index of every slot, counted from the period containing startDate.
+    # Weeks start on Monday; day 0 of the epoch (1970-01-01) was a Thursday.
+    first_day = (start_date - date(1970, 1, 1)).days
+    last_day = (end_date - date(1970, 1, 1)).days
+    if granularity == "week":
+        first_day -= (first_day + 3) % 7
+        periods = (days - first_day) // 7
+        period_count = (last_day - first_day) // 7 + 1
+        period_length = 7
+    else:
+        periods = days - first_day
+        period_count = last_day - first_day + 1
+        period_length = 1
+
+    if group_by == "specialty":
+        ids = np.unique(professionals)
+        names = np.array(
+            [specialties.get(professional_id, "") for professional_id in ids.tolist()]
+        )
+        keys, groups = np.unique(
+            names[np.searchsorted(ids, professionals)], return_inverse=True
+        )
+    else:
+        keys, groups = np.unique(professionals, return_inverse=True)
+
+    # A single pass over the slots: every (group, period) cell gets its total
+    # from one bincount per measure.
+    cells = groups * period_count + periods
+    size = len(keys) * period_count
+    scheduled_cells = np.bincount(cells, weights=scheduled, minlength=size).reshape(
+        len(keys), period_count
+    )
+    booked_cells = np.bincount(cells, weights=booked, minlength=size).reshape(
+        len(keys), period_count
+    )
+    scheduled_totals = scheduled_cells.sum(axis=1).tolist()
+    booked_totals = booked_cells.sum(axis=1).tolist()
+
+    results = []
+    for index, key in enumerate(keys.tolist()):
+        row_scheduled = scheduled_cells[index].tolist()
+        row_booked = booked_cells[index].tolist()
+        period_list = [
+            UtilizationPeriod(
+                periodStart=date(1970, 1, 1)
+                + timedelta(days=first_day + period * period_length),
+                scheduledMinutes=row_scheduled[period],
+                bookedMinutes=row_booked[period],
+                utilization=row_booked[period] / row_scheduled[period],
+            )
+            for period in np.flatnonzero(scheduled_cells[index]).tolist()
+        ]
+        results.append(
+            GroupUtilization(
+                professionalId=key if group_by == "professional" else None,
+                specialty=key if group_by == "specialty" else specialties.get(key, ""),
+                scheduledMinutes=scheduled_totals[index],
+                bookedMinutes=booked_totals[index],
+                utilization=booked_totals[index] / scheduled_totals[index],
+                periods=period_list,
+            )
+        )
+    return results
+
+
+async def getUtilization(
+    startDate: Optional[date],
+    endDate: Optional[date],
+    granularity: Literal["day", "week"],
+    groupBy: Literal["professional", "specialty"],
+) -> UtilizationResponse:
+    """
+    Computes how much of the scheduled time of professionals is booked, per professional or per specialty and per day or week. Only active slots count as scheduled time, and a slot counts as booked while it has a booking that is not cancelled. Slots are attributed to the UTC day they start on. Results are cached per window until a schedule or booking changes, or for at most ANALYTICS_CACHE_SECONDS.
+
+    Args:
+        startDate (Optional[date]): First day of the window (UTC). Defaults to 27 days before endDate.
+        endDate (Optional[date]): Last day of the window (UTC), inclusive. Defaults to today.
+        granularity (Literal["day", "week"]): Whether periods are days or weeks starting on Monday. The first and last week only cover the days inside the window.
+        groupBy (Literal["professional", "specialty"]): Whether to report every professional or every specialty.
+
+    Returns:
+        UtilizationResponse: Scheduled and booked minutes and their ratio per group, over the window and per period. Periods without scheduled time are left out.
+    """
+    if endDate is None:
+        endDate = datetime.now(timezone.utc).date()
+    if startDate is None:
+        startDate = endDate - timedelta(days=27)
+    if startDate > endDate:
+        raise ValueError("startDate must not be after endDate.")
+    if (endDate - startDate).days >= MAX_WINDOW_DAYS:
+        raise ValueError(f"The window must not be longer than {MAX_WINDOW_DAYS} days.")
+
+    key = (startDate, endDate, granularity, groupBy)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        _cache.move_to_end(key)
+        return cached[1]
+
+    generation = _generation
+    client = project.database.reader()
+    row = await client.query_raw(
+        _SLOT_COLUMNS_QUERY,
+        startDate.isoformat(),
+        (endDate + timedelta(days=1)).isoformat(),
+    )
+    professionals = await prisma.models.Professional.prisma(client).find_many()
+    response = UtilizationResponse(
+        startDate=startDate,
+        endDate=endDate,
+        granularity=granularity,
+        groupBy=groupBy,
+        groups=_utilization(
+            row[0] if row else {},
+            {professional.id: professional.specialty for professional in professionals},
+            startDate,
+            endDate,
+            granularity,
+            groupBy,
+        ),
+    )
+    if generation == _generation:
+        _cache[key] = (
+            time.monotonic() + project.settings.ANALYTICS_CACHE_SECONDS,
+            response,
+        )
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return response
@@ -0,0 +1,227 @@
+"""
+Temporary holds on slots, taken while a user fills in the booking form.
+
+A hold keeps a slot out of the availability listings for HOLD_TTL_SECONDS and
+lets its owner book the slot without the checks :func:`place` already made
+against the database. Holds live in memory only. Every worker keeps all of them:
+:func:`place` and :func:`release` publish HOLD_PLACED and HOLD_RELEASED events,
+and the store is changed by the event handlers, for the publishing worker and
+for the others alike.
+
+Two workers may hold the same slot at nearly the same time, before either has
+seen the other's event. Every worker then keeps the hold placed first (ties
+broken by id), so they all agree on the same winner. The loser's hold is gone
+by the time the form is submitted, and :func:`take` refuses it. Expiry uses
+wall-clock time, which must therefore be in sync across containers.
+"""
+
+import time
+import uuid
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import project.events
+import project.settings
+
+
+@dataclass(frozen=True)
+class Hold:
+    """
+    A slot reserved for one user until ``expiresAt`` (a time.time() timestamp).
+    """
+
+    id: str
+    slotId: int
+    professionalId: int
+    userId: int
+    startTime: datetime
+    endTime: datetime
+    placedAt: float
+    expiresAt: float
+
+
+_holds: Dict[str, Hold] = {}
+_by_slot: Dict[int, str] = {}
+
+
+def _drop(hold_id: str) -> None:
+    hold = _holds.pop(hold_id, None)
+    if hold is not None and _by_slot.get(hold.slotId) == hold_id:
+        del _by_slot[hold.slotId]
+
+
+def _expire(now: float) -> None:
+    for hold_id in [h.id for h in _holds.values() if h.expiresAt <= now]:
+        _drop(hold_id)
+
+
+def _live(hold_id: Optional[str], now: float) -> Optional[Hold]:
+    hold = _holds.get(hold_id) if hold_id else None
+    if hold is None or hold.expiresAt <= now:
+        return None
+    return hold
+
+
+def _on_placed(payload: Dict[str, Any]) -> None:
+    # The payload also carries what the events module adds, like the version.
+    hold = Hold(
+        **{
+            **{field.name: payload[field.name] for field in fields(Hold)},
+            "startTime": datetime.fromisoformat(payload["startTime"]),
+            "endTime": datetime.fromisoformat(payload["endTime"]),
+        }
+    )
+    now = time.time()
+    _expire(now)
+    current = _live(_by_slot.get(hold.slotId), now)
+    if current is not None:
+        if (current.placedAt, current.id) < (hold.placedAt, hold.id):
+            return
+        _drop(current.id)
+    _holds[hold.id] = hold
+    _by_slot[hold.slotId] = hold.id
+
+
+def _on_released(payload: Dict[str, Any]) -> None:
+    _drop(payload["id"])
+
+
+def _on_schedule_changed(payload: Dict[str, Any]) -> None:
+    # A changed or deleted slot may no longer be bookable as it was checked.
+    hold_id = _by_slot.get(payload.get("slotId"))
+    if hold_id is not None:
+        _drop(hold_id)
+
+
+project.events.subscribe(project.events.HOLD_PLACED, _on_placed)
+project.events.subscribe(project.events.HOLD_RELEASED, _on_released)
+project.events.subscribe(project.events.SCHEDULE_CHANGED, _on_schedule_changed)
+
+
+def holder(slot_id: int) -> Optional[int]:
+    """
+    Returns the id of the user holding a slot, or None if it is not held.
+    """
+    hold = _live(_by_slot.get(slot_id), time.time())
+    return hold.userId if hold is not None else None
+
+
+def held_slot_ids() -> List[int]:
+    """
+    Returns the ids of all slots currently held.
+    """
+    now = time.time()
+    return [hold.slotId for hold in _holds.values() if hold.expiresAt > now]
+
+
+def held_slots(professional_id: int) -> List[Hold]:
+    """
+    Returns the live holds on the slots of a professional.
+    """
+    now = time.time()
+    return [
+        hold
+        for hold in _holds.values()
+        if hold.professionalId == professional_id and hold.expiresAt > now
+    ]
+
+
+async def place(
+    slot_id: int,
+    professional_id: int,
+    user_id: int,
+    start_time: datetime,
+    end_time: datetime,
+) -> Hold:
+    """
+    Holds a slot for a user. The caller must have checked that the slot can be booked.
+
+    Args:
+        slot_id (int): The slot.
+        professional_id (int): The professional the slot belongs to.
+        user_id (int): The user the slot is held for.
+        start_time (datetime): Start of the slot.
+        end_time (datetime): End of the slot.
+
+    Returns:
+        Hold: The new hold, or the user's existing hold on the slot with a renewed expiry.
+
+    Raises:
+        ValueError: If someone else holds the slot, or the user holds HOLD_MAX_PER_USER slots already.
+    """
+    now = time.time()
+    _expire(now)
+    current = _live(_by_slot.get(slot_id), now)
+    if current is not None and current.userId != user_id:
+        raise ValueError("Slot is held by another user")
+    if current is None and (
+        sum(1 for hold in _holds.values() if hold.userId == user_id)
+        >= project.settings.HOLD_MAX_PER_USER
+    ):
+        raise ValueError("Too many slots held at once")
+    hold = Hold(
+        id=current.id if current is not None else uuid.uuid4().hex,
+        slotId=slot_id,
+        professionalId=professional_id,
+        userId=user_id,
+        startTime=start_time,
+        endTime=end_time,
+        placedAt=current.placedAt if current is not None else now,
+        expiresAt=now + project.settings.HOLD_TTL_SECONDS,
+    )
+    if current is not None:
+        _drop(current.id)
+    await project.events.publish(
+        project.events.HOLD_PLACED,
+        **{
+            **asdict(hold),
+            "startTime": start_time.isoformat(),
+            "endTime": end_time.isoformat(),
+        },
+    )
+    return hold
+
+
+async def release(hold_id: str, user_id: int) -> bool:
+    """
+    Gives up a hold.
+
+    Args:
+        hold_id (str): The hold.
+        user_id (int): The user giving it up, who must own it.
+
+    Returns:
+        bool: Whether a live hold of the user was released.
+    """
+    hold = _live(hold_id, time.time())
+    if hold is None or hold.userId != user_id:
+        return False
+    _drop(hold_id)
+    await project.events.publish(
+        project.events.HOLD_RELEASED,
+        id=hold_id,
+        slotId=hold.slotId,
+        professionalId=hold.professionalId,
+    )
+    return True
+
+
+async def take(hold_id: str, user_id: int, slot_id: int) -> Optional[Hold]:
+    """
+    Consumes a hold to book its slot: it is removed at once, so it can only be used
+    once per worker, and released on the other workers.
+
+    Args:
+        hold_id (str): The hold.
+        user_id (int): The user booking, who must own the hold.
+        slot_id (int): The slot being booked, which must be the held one.
+
+    Returns:
+        Optional[Hold]: The hold, or None if it expired, was lost or does not match.
+    """
+    hold = _live(hold_id, time.time())
+    if hold is None or hold.userId != user_id or hold.slotId != slot_id:
+        return None
+    await release(hold_id, user_id)
+    return hold
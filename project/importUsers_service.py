@@ -0,0 +1,131 @@
+from datetime import timedelta
+from typing import Dict, List
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.events
+import project.passwords
+import project.settings
+from pydantic import BaseModel
+
+
+class UserImportRow(BaseModel):
+    """
+    A user to create, with the same details as for creating a single user.
+    """
+
+    name: str
+    email: str
+    password: str
+    role: prisma.enums.Role = prisma.enums.Role.REGISTERED_USER
+
+
+class ImportFailure(BaseModel):
+    """
+    A row that was not imported: its position in the request (from 0), its email and the reason.
+    """
+
+    row: int
+    email: str
+    message: str
+
+
+class ImportUsersResponse(BaseModel):
+    """
+    The IDs of the users created, in the order of their rows, and the rows that failed.
+    """
+
+    created: int
+    user_ids: List[int]
+    failures: List[ImportFailure]
+
+
+async def importUsers(users: List[UserImportRow]) -> ImportUsersResponse:
+    """
+    Creates many user accounts with their profiles at once, e.g. when onboarding a clinic. Emails already in use, repeated within the request or empty are reported per row while the other rows are imported. All emails are checked in one query, the passwords are hashed in parallel by a process pool, and users and profiles are inserted with one statement each, in a transaction.
+
+    Args:
+        users (List[UserImportRow]): The users to create, at most USER_IMPORT_MAX_ROWS.
+
+    Returns:
+        ImportUsersResponse: The IDs of the users created, in the order of their rows, and the rows that failed.
+    """
+    if len(users) > project.settings.USER_IMPORT_MAX_ROWS:
+        raise ValueError(
+            f"At most {project.settings.USER_IMPORT_MAX_ROWS} users can be imported at once."
+        )
+    failures: List[ImportFailure] = []
+    accepted: Dict[str, int] = {}
+    for row, user in enumerate(users):
+        if not user.email or not user.password:
+            message = "Email and password are required"
+        elif user.email in accepted:
+            message = f"Email repeats row {accepted[user.email]}"
+        else:
+            accepted[user.email] = row
+            continue
+        failures.append(ImportFailure(row=row, email=user.email, message=message))
+    existing = await prisma.models.User.prisma().find_many(
+        where={"email": {"in": list(accepted)}}
+    )
+    for account in existing:
+        row = accepted.pop(account.email)
+        failures.append(
+            ImportFailure(row=row, email=account.email, message="Email already in use")
+        )
+    rows = sorted(accepted.values())
+    user_ids: List[int] = []
+    if rows:
+        hashes = await project.passwords.hash_passwords(
+            [users[row].password for row in rows]
+        )
+        async with prisma.get_client().tx(timeout=timedelta(seconds=60)) as tx:
+            # Emails taken meanwhile are skipped rather than failing the whole batch.
+            await prisma.models.User.prisma(tx).create_many(
+                data=[
+                    {
+                        "email": users[row].email,
+                        "password": password_hash,
+                        "role": users[row].role,
+                    }
+                    for row, password_hash in zip(rows, hashes)
+                ],
+                skip_duplicates=True,
+            )
+            created = await prisma.models.User.prisma(tx).find_many(
+                where={"email": {"in": [users[row].email for row in rows]}}
+            )
+            # Salted hashes tell the users created here from those skipped.
+            new_hashes = set(hashes)
+            ids = {
+                account.email: account.id
+                for account in created
+                if account.password in new_hashes
+            }
+            profiles = []
+            for row in rows:
+                user = users[row]
+                if user.email not in ids:
+                    failures.append(
+                        ImportFailure(
+                            row=row, email=user.email, message="Email already in use"
+                        )
+                    )
+                    continue
+                user_ids.append(ids[user.email])
+                profiles.append(
+                    {
+                        "userId": ids[user.email],
+                        "firstName": user.name.split(" ")[0],
+                        "lastName": " ".join(user.name.split(" ")[1:]),
+                    }
+                )
+            if profiles:
+                await prisma.models.Profile.prisma(tx).create_many(data=profiles)
+        if user_ids:
+            await project.events.publish(project.events.USER_CHANGED, userIds=user_ids)
+    failures.sort(key=lambda failure: failure.row)
+    return ImportUsersResponse(
+        created=len(user_ids), user_ids=user_ids, failures=failures
+    )
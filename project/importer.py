@@ -0,0 +1,76 @@
+"""
+Imports users from a CSV file, e.g. the staff and patients of a new clinic.
+
+The file needs ``name``, ``email`` and ``password`` columns and may have a
+``role`` column (REGISTERED_USER when missing or empty). Rows are imported in
+batches of USER_IMPORT_MAX_ROWS like ``POST /users/import`` does, and rows that
+cannot be imported are listed on stderr with their line number:
+
+    python -m project.importer clinic.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import sys
+import time
+from typing import List
+
+import prisma.enums
+import project.database
+import project.importUsers_service
+import project.passwords
+import project.settings
+
+
+def _read(path: str) -> List[project.importUsers_service.UserImportRow]:
+    with open(path, newline="", encoding="utf-8") as file:
+        return [
+            project.importUsers_service.UserImportRow(
+                name=record["name"],
+                email=record["email"],
+                password=record["password"],
+                role=record.get("role") or prisma.enums.Role.REGISTERED_USER,
+            )
+            for record in csv.DictReader(file)
+        ]
+
+
+async def _import(rows: List[project.importUsers_service.UserImportRow]) -> int:
+    batch_size = project.settings.USER_IMPORT_MAX_ROWS
+    created = failed = 0
+    await project.database.db_client.connect()
+    try:
+        await project.passwords.calibrate()
+        for start in range(0, len(rows), batch_size):
+            result = await project.importUsers_service.importUsers(
+                rows[start : start + batch_size]
+            )
+            created += result.created
+            for failure in result.failures:
+                failed += 1
+                # Line 1 is the header.
+                print(
+                    f"line {start + failure.row + 2}: {failure.email}: {failure.message}",
+                    file=sys.stderr,
+                )
+            print(f"{min(start + batch_size, len(rows))}/{len(rows)} rows processed")
+    finally:
+        project.passwords.shutdown()
+        await project.database.db_client.disconnect()
+    print(f"{created} users created, {failed} rows failed")
+    return failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("path", help="CSV file with name, email, password and role")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    failed = asyncio.run(_import(_read(args.path)))
+    print(f"took {time.perf_counter() - started:.1f}s")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
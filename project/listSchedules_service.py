@@ -4,6 +4,7 @@ from typing import List
 import prisma
 import prisma.enums
 import prisma.models
+import project.database
 from pydantic import BaseModel
 
 
@@ -27,6 +28,18 @@ class ScheduleResponse(BaseModel):
     schedules: List[ProfessionalSchedule]
 
 
+def booking_status(slot: prisma.models.Slot) -> prisma.enums.BookingStatus:
+    """
+    Returns the status of the most advanced booking of a slot (CONFIRMED over PENDING
+    over CANCELLED), PENDING for a slot without bookings. The bookings must be included.
+    """
+    return max(
+        (booking.status for booking in slot.bookings or ()),
+        default=prisma.enums.BookingStatus.PENDING,
+        key=lambda status: ["CANCELLED", "PENDING", "CONFIRMED"].index(status),
+    )
+
+
 async def listSchedules(professionalId: int) -> ScheduleResponse:
     """
     Lists all schedule entries for a specific professional by their ID. This is useful for professionals or admins to
@@ -40,23 +53,18 @@ async def listSchedules(professionalId: int) -> ScheduleResponse:
     ScheduleResponse: Response model containing lists of schedules, each detailing the slots booked, timings, and
     booking status for a professional.
     """
-    slots = await prisma.models.Slot.prisma().find_many(
-        where={"professionalId": professionalId}, include={"bookings": True}
-    )
+    slots = await prisma.models.Slot.prisma(
+        project.database.reader(project.database.professional_key(professionalId))
+    ).find_many(where={"professionalId": professionalId}, include={"bookings": True})
     professional_schedules = []
     for slot in slots:
-        booking_status = max(
-            (booking.status for booking in slot.bookings),
-            default=prisma.enums.BookingStatus.PENDING,
-            key=lambda status: ["CANCELLED", "PENDING", "CONFIRMED"].index(status),
-        )
         professional_schedules.append(
             ProfessionalSchedule(
                 slotId=slot.id,
                 startTime=slot.startTime,
                 endTime=slot.endTime,
                 isActive=slot.isActive,
-                bookingStatus=booking_status,
+                bookingStatus=booking_status(slot),
             )
         )
     return ScheduleResponse(schedules=professional_schedules)
@@ -1,7 +1,6 @@
 from typing import List
 
-import prisma
-import prisma.models
+import project.favorites
 from pydantic import BaseModel
 
 
@@ -33,15 +32,13 @@ async def listUserFavorites(user_id: int) -> FavoritesResponse:
     Returns:
     FavoritesResponse: Response model returning a list of favorite professionals with basic contact information.
     """
-    profile = await prisma.models.Profile.prisma().find_unique(
-        where={"userId": user_id}, include={"favorites": True}
-    )
-    if not profile:
+    favorites = await project.favorites.load(user_id)
+    if not favorites:
         return FavoritesResponse(favorites=[])
     favorite_professionals = [
         ProfessionalInfo(
             professional_id=prof.id, email=prof.email, specialty=prof.specialty
         )
-        for prof in profile.favorites
+        for prof in favorites.professionals
     ]
     return FavoritesResponse(favorites=favorite_professionals)
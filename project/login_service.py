@@ -1,12 +1,21 @@
+import asyncio
+import logging
 from datetime import datetime, timedelta
 from typing import Optional
 
-import bcrypt
-import jwt
 import prisma
 import prisma.models
+import project.auth
+import project.metrics
+import project.passwords
+import project.settings
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
+# Rehashes running in the background, kept referenced until they finish.
+_rehashes: set = set()
+
 
 class LoginResponse(BaseModel):
     """
@@ -16,6 +25,19 @@ class LoginResponse(BaseModel):
     token: str
 
 
+async def _rehash(user_id: int, password: str, password_hash: str) -> None:
+    try:
+        new_hash = await project.passwords.hash_password(password, "rehash")
+        # Only if the password did not change in the meantime.
+        await prisma.models.User.prisma().update_many(
+            where={"id": user_id, "password": password_hash},
+            data={"password": new_hash},
+        )
+        project.metrics.PASSWORD_REHASHES.inc()
+    except Exception:
+        logger.exception("Failed to rehash the password of user %d", user_id)
+
+
 async def login(username: str, password: str) -> LoginResponse:
     """
     Authenticates a user, allowing them to log into the system. It accepts credentials, such as username
@@ -35,17 +57,28 @@ async def login(username: str, password: str) -> LoginResponse:
         response = login(username, password)
         print(response.token)  # Outputs the JWT token if credentials are correct.
     """
+    import jwt
+
     user: Optional[prisma.models.User] = await prisma.models.User.prisma().find_unique(
         where={"email": username}
     )
-    if user is None or not bcrypt.checkpw(
-        password.encode("utf-8"), user.password.encode("utf-8")
-    ):
+    if user is None or not await project.passwords.verify(password, user.password):
         raise ValueError("Invalid username or password")
+    # The response does not wait for the rehash. Past the limit, the password is
+    # rehashed on a later login instead.
+    if (
+        project.passwords.needs_rehash(user.password)
+        and len(_rehashes) < project.settings.PASSWORD_REHASH_CONCURRENCY
+    ):
+        task = asyncio.create_task(_rehash(user.id, password, user.password))
+        _rehashes.add(task)
+        task.add_done_callback(_rehashes.discard)
     jwt_payload = {
         "user_id": user.id,
         "role": user.role,
         "exp": datetime.utcnow() + timedelta(days=1),
     }
-    jwt_token = jwt.encode(jwt_payload, "your-256-bit-secret", algorithm="HS256")
+    jwt_token = jwt.encode(
+        jwt_payload, project.auth.signing_key(), algorithm=project.auth.ALGORITHM
+    )
     return LoginResponse(token=jwt_token)
@@ -0,0 +1,175 @@
+"""
+Prometheus metrics for the Availability Checker, served from ``GET /metrics``.
+
+When several uvicorn workers run, set ``PROMETHEUS_MULTIPROC_DIR`` to a
+writable, empty directory so that every worker's samples are aggregated. Every
+worker then updates its own connection pool gauges in the background (see
+:func:`run`), as only the worker serving a scrape renders it.
+"""
+
+import asyncio
+import logging
+import os
+
+import project.settings
+from prisma import Prisma
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured Prisma connection pool size (0 when using Prisma's default).",
+    multiprocess_mode="liveall",
+)
+DB_POOL_CONNECTIONS_BUSY = Gauge(
+    "db_pool_connections_busy",
+    "Pool connections currently running a query.",
+    multiprocess_mode="liveall",
+)
+DB_POOL_CONNECTIONS_IDLE = Gauge(
+    "db_pool_connections_idle",
+    "Open pool connections that are not in use.",
+    multiprocess_mode="liveall",
+)
+DB_POOL_UTILIZATION = Gauge(
+    "db_pool_utilization",
+    "Busy connections divided by the pool size (or by open connections when the size is not configured).",
+    multiprocess_mode="liveall",
+)
+DB_POOL_WAITING_QUERIES = Gauge(
+    "db_pool_waiting_queries",
+    "Queries currently waiting for a pool connection.",
+    multiprocess_mode="liveall",
+)
+DB_TIMEOUTS = Counter(
+    "db_timeouts",
+    "Queries that failed waiting for a pool connection (pool) or for the database (query).",
+    ["kind"],
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of Prisma queries by model and operation (e.g. Slot, find_many).",
+    ["model", "operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+HTTP_REQUESTS = Counter(
+    "http_requests",
+    "Requests handled, by method, route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_ERRORS = Counter(
+    "http_request_errors",
+    "Requests that raised an unhandled exception and were answered with a 500.",
+    ["method", "route"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request until its response finished, by route template.",
+    ["method", "route"],
+    buckets=(
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.075,
+        0.1,
+        0.25,
+        0.5,
+        0.75,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    ),
+)
+
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections",
+    "Requests turned away by admission control, by method, route template and reason (client_rate, global_rate, concurrency).",
+    ["method", "route", "reason"],
+)
+
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls",
+    "Coalesced service calls by group: leader calls ran the query, shared calls waited for one in flight.",
+    ["group", "role"],
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time bcrypt took in the hashing pool, by operation (hash, rehash, verify) and cost.",
+    ["operation", "rounds"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.75, 1.0, 2.0),
+)
+PASSWORD_REHASHES = Counter(
+    "password_rehashes",
+    "Passwords hashed again on login because their stored cost was not the current one.",
+)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+logger = logging.getLogger(__name__)
+
+
+async def _refresh_pool_metrics(client: Prisma) -> None:
+    metrics = await client.get_metrics()
+    gauges = {gauge.key: gauge.value for gauge in metrics.gauges}
+    busy = gauges.get("prisma_pool_connections_busy", 0)
+    idle = gauges.get("prisma_pool_connections_idle", 0)
+    DB_POOL_CONNECTIONS_BUSY.set(busy)
+    DB_POOL_CONNECTIONS_IDLE.set(idle)
+    capacity = project.settings.DB_POOL_SIZE or busy + idle
+    DB_POOL_UTILIZATION.set(busy / capacity if capacity else 0)
+    DB_POOL_WAITING_QUERIES.set(gauges.get("prisma_client_queries_wait", 0))
+
+
+async def run(client: Prisma) -> None:
+    """
+    Updates this worker's connection pool gauges every
+    DB_POOL_METRICS_INTERVAL_SECONDS. Runs until cancelled.
+
+    Args:
+        client (Prisma): The connected client whose pool is reported.
+    """
+    while True:
+        try:
+            await _refresh_pool_metrics(client)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Failed to update the pool metrics")
+        await asyncio.sleep(project.settings.DB_POOL_METRICS_INTERVAL_SECONDS)
+
+
+async def render(client: Prisma) -> bytes:
+    """
+    Renders all metrics in the Prometheus text format. Prisma's own engine metrics,
+    which include the pool wait-time histogram, are appended with a ``worker`` label
+    as they are tracked separately by every worker process.
+
+    Args:
+        client (Prisma): The connected client whose engine metrics are reported.
+
+    Returns:
+        bytes: The metrics exposition, served with CONTENT_TYPE.
+    """
+    await _refresh_pool_metrics(client)
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    engine_metrics = await client.get_metrics(
+        format="prometheus", global_labels={"worker": str(os.getpid())}
+    )
+    return generate_latest(registry) + engine_metrics.encode("utf-8")
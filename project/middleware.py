@@ -0,0 +1,76 @@
+import logging
+import time
+
+import project.database
+import project.metrics
+import project.settings
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Label for requests that did not match any route, so that arbitrary paths
+# cannot blow up the number of metric series.
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Returns the path template of the route that handled the request, e.g. ``/users/{userId}``.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records count, errors and latency of every request per route template, and turns
+    unhandled exceptions into a logged 500 response with an ``{"error": ...}`` body.
+    In debug mode the response carries the number of Prisma queries the request
+    made in an ``X-Query-Count`` header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+        response_started = False
+        queries = [0]
+        token = project.database.query_count.set(queries)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = True
+                if project.settings.DEBUG:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-query-count", str(queries[0]).encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.exception("Error processing request")
+            project.metrics.HTTP_REQUEST_ERRORS.labels(
+                scope["method"], route_template(scope)
+            ).inc()
+            if response_started:
+                raise
+            response = JSONResponse({"error": str(e)}, status_code=500)
+            await response(scope, receive, send)
+        finally:
+            project.database.query_count.reset(token)
+            route = route_template(scope)
+            project.metrics.HTTP_REQUEST_DURATION.labels(
+                scope["method"], route
+            ).observe(time.perf_counter() - started)
+            project.metrics.HTTP_REQUESTS.labels(
+                scope["method"], route, str(status_code)
+            ).inc()
@@ -0,0 +1,198 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is slow on purpose, and hashing on the event loop would stall every other
+request of the worker for the duration. Hashes are computed in a pool of
+PASSWORD_HASH_PROCESSES processes instead, which also lets bulk imports use
+several cores. The pool is started on first use and uses the ``spawn`` start
+method, as forking a process running an event loop is not safe.
+
+New hashes use BCRYPT_ROUNDS, or with BCRYPT_TARGET_MS the cost that
+:func:`calibrate` found to take about that long on this machine. Logins rehash
+passwords stored with another cost (see :func:`needs_rehash`), so stored hashes
+follow the setting and the hardware over time.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import project.settings
+
+logger = logging.getLogger(__name__)
+
+# Cost measured by calibrate(), cheap enough to measure quickly, and the most
+# it may choose: every round doubles the time.
+_CALIBRATION_ROUNDS = 8
+_MAX_ROUNDS = 16
+
+_pool: Optional[ProcessPoolExecutor] = None
+_rounds = project.settings.BCRYPT_ROUNDS
+
+
+def _hash(password: str, rounds: int) -> Tuple[str, float]:
+    import bcrypt
+
+    started = time.perf_counter()
+    password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds))
+    return password_hash.decode("utf-8"), time.perf_counter() - started
+
+
+def _check(password: str, password_hash: str) -> Tuple[bool, float]:
+    import bcrypt
+
+    started = time.perf_counter()
+    try:
+        valid = bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+    except ValueError:
+        # Not a bcrypt hash.
+        valid = False
+    return valid, time.perf_counter() - started
+
+
+def _observe(operation: str, rounds: Optional[int], seconds: float) -> None:
+    # Imported here, not at the top: the pool processes import this module.
+    import project.metrics
+
+    project.metrics.PASSWORD_HASH_DURATION.labels(
+        operation=operation, rounds=str(rounds)
+    ).observe(seconds)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=project.settings.PASSWORD_HASH_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def _run(function: Callable[..., Any], calls: Sequence[Tuple]) -> List[Any]:
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    try:
+        return list(
+            await asyncio.gather(
+                *(loop.run_in_executor(pool, function, *args) for args in calls)
+            )
+        )
+    except BrokenProcessPool:
+        # A pool whose process died is unusable: start a new one next time.
+        shutdown()
+        raise
+
+
+def rounds() -> int:
+    """
+    Returns the bcrypt cost of new hashes.
+    """
+    return _rounds
+
+
+def rounds_of(password_hash: str) -> Optional[int]:
+    """
+    Returns the cost a bcrypt hash was computed with, or None if it is not one.
+    """
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    Tells whether a verified password should be hashed again with the current cost:
+    when its hash has a lower cost, or one more than a round higher. Workers may
+    calibrate a round apart, and rehashing back and forth between them is avoided.
+    """
+    stored = rounds_of(password_hash)
+    return stored is not None and not _rounds <= stored <= _rounds + 1
+
+
+async def hash_password(password: str, operation: str = "hash") -> str:
+    """
+    Returns the bcrypt hash of a password, computed in the process pool.
+
+    Args:
+        password (str): The password.
+        operation (str): What the hash is for (hash or rehash), for the metrics.
+    """
+    (password_hash,) = await hash_passwords([password], operation)
+    return password_hash
+
+
+async def hash_passwords(
+    passwords: Sequence[str], operation: str = "hash"
+) -> List[str]:
+    """
+    Returns the bcrypt hashes of many passwords, computed in parallel by the
+    processes of the pool.
+
+    Args:
+        passwords (Sequence[str]): The passwords.
+        operation (str): What the hashes are for, for the metrics.
+
+    Returns:
+        List[str]: Their hashes, in the same order.
+    """
+    cost = _rounds
+    results = await _run(_hash, [(password, cost) for password in passwords])
+    for _, seconds in results:
+        _observe(operation, cost, seconds)
+    return [password_hash for password_hash, _ in results]
+
+
+async def verify(password: str, password_hash: str) -> bool:
+    """
+    Checks a password against its stored bcrypt hash in the process pool.
+    """
+    ((valid, seconds),) = await _run(_check, [(password, password_hash)])
+    _observe("verify", rounds_of(password_hash), seconds)
+    return valid
+
+
+async def calibrate() -> int:
+    """
+    With BCRYPT_TARGET_MS set, times hashing on this machine and makes new hashes use
+    the highest cost, at least BCRYPT_MIN_ROUNDS, that takes no longer than the
+    target. Called at startup.
+
+    Returns:
+        int: The cost of new hashes.
+    """
+    global _rounds
+    target = project.settings.BCRYPT_TARGET_MS / 1000
+    if target <= 0:
+        return _rounds
+    # The fastest of a few runs is the least disturbed by other work.
+    samples = [
+        (await _run(_hash, [("calibration", _CALIBRATION_ROUNDS)]))[0][1]
+        for _ in range(3)
+    ]
+    fitting = _CALIBRATION_ROUNDS + math.floor(math.log2(target / min(samples)))
+    _rounds = max(project.settings.BCRYPT_MIN_ROUNDS, min(_MAX_ROUNDS, fitting))
+    logger.info(
+        "bcrypt cost %d (%.1f ms at cost %d, target %.0f ms)",
+        _rounds,
+        min(samples) * 1000,
+        _CALIBRATION_ROUNDS,
+        project.settings.BCRYPT_TARGET_MS,
+    )
+    return _rounds
+
+
+def shutdown() -> None:
+    """
+    Stops the processes of the pool, if it was started.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
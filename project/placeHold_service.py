@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.holds
+from pydantic import BaseModel
+
+
+class HoldResponse(BaseModel):
+    """
+    Response model for holding a slot. On success it carries the hold id to pass to the booking and when the hold expires.
+    """
+
+    holdId: Optional[str] = None
+    expiresAt: Optional[datetime] = None
+    status: str
+    message: str
+
+
+async def placeHold(userId: int, professionalId: int, slotId: int) -> HoldResponse:
+    """
+    Reserves a slot for a user for a short time (HOLD_TTL_SECONDS) while they complete the booking form. The slot is checked against the database once, here: it must be active, belong to the professional and have no booking that is not cancelled. While held, the slot is shown as unavailable to everyone, and its owner can book it with the hold id without further checks. Holding a slot the user already holds renews the hold.
+
+    Args:
+        userId (int): The ID of the user who is about to book.
+        professionalId (int): The ID of the professional whose slot is held.
+        slotId (int): The ID of the slot to hold.
+
+    Returns:
+        HoldResponse: Response model for holding a slot. On success it carries the hold id to pass to the booking and when the hold expires.
+    """
+    holder = project.holds.holder(slotId)
+    if holder is not None and holder != userId:
+        return HoldResponse(status="error", message="Slot is held by another user")
+    slot = await prisma.models.Slot.prisma().find_unique(
+        where={"id": slotId}, include={"bookings": True}
+    )
+    if not slot or not slot.isActive or slot.professionalId != professionalId:
+        return HoldResponse(
+            status="error", message="Invalid slot or mismatch of professional ID"
+        )
+    if any(
+        booking.status != prisma.enums.BookingStatus.CANCELLED
+        for booking in slot.bookings or []
+    ):
+        return HoldResponse(status="error", message="Slot is already booked")
+    try:
+        hold = await project.holds.place(
+            slotId, professionalId, userId, slot.startTime, slot.endTime
+        )
+    except ValueError as e:
+        return HoldResponse(status="error", message=str(e))
+    return HoldResponse(
+        holdId=hold.id,
+        expiresAt=datetime.fromtimestamp(hold.expiresAt, timezone.utc),
+        status="held",
+        message="Slot held, complete the booking before the hold expires",
+    )
@@ -0,0 +1,182 @@
+"""
+Deletion of users together with their bookings, notifications, profiles and
+favorites.
+
+Users with at most PURGE_INLINE_MAX_ROWS bookings and notifications are deleted
+in a single transaction. For larger histories that transaction would hold its
+locks for too long, so a background job deletes the bookings and notifications
+PURGE_CHUNK_SIZE rows per statement first. The profiles and the user go last, in
+a transaction that also deletes whatever was added meanwhile.
+
+Jobs report their progress with PURGE_PROGRESS events, so every worker knows all
+of them and can answer ``GET /purges/{purgeId}``. A job interrupted by a
+shutdown leaves the user partly deleted; deleting the user again resumes it.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import prisma
+import prisma.models
+import project.events
+import project.settings
+
+logger = logging.getLogger(__name__)
+
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Finished jobs are forgotten once more than this many are known.
+_JOBS_KEPT = 1000
+# The final transaction also deletes what was added while the job ran.
+_TX_TIMEOUT = timedelta(seconds=30)
+
+
+@dataclass(frozen=True)
+class Purge:
+    """
+    A background deletion of a user, with the number of bookings and notifications
+    to delete and deleted so far.
+    """
+
+    id: str
+    userId: int
+    state: str
+    total: int
+    deleted: int
+    error: Optional[str] = None
+
+
+# Known jobs, oldest first.
+_jobs: OrderedDict[str, Purge] = OrderedDict()
+# Keeps the running jobs of this worker from being garbage collected.
+_tasks: set = set()
+
+
+def _on_progress(payload: Dict[str, Any]) -> None:
+    job = Purge(**payload)
+    _jobs[job.id] = job
+    while len(_jobs) > _JOBS_KEPT:
+        oldest = next(iter(_jobs))
+        if _jobs[oldest].state == RUNNING:
+            break
+        del _jobs[oldest]
+
+
+project.events.subscribe(project.events.PURGE_PROGRESS, _on_progress)
+
+
+def get(purge_id: str) -> Optional[Purge]:
+    """
+    Returns the latest known progress of a job, or None if it is unknown.
+    """
+    return _jobs.get(purge_id)
+
+
+def _running(user_id: int) -> Optional[Purge]:
+    return next(
+        (
+            job
+            for job in _jobs.values()
+            if job.userId == user_id and job.state == RUNNING
+        ),
+        None,
+    )
+
+
+async def _report(job: Purge) -> None:
+    await project.events.publish(project.events.PURGE_PROGRESS, **asdict(job))
+
+
+async def _affected_professionals(user_id: int) -> List[int]:
+    rows = await prisma.get_client().query_raw(
+        'SELECT DISTINCT s."professionalId" FROM "Booking" b'
+        ' JOIN "Slot" s ON s.id = b."slotId" WHERE b."userId" = $1',
+        user_id,
+    )
+    return [row["professionalId"] for row in rows]
+
+
+async def _delete_rest(user_id: int) -> None:
+    async with prisma.get_client().tx(timeout=_TX_TIMEOUT) as tx:
+        await prisma.models.Booking.prisma(tx).delete_many(where={"userId": user_id})
+        await prisma.models.Notification.prisma(tx).delete_many(
+            where={"userId": user_id}
+        )
+        # Deleting a profile also deletes its favorites.
+        await prisma.models.Profile.prisma(tx).delete_many(where={"userId": user_id})
+        await prisma.models.User.prisma(tx).delete(where={"id": user_id})
+
+
+async def _announce(user_id: int, professional_ids: List[int]) -> None:
+    for professional_id in professional_ids:
+        await project.events.publish(
+            project.events.BOOKING_CHANGED,
+            professionalId=professional_id,
+            userId=user_id,
+        )
+    await project.events.publish(project.events.NOTIFICATION_CHANGED, userIds=[user_id])
+    await project.events.publish(project.events.USER_CHANGED, userId=user_id)
+
+
+async def _delete_in_chunks(job: Purge, professional_ids: List[int]) -> None:
+    deleted = 0
+    try:
+        for table in ("Booking", "Notification"):
+            while True:
+                count = await prisma.get_client().execute_raw(
+                    f'DELETE FROM "{table}" WHERE id IN'
+                    f' (SELECT id FROM "{table}" WHERE "userId" = $1 LIMIT $2)',
+                    job.userId,
+                    project.settings.PURGE_CHUNK_SIZE,
+                )
+                deleted += count
+                await _report(replace(job, deleted=min(deleted, job.total)))
+                if count < project.settings.PURGE_CHUNK_SIZE:
+                    break
+        await _delete_rest(job.userId)
+    except Exception as error:
+        logger.exception("Failed to delete user %d", job.userId)
+        await _report(replace(job, state=FAILED, deleted=deleted, error=str(error)))
+        return
+    await _announce(job.userId, professional_ids)
+    await _report(replace(job, state=DONE, deleted=max(deleted, job.total)))
+
+
+async def purge(user_id: int) -> Optional[Purge]:
+    """
+    Deletes a user with all their data, at once or with a background job depending
+    on the size of their history.
+
+    Args:
+        user_id (int): The user, who must exist.
+
+    Returns:
+        Optional[Purge]: None if the user was deleted, otherwise the job deleting
+        them, which may have been started earlier.
+    """
+    running = _running(user_id)
+    if running is not None:
+        return running
+    total = await prisma.models.Booking.prisma().count(
+        where={"userId": user_id}
+    ) + await prisma.models.Notification.prisma().count(where={"userId": user_id})
+    professional_ids = await _affected_professionals(user_id)
+    if total <= project.settings.PURGE_INLINE_MAX_ROWS:
+        await _delete_rest(user_id)
+        await _announce(user_id, professional_ids)
+        return None
+    job = Purge(
+        id=uuid.uuid4().hex, userId=user_id, state=RUNNING, total=total, deleted=0
+    )
+    await _report(job)
+    task = asyncio.create_task(_delete_in_chunks(job, professional_ids))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
@@ -1,8 +1,8 @@
 import datetime
 
-import jwt
 import prisma
 import prisma.models
+import project.auth
 from pydantic import BaseModel
 
 
@@ -14,9 +14,7 @@ class RefreshTokenResponse(BaseModel):
     new_token: str
 
 
-JWT_SECRET = "your_jwt_secret"
-
-JWT_ALGORITHM = "HS256"
+JWT_ALGORITHM = project.auth.ALGORITHM
 
 
 async def refreshToken(token: str) -> RefreshTokenResponse:
@@ -29,8 +27,11 @@ async def refreshToken(token: str) -> RefreshTokenResponse:
     Returns:
         RefreshTokenResponse: Provides a new authentication token for the user, ensuring continued access without re-login.
     """
+    import jwt
+
+    secret = project.auth.signing_key()
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, secret, algorithms=[JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
         raise ValueError("Token expired")
     except jwt.InvalidTokenError:
@@ -43,5 +44,5 @@ async def refreshToken(token: str) -> RefreshTokenResponse:
         "user_id": user.id,
         "exp": datetime.datetime.utcnow() + datetime.timedelta(days=1),
     }
-    new_token = jwt.encode(new_payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    new_token = jwt.encode(new_payload, secret, algorithm=JWT_ALGORITHM)
     return RefreshTokenResponse(new_token=new_token)
@@ -0,0 +1,29 @@
+import project.holds
+from pydantic import BaseModel
+
+
+class ReleaseHoldResponse(BaseModel):
+    """
+    Indicates whether the hold was released.
+    """
+
+    success: bool
+    message: str
+
+
+async def releaseHold(holdId: str, userId: int) -> ReleaseHoldResponse:
+    """
+    Releases a slot the user held but no longer wants to book, e.g. when the booking form is closed, making it available to others before the hold would expire.
+
+    Args:
+        holdId (str): The ID of the hold, as returned when the slot was held.
+        userId (int): The ID of the user who owns the hold.
+
+    Returns:
+        ReleaseHoldResponse: Indicates whether the hold was released.
+    """
+    if await project.holds.release(holdId, userId):
+        return ReleaseHoldResponse(success=True, message="Hold released")
+    return ReleaseHoldResponse(
+        success=False, message="Hold not found, expired or owned by another user"
+    )
@@ -2,6 +2,8 @@ from typing import List
 
 import prisma
 import prisma.models
+import project.events
+import project.favorites
 from pydantic import BaseModel
 
 
@@ -23,31 +25,34 @@ class RemoveFavoriteResponse(BaseModel):
     favorites: List[Professional]
 
 
-async def removeUserFavorite(professionalId: int) -> RemoveFavoriteResponse:
+async def removeUserFavorite(
+    userId: int, professionalId: int
+) -> RemoveFavoriteResponse:
     """
     Removes a professional from the user's list of favorites. Needs the professional's ID for removal. Confirms the removal with an updated list of favorites.
 
     Args:
+    userId (int): The unique identifier of the user whose favorite list is changed.
     professionalId (int): The unique identifier of the professional to be removed from the user's favorite list.
 
     Returns:
     RemoveFavoriteResponse: Response model confirming the deletion and providing an updated list of favorites post-modification.
     """
-    userId = 1
-    profile = await prisma.models.Profile.prisma().find_unique(
-        where={"userId": userId}, include={"favorites": True}
+    favorites = await project.favorites.load(userId)
+    if favorites is None:
+        return RemoveFavoriteResponse(favorites=[])
+    updated_profile = await prisma.models.Profile.prisma().update(
+        where={"id": favorites.profileId},
+        data={"favorites": {"disconnect": [{"id": professionalId}]}},
+        include={"favorites": True},
+    )
+    if updated_profile is None:
+        return RemoveFavoriteResponse(favorites=[])
+    await project.events.publish(project.events.USER_CHANGED, userId=userId)
+    project.favorites.put(userId, project.favorites.version(userId), updated_profile)
+    return RemoveFavoriteResponse(
+        favorites=[
+            Professional(id=fav.id, email=fav.email, specialty=fav.specialty)
+            for fav in updated_profile.favorites
+        ]
     )
-    if profile and professionalId in [prof.id for prof in profile.favorites]:
-        await prisma.models.Profile.prisma().update(
-            where={"id": profile.id},
-            data={"favorites": {"disconnect": [{"id": professionalId}]}},
-        )
-        updated_profile = await prisma.models.Profile.prisma().find_unique(
-            where={"userId": userId}, include={"favorites": True}
-        )
-        response = RemoveFavoriteResponse(
-            favorites=updated_profile.favorites if updated_profile else []
-        )
-    else:
-        response = RemoveFavoriteResponse(favorites=[])
-    return response
@@ -0,0 +1,63 @@
+"""
+A fast response path for routes that return large pydantic models.
+
+When a route returns a model, FastAPI validates it again against the route's
+``response_model``, converts it to plain Python objects and then encodes those
+as JSON, although the service built the model from typed Prisma results in the
+first place. Returning a :class:`ModelResponse` instead skips all of that: the
+model is serialized straight to JSON bytes by pydantic-core. The route keeps
+its ``response_model`` so that the OpenAPI schema is unchanged.
+
+Routes whose responses carry an ETag (see project.versions) answer a matching
+``If-None-Match`` with :func:`not_modified` before running their service.
+"""
+
+from typing import Any, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class ModelResponse(Response):
+    """
+    A JSON response rendered directly from a pydantic model by its pydantic-core serializer.
+
+    Args:
+        content (BaseModel): The response model, usually as returned by a service.
+        status_code (int): The HTTP status code.
+        exclude_unset (bool): Leave out the fields that were not set, for sparse responses.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self, content: BaseModel, *args: Any, exclude_unset: bool = False, **kwargs: Any
+    ) -> None:
+        self.exclude_unset = exclude_unset
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(
+            content, exclude_unset=self.exclude_unset
+        )
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Returns an empty 304 response if the request's If-None-Match header lists the
+    ETag (compared weakly) or is ``*``, and None otherwise.
+
+    Args:
+        request (Request): The request.
+        etag (str): The current ETag of the requested resource.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -0,0 +1,82 @@
+"""
+Routes reporting aggregate figures for operations.
+"""
+
+from datetime import date
+from typing import Literal, Optional
+
+import prisma.models
+import project.auth
+import project.exportBookings_service
+import project.getUtilization_service
+import project.responses
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+router = APIRouter(tags=["analytics"])
+
+_EXPORT_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+async def _export(
+    admin: prisma.models.User,
+    format: Literal["parquet", "arrow"],
+    startDate: Optional[date],
+    endDate: Optional[date],
+) -> StreamingResponse:
+    return StreamingResponse(
+        await project.exportBookings_service.exportBookings(
+            admin.role, format, startDate, endDate
+        ),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="bookings.{format}"',
+        },
+    )
+
+
+@router.get(
+    "/analytics/utilization",
+    response_model=project.getUtilization_service.UtilizationResponse,
+)
+async def api_get_getUtilization(
+    startDate: Optional[date] = None,
+    endDate: Optional[date] = None,
+    granularity: Literal["day", "week"] = "day",
+    groupBy: Literal["professional", "specialty"] = "professional",
+) -> project.responses.ModelResponse:
+    """
+    Reports the share of scheduled time that is booked, per professional or specialty and per day or week, over a window of days (the last 28 by default).
+    """
+    return project.responses.ModelResponse(
+        await project.getUtilization_service.getUtilization(
+            startDate, endDate, granularity, groupBy
+        )
+    )
+
+
+@router.get("/analytics/bookings.parquet", response_class=StreamingResponse)
+async def api_get_exportBookingsParquet(
+    startDate: Optional[date] = None,
+    endDate: Optional[date] = None,
+    admin: prisma.models.User = Depends(project.auth.require_admin),
+) -> StreamingResponse:
+    """
+    Exports all bookings, with their slot times and the professional's specialty, as a Parquet file. Admins only: send an admin's token from POST /auth/login as a Bearer token.
+    """
+    return await _export(admin, "parquet", startDate, endDate)
+
+
+@router.get("/analytics/bookings.arrow", response_class=StreamingResponse)
+async def api_get_exportBookingsArrow(
+    startDate: Optional[date] = None,
+    endDate: Optional[date] = None,
+    admin: prisma.models.User = Depends(project.auth.require_admin),
+) -> StreamingResponse:
+    """
+    Exports all bookings, with their slot times and the professional's specialty, as an Arrow IPC stream. Admins only: send an admin's token from POST /auth/login as a Bearer token.
+    """
+    return await _export(admin, "arrow", startDate, endDate)
@@ -0,0 +1,31 @@
+"""
+Routes issuing and refreshing authentication tokens.
+"""
+
+import project.login_service
+import project.refreshToken_service
+from fastapi import APIRouter
+
+router = APIRouter(tags=["auth"])
+
+
+@router.post("/auth/login", response_model=project.login_service.LoginResponse)
+async def api_post_login(
+    username: str, password: str
+) -> project.login_service.LoginResponse:
+    """
+    Authenticates a user, allowing them to log into the system. It accepts credentials, such as username and password, verifies them against the stored data, and returns a JWT token for session management if the credentials are correct.
+    """
+    return await project.login_service.login(username, password)
+
+
+@router.post(
+    "/auth/refresh", response_model=project.refreshToken_service.RefreshTokenResponse
+)
+async def api_post_refreshToken(
+    token: str,
+) -> project.refreshToken_service.RefreshTokenResponse:
+    """
+    Refreshes the authentication token when the current token is about to expire. This endpoint requires a valid, non-expired token and returns a new token for continued use, ensuring the user remains authenticated without needing to log in again.
+    """
+    return await project.refreshToken_service.refreshToken(token)
@@ -0,0 +1,129 @@
+"""
+Routes reporting when professionals are available.
+"""
+
+from datetime import date, datetime
+from typing import List, Optional
+
+import project.apiOptions_service
+import project.checkAvailability_service
+import project.getAvailability_service
+import project.getCommonAvailability_service
+import project.getProfessionalAvailability_service
+import project.responses
+import project.versions
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response
+
+router = APIRouter(tags=["availability"])
+
+
+@router.options(
+    "/availability",
+    response_model=project.apiOptions_service.CheckAvailabilityOptionsResponse,
+)
+async def api_options_apiOptions(
+    access_control_request_method: str, access_control_request_headers: str
+) -> project.apiOptions_service.CheckAvailabilityOptionsResponse:
+    """
+    Provides details about the supported methods and requirements for the check availability endpoint. It responds with accepted request formats and other API usage policies. This is useful for developer integrations and troubleshooting.
+    """
+    return project.apiOptions_service.apiOptions(
+        access_control_request_method, access_control_request_headers
+    )
+
+
+@router.get(
+    "/availability",
+    response_model=project.checkAvailability_service.AvailabilityResponse,
+)
+async def api_get_checkAvailability(
+    http_request: Request,
+    professionalId: Optional[int] = None,
+    startDate: Optional[datetime] = None,
+    endDate: Optional[datetime] = None,
+    specialty: Optional[str] = None,
+) -> Response:
+    """
+    Fetches real-time availability of professionals. It queries the scheduling database to determine available time slots based on professionals’ current activities and schedules. Each query response includes structured data indicating the start and end times of available slots. This endpoint is accessed every time a user wishes to view availability.
+    """
+    etag = project.versions.etag(professionalId, holds=True)
+    unchanged = project.responses.not_modified(http_request, etag)
+    if unchanged is not None:
+        return unchanged
+    return project.responses.ModelResponse(
+        await project.checkAvailability_service.checkAvailability(
+            professionalId, startDate, endDate, specialty
+        ),
+        headers={"ETag": etag},
+    )
+
+
+@router.get(
+    "/availability/all",
+    response_model=project.getAvailability_service.FetchAvailabilityResponse,
+)
+async def api_get_getAvailability(
+    http_request: Request,
+    fields: Optional[List[project.getAvailability_service.AvailabilityField]] = Query(
+        None
+    ),
+    window: Optional[int] = Query(
+        None, ge=1, le=project.getAvailability_service.MAX_WINDOW_DAYS
+    ),
+) -> Response:
+    """
+    Fetches real-time availability data of professionals. This endpoint queries the Schedule Management module to retrieve current activity or scheduled data. It is expected to return a list of professionals along with their current availability status. The response is dynamically updated as the Schedule Management data changes. Use fields (repeated, e.g. fields=specialty&fields=nextFreeTime) and window (days ahead) for smaller responses.
+    """
+    request = project.getAvailability_service.FetchAvailabilityRequest(
+        fields=fields, window=window
+    )
+    # The versions only follow the data, so responses that also change with the
+    # time of the request cannot be revalidated with them.
+    headers = {}
+    if not project.getAvailability_service.depends_on_time(request):
+        etag = project.versions.etag(holds=True)
+        unchanged = project.responses.not_modified(http_request, etag)
+        if unchanged is not None:
+            return unchanged
+        headers["ETag"] = etag
+    return project.responses.ModelResponse(
+        await project.getAvailability_service.getAvailability(request),
+        headers=headers,
+        exclude_unset=True,
+    )
+
+
+@router.get(
+    "/availability/common",
+    response_model=project.getCommonAvailability_service.CommonAvailabilityResponse,
+)
+async def api_get_getCommonAvailability(
+    date: date,
+    ids: List[int] = Query(),
+    minMinutes: Optional[int] = None,
+) -> project.getCommonAvailability_service.CommonAvailabilityResponse:
+    """
+    Returns the windows of a day in which all the given professionals (repeat ids, e.g. ?ids=1&ids=2) are free at the same time, for appointments that need several of them together.
+    """
+    return await project.getCommonAvailability_service.getCommonAvailability(
+        ids, date, minMinutes
+    )
+
+
+# Registered after the fixed /availability/... paths, which it would match too.
+@router.get(
+    "/availability/{professionalId}",
+    response_model=project.getProfessionalAvailability_service.AvailabilityResponse,
+)
+async def api_get_getProfessionalAvailability(
+    request: project.getProfessionalAvailability_service.FetchAvailabilityRequest = Depends(),
+) -> project.getProfessionalAvailability_service.AvailabilityResponse:
+    """
+    Retrieves real-time availability for a specific professional by their unique ID. This function connects to the Schedule Management module to pull detailed availability status for the requested professional. Ideal for users needing detailed, individual data.
+    """
+    return (
+        await project.getProfessionalAvailability_service.getProfessionalAvailability(
+            request
+        )
+    )
@@ -0,0 +1,65 @@
+"""
+Routes booking appointments in schedule slots, holding slots during checkout
+and confirming bookings.
+"""
+
+from typing import List, Literal, Optional
+
+import project.bookAppointment_service
+import project.confirmBookings_service
+import project.placeHold_service
+import project.releaseHold_service
+from fastapi import APIRouter
+
+router = APIRouter(tags=["bookings"])
+
+
+@router.post("/book", response_model=project.bookAppointment_service.BookingResponse)
+async def api_post_bookAppointment(
+    userId: int, professionalId: int, slotId: int, holdId: Optional[str] = None
+) -> project.bookAppointment_service.BookingResponse:
+    """
+    Accepts user-selected time slots and professional details and sends this info to the Schedule Management System for processing and confirming the booking. This function performs validations to ensure the slot is still available and compatible with the professional’s schedule, using transaction mechanisms to maintain consistency. Expect confirmation of booking or error message in response.
+    """
+    return await project.bookAppointment_service.bookAppointment(
+        userId, professionalId, slotId, holdId
+    )
+
+
+@router.post("/holds", response_model=project.placeHold_service.HoldResponse)
+async def api_post_placeHold(
+    userId: int, professionalId: int, slotId: int
+) -> project.placeHold_service.HoldResponse:
+    """
+    Holds a slot for a few minutes while the user completes the booking form, so that nobody else can take it in the meantime. Pass the returned hold id to the booking.
+    """
+    return await project.placeHold_service.placeHold(userId, professionalId, slotId)
+
+
+@router.delete(
+    "/holds/{holdId}", response_model=project.releaseHold_service.ReleaseHoldResponse
+)
+async def api_delete_releaseHold(
+    holdId: str, userId: int
+) -> project.releaseHold_service.ReleaseHoldResponse:
+    """
+    Releases a held slot before the hold expires, e.g. when the user leaves the booking form.
+    """
+    return await project.releaseHold_service.releaseHold(holdId, userId)
+
+
+@router.post(
+    "/bookings/confirm",
+    response_model=project.confirmBookings_service.ConfirmBookingsResponse,
+)
+async def api_post_confirmBookings(
+    professionalId: int,
+    decision: Literal["confirm", "decline"],
+    bookingIds: List[int],
+) -> project.confirmBookings_service.ConfirmBookingsResponse:
+    """
+    Lets a professional confirm or decline many pending bookings at once, e.g. after reviewing the day's requests. The booking IDs are sent as a JSON list in the body.
+    """
+    return await project.confirmBookings_service.confirmBookings(
+        professionalId, decision, bookingIds
+    )
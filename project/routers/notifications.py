@@ -0,0 +1,80 @@
+"""
+Routes managing users' notifications.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+import prisma.enums
+import project.createNotification_service
+import project.deleteNotification_service
+import project.fetchNotifications_service
+import project.responses
+import project.updateNotificationStatus_service
+from fastapi import APIRouter
+
+router = APIRouter(tags=["notifications"])
+
+
+@router.patch(
+    "/notifications/{id}",
+    response_model=project.updateNotificationStatus_service.UpdateNotificationStatusResponse,
+)
+async def api_patch_updateNotificationStatus(
+    id: int, read: bool, updater_role: prisma.enums.Role
+) -> project.updateNotificationStatus_service.UpdateNotificationStatusResponse:
+    """
+    Updates the status of a specific notification, typically from 'unread' to 'read'. This API is essential for maintaining the relevance and currentness of user interfaces, ensuring that users have an accurate count of new versus reviewed notifications.
+    """
+    return await project.updateNotificationStatus_service.updateNotificationStatus(
+        id, read, updater_role
+    )
+
+
+@router.delete(
+    "/notifications/{id}",
+    response_model=project.deleteNotification_service.DeleteNotificationResponse,
+)
+async def api_delete_deleteNotification(
+    id: int,
+) -> project.deleteNotification_service.DeleteNotificationResponse:
+    """
+    Deletes a specific notification. This route is available for users to manage their notification clutter, removing older or irrelevant notifications from their view.
+    """
+    return await project.deleteNotification_service.deleteNotification(id)
+
+
+@router.post(
+    "/notifications",
+    response_model=project.createNotification_service.NotificationCreationResponse,
+)
+async def api_post_createNotification(
+    notificationType: str, recipientIds: List[int], messageContent: str
+) -> project.createNotification_service.NotificationCreationResponse:
+    """
+    Creates a new notification. This route is triggered by changes in the Schedule Management system, such as booking confirmations, changes, or cancellations. It requires details like the type of notification, recipient IDs, and message content. This route uses internal logic to determine how and when to send the notification, ensuring users receive updates in real time.
+    """
+    return await project.createNotification_service.createNotification(
+        notificationType, recipientIds, messageContent
+    )
+
+
+@router.get(
+    "/notifications",
+    response_model=project.fetchNotifications_service.GetNotificationsResponse,
+)
+async def api_get_fetchNotifications(
+    user_id: int,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> project.responses.ModelResponse:
+    """
+    Retrieves a list of notifications for a user. Users can query their notifications based on status (read/unread), type, or date. This route helps users stay informed by allowing them to review past notifications and updates.
+    """
+    return project.responses.ModelResponse(
+        await project.fetchNotifications_service.fetchNotifications(
+            user_id, status, type, start_date, end_date
+        )
+    )
@@ -0,0 +1,166 @@
+"""
+Routes creating, listing, changing and deleting professionals' schedule slots.
+"""
+
+from datetime import datetime
+from typing import Literal, Optional
+
+import prisma.enums
+import prisma.models
+import project.auth
+import project.createSchedule_service
+import project.deleteSchedule_service
+import project.exportSchedule_service
+import project.getScheduleFeed_service
+import project.listSchedules_service
+import project.responses
+import project.updateSchedule_service
+import project.versions
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response, StreamingResponse
+
+router = APIRouter(tags=["schedules"])
+
+
+_EXPORT_MEDIA_TYPES = {
+    "ics": "text/calendar; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _export(
+    http_request: Request,
+    professionalId: int,
+    format: Literal["ics", "csv"],
+    token: Optional[str],
+    startDate: Optional[datetime],
+    endDate: Optional[datetime],
+) -> Response:
+    project.auth.check_feed_token(professionalId, token)
+    etag = project.versions.etag(professionalId)
+    unchanged = project.responses.not_modified(http_request, etag)
+    if unchanged is not None:
+        return unchanged
+    return StreamingResponse(
+        project.exportSchedule_service.exportSchedule(
+            professionalId, format, startDate, endDate
+        ),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={
+            "ETag": etag,
+            "Content-Disposition": f'attachment; filename="schedule-{professionalId}.{format}"',
+        },
+    )
+
+
+# Registered before /schedules/{professionalId}, which would match them too.
+@router.get("/schedules/{professionalId}.ics", response_class=StreamingResponse)
+async def api_get_exportScheduleIcs(
+    http_request: Request,
+    professionalId: int,
+    token: Optional[str] = None,
+    startDate: Optional[datetime] = None,
+    endDate: Optional[datetime] = None,
+) -> Response:
+    """
+    Exports the schedule of a professional as an iCalendar feed, which calendar apps can subscribe to with the address from /schedules/{professionalId}/feed. Every slot becomes an event summarized as Available, Booking requested, Booked or Unavailable. The feed is streamed, and revalidating it with its ETag costs no database query while the schedule is unchanged.
+    """
+    return _export(http_request, professionalId, "ics", token, startDate, endDate)
+
+
+@router.get("/schedules/{professionalId}.csv", response_class=StreamingResponse)
+async def api_get_exportScheduleCsv(
+    http_request: Request,
+    professionalId: int,
+    token: Optional[str] = None,
+    startDate: Optional[datetime] = None,
+    endDate: Optional[datetime] = None,
+) -> Response:
+    """
+    Exports the schedule of a professional as CSV, at the address from /schedules/{professionalId}/feed, one row per slot with its times, whether it is active and its booking status. The file is streamed, and revalidating it with its ETag costs no database query while the schedule is unchanged.
+    """
+    return _export(http_request, professionalId, "csv", token, startDate, endDate)
+
+
+@router.get(
+    "/schedules/{professionalId}/feed",
+    response_model=project.getScheduleFeed_service.ScheduleFeedResponse,
+)
+async def api_get_getScheduleFeed(
+    professionalId: int,
+    admin: prisma.models.User = Depends(project.auth.require_admin),
+) -> project.getScheduleFeed_service.ScheduleFeedResponse:
+    """
+    Returns the private addresses of the iCalendar and CSV exports of a professional's schedule, to hand to the professional. Admins only: send an admin's token from POST /auth/login as a Bearer token.
+    """
+    return await project.getScheduleFeed_service.getScheduleFeed(professionalId)
+
+
+@router.get(
+    "/schedules/{professionalId}",
+    response_model=project.listSchedules_service.ScheduleResponse,
+)
+async def api_get_listSchedules(professionalId: int, http_request: Request) -> Response:
+    """
+    Lists all schedule entries for a specific professional by their ID. This is useful for professionals or admins to get a comprehensive view of all booked activities and times. It helps in planning and verifying availability for new bookings.
+    """
+    etag = project.versions.etag(professionalId)
+    unchanged = project.responses.not_modified(http_request, etag)
+    if unchanged is not None:
+        return unchanged
+    return project.responses.ModelResponse(
+        await project.listSchedules_service.listSchedules(professionalId),
+        headers={"ETag": etag},
+    )
+
+
+@router.put(
+    "/schedules/{scheduleId}",
+    response_model=project.updateSchedule_service.UpdateScheduleResponse,
+)
+async def api_put_updateSchedule(
+    scheduleId: int,
+    startTime: datetime,
+    endTime: datetime,
+    professionalId: int,
+    activity: str,
+) -> project.updateSchedule_service.UpdateScheduleResponse:
+    """
+    Updates an existing schedule entry identified by the schedule ID. It requires complete or partial schedule details for updates such as changing the time slot, modifying the associated activity, or altering the professional linked with the schedule entry. Each update sends a notification via the Notification Engine to inform relevant stakeholders of the schedule change.
+    """
+    return await project.updateSchedule_service.updateSchedule(
+        scheduleId, startTime, endTime, professionalId, activity
+    )
+
+
+@router.delete(
+    "/schedules/{scheduleId}",
+    response_model=project.deleteSchedule_service.DeleteScheduleResponse,
+)
+async def api_delete_deleteSchedule(
+    scheduleId: int, requesterRole: prisma.enums.Role
+) -> project.deleteSchedule_service.DeleteScheduleResponse:
+    """
+    Removes a schedule entry from the system using the schedule ID. This operation must ensure that it cleans up all associated data and releases any booked resources or slots. Notifications are sent to affected parties to advise them of the cancellation.
+    """
+    return await project.deleteSchedule_service.deleteSchedule(
+        scheduleId, requesterRole
+    )
+
+
+@router.post(
+    "/schedules", response_model=project.createSchedule_service.CreateScheduleResponse
+)
+async def api_post_createSchedule(
+    professionalId: int,
+    startTime: datetime,
+    endTime: datetime,
+    activityType: str,
+    isActive: bool,
+) -> project.createSchedule_service.CreateScheduleResponse:
+    """
+    Enables the creation of a new schedule entry for a professional. It accepts details such as time slots, professional ID, and activity type. This endpoint requires proper validations to avoid conflicts in the scheduling logic. Upon successful creation, it triggers an interaction with the Notification Engine to alert the professional of a new schedule entry.
+    """
+    return await project.createSchedule_service.createSchedule(
+        professionalId, startTime, endTime, activityType, isActive
+    )
@@ -0,0 +1,209 @@
+"""
+Routes managing user accounts, profiles and favorite professionals.
+"""
+
+from typing import List, Optional
+
+import prisma.enums
+import project.addUserFavorite_service
+import project.createUser_service
+import project.createUserProfile_service
+import project.deleteUser_service
+import project.deleteUserProfile_service
+import project.getFavoritesAvailability_service
+import project.getPurgeProgress_service
+import project.getUser_service
+import project.getUserProfile_service
+import project.importUsers_service
+import project.listUserFavorites_service
+import project.removeUserFavorite_service
+import project.responses
+import project.updateUser_service
+import project.updateUserProfile_service
+from fastapi import APIRouter
+
+router = APIRouter(tags=["users"])
+
+
+@router.delete(
+    "/users/{userId}", response_model=project.deleteUser_service.DeleteUserResponseModel
+)
+async def api_delete_deleteUser(
+    userId: int,
+) -> project.deleteUser_service.DeleteUserResponseModel:
+    """
+    Deletes a user account by their userId. This endpoint will permit deletion by the account owner or by an admin. It requires authentication and provides confirmation upon successful deletion or details on why deletion was not allowed.
+    """
+    return await project.deleteUser_service.deleteUser(userId)
+
+
+@router.get(
+    "/purges/{purgeId}",
+    response_model=project.getPurgeProgress_service.PurgeProgressResponse,
+)
+async def api_get_getPurgeProgress(
+    purgeId: str,
+) -> project.getPurgeProgress_service.PurgeProgressResponse:
+    """
+    Reports the progress of deleting a user with a large history in the background, as started by deleting the user or their profile.
+    """
+    return await project.getPurgeProgress_service.getPurgeProgress(purgeId)
+
+
+@router.delete(
+    "/user/profile",
+    response_model=project.deleteUserProfile_service.DeleteUserProfileResponse,
+)
+async def api_delete_deleteUserProfile(
+    userId: int,
+) -> project.deleteUserProfile_service.DeleteUserProfileResponse:
+    """
+    Deletes a user profile, removing all associated data including booked appointments and favorites. Confirms the deletion with a success message.
+    """
+    return await project.deleteUserProfile_service.deleteUserProfile(userId)
+
+
+@router.get(
+    "/users/{userId}", response_model=project.getUser_service.UserProfileResponse
+)
+async def api_get_getUser(
+    userId: int,
+) -> project.getUser_service.UserProfileResponse:
+    """
+    Retrieves details of a specific user by their unique identifier (userId). This is used to allow a user or admin to view user profiles. If the user is looking up their own profile, it returns the full profile; if an admin is viewing, it includes additional administrative fields.
+    """
+    return await project.getUser_service.getUser(userId)
+
+
+@router.get(
+    "/user/favorites",
+    response_model=project.listUserFavorites_service.FavoritesResponse,
+)
+async def api_get_listUserFavorites(
+    user_id: int,
+) -> project.listUserFavorites_service.FavoritesResponse:
+    """
+    Lists all favorite professionals of the user, pulled from their profile. Includes professional IDs and basic contact info. Useful for quickly accessing preferred professionals.
+    """
+    return await project.listUserFavorites_service.listUserFavorites(user_id)
+
+
+@router.get(
+    "/user/favorites/availability",
+    response_model=project.getFavoritesAvailability_service.FavoritesAvailabilityResponse,
+)
+async def api_get_getFavoritesAvailability(
+    user_id: int,
+) -> project.responses.ModelResponse:
+    """
+    Lists the user's favorite professionals with whether each is available now and their current and next free slot, in one request instead of one availability check per favorite.
+    """
+    return project.responses.ModelResponse(
+        await project.getFavoritesAvailability_service.getFavoritesAvailability(user_id)
+    )
+
+
+@router.delete(
+    "/user/favorites",
+    response_model=project.removeUserFavorite_service.RemoveFavoriteResponse,
+)
+async def api_delete_removeUserFavorite(
+    userId: int, professionalId: int
+) -> project.removeUserFavorite_service.RemoveFavoriteResponse:
+    """
+    Removes a professional from the user's list of favorites. Needs the professional's ID for removal. Confirms the removal with an updated list of favorites.
+    """
+    return await project.removeUserFavorite_service.removeUserFavorite(
+        userId, professionalId
+    )
+
+
+@router.post(
+    "/user/profile",
+    response_model=project.createUserProfile_service.UserProfileResponse,
+)
+async def api_post_createUserProfile(
+    userId: int, firstName: str, lastName: str, email: str
+) -> project.createUserProfile_service.UserProfileResponse:
+    """
+    Creates a new user profile with initial details such as user ID, name, and email. Response confirms the creation with the user profile data.
+    """
+    return await project.createUserProfile_service.createUserProfile(
+        userId, firstName, lastName, email
+    )
+
+
+@router.put(
+    "/user/profile",
+    response_model=project.updateUserProfile_service.UserProfileUpdateResponse,
+)
+async def api_put_updateUserProfile(
+    userId: int, email: str, favorites: List[int]
+) -> project.updateUserProfile_service.UserProfileUpdateResponse:
+    """
+    Updates user-specific information such as email or favorite professionals. Requires current user data and the modifications. Returns the updated user profile.
+    """
+    return await project.updateUserProfile_service.updateUserProfile(
+        userId, email, favorites
+    )
+
+
+@router.post("/users", response_model=project.createUser_service.CreateUserResponse)
+async def api_post_createUser(
+    name: str, email: str, password: str, role: prisma.enums.Role
+) -> project.createUser_service.CreateUserResponse:
+    """
+    Creates a new user account. This endpoint will collect user data such as name, email, and password, and store them securely. The response will confirm the creation of the user or provide error messages for invalid inputs. It uses standard security measures like hashing passwords before storage.
+    """
+    return await project.createUser_service.createUser(name, email, password, role)
+
+
+@router.post(
+    "/users/import", response_model=project.importUsers_service.ImportUsersResponse
+)
+async def api_post_importUsers(
+    users: List[project.importUsers_service.UserImportRow],
+) -> project.importUsers_service.ImportUsersResponse:
+    """
+    Creates many user accounts with their profiles from a JSON list, e.g. when onboarding a clinic. Rows that cannot be imported, such as emails already in use, are reported individually while the others are created.
+    """
+    return await project.importUsers_service.importUsers(users)
+
+
+@router.post(
+    "/user/favorites",
+    response_model=project.addUserFavorite_service.AddFavoriteResponse,
+)
+async def api_post_addUserFavorite(
+    user_id: int, professional_id: int
+) -> project.addUserFavorite_service.AddFavoriteResponse:
+    """
+    Adds a professional to the user's list of favorites. Requires the professional's ID. Returns updated list of favorites.
+    """
+    return await project.addUserFavorite_service.addUserFavorite(
+        user_id, professional_id
+    )
+
+
+@router.get(
+    "/user/profile", response_model=project.getUserProfile_service.UserProfileResponse
+)
+async def api_get_getUserProfile(
+    user_id: int,
+) -> project.getUserProfile_service.UserProfileResponse:
+    """
+    Retrieves the user profile data including booked appointments and favorite professionals. It integrates with the Schedule Management to pull the latest booking details. Response includes user ID, name, email, booked appointments, and favorites list.
+    """
+    return await project.getUserProfile_service.getUserProfile(user_id)
+
+
+@router.put(
+    "/users/{userId}", response_model=project.updateUser_service.UserUpdateResponse
+)
+async def api_put_updateUser(
+    userId: str, email: Optional[str], password: Optional[str]
+) -> project.updateUser_service.UserUpdateResponse:
+    """
+    Updates details of a specific user. This allows users to update their own profiles, such as changing their password or email. The endpoint checks for authentication and authorization before permitting the update. It ensures data validation before committing any changes.
+    """
+    return await project.updateUser_service.updateUser(userId, email, password)
@@ -0,0 +1,120 @@
+import os
+
+from dotenv import load_dotenv
+
+# Settings are read at import time, before Prisma loads .env itself.
+load_dotenv()
+
+
+def _int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Debug mode adds an X-Query-Count header with the number of Prisma queries
+# each request made, which makes N+1 query patterns easy to spot.
+DEBUG = _bool("DEBUG", False)
+
+
+# Number of uvicorn worker processes; the Dockerfile passes this to --workers.
+WEB_CONCURRENCY = _int("WEB_CONCURRENCY", 1)
+
+# Key signing the tokens of POST /auth/login and /auth/refresh. Without it no
+# tokens are issued or accepted, so sign-in and the admin routes are disabled.
+JWT_SECRET = os.getenv("JWT_SECRET", "")
+
+# Key signing the tokens in the addresses of schedule exports, kept apart from
+# JWT_SECRET. Without it the exports are disabled.
+SCHEDULE_FEED_SECRET = os.getenv("SCHEDULE_FEED_SECRET", "")
+
+# Postgres channel used to broadcast change events between workers.
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "availability_events")
+EVENTS_RECONNECT_SECONDS = _float("EVENTS_RECONNECT_SECONDS", 2.0)
+EVENTS_KEEPALIVE_SECONDS = _float("EVENTS_KEEPALIVE_SECONDS", 30.0)
+
+# Prisma connection pool, per worker process: the database sees up to
+# WEB_CONCURRENCY * DB_POOL_SIZE connections. 0 keeps Prisma's defaults
+# (num_cpus * 2 + 1 connections, 10s pool timeout, no query timeout).
+DB_POOL_SIZE = _int("DB_POOL_SIZE", 0)
+DB_POOL_TIMEOUT_SECONDS = _int("DB_POOL_TIMEOUT_SECONDS", 0)
+DB_QUERY_TIMEOUT_SECONDS = _int("DB_QUERY_TIMEOUT_SECONDS", 0)
+# How often every worker updates its connection pool gauges for /metrics.
+DB_POOL_METRICS_INTERVAL_SECONDS = _float("DB_POOL_METRICS_INTERVAL_SECONDS", 5.0)
+
+# Optional streaming replica for read-only services. Reads about a user or
+# professional go to the primary for REPLICA_STICKY_SECONDS after one of
+# their own writes, so they never see data older than their last change.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "")
+REPLICA_STICKY_SECONDS = _float("REPLICA_STICKY_SECONDS", 5.0)
+
+# Prisma queries slower than this are logged with the service that made them.
+SLOW_QUERY_MS = _float("SLOW_QUERY_MS", 200.0)
+
+# Longest time GET /analytics/utilization serves a cached result. Results are
+# also dropped whenever a schedule or booking changes.
+ANALYTICS_CACHE_SECONDS = _float("ANALYTICS_CACHE_SECONDS", 300.0)
+
+# Longest time a worker keeps a user's favorite professionals cached. They are
+# also dropped whenever the user changes.
+FAVORITES_CACHE_SECONDS = _float("FAVORITES_CACHE_SECONDS", 300.0)
+
+# Admission control, per worker process (see project.admission). Rates are
+# requests per second and 0 disables the bucket: ADMISSION_CLIENT_* limits every
+# client address, ADMISSION_GLOBAL_* the worker as a whole, of which the last
+# ADMISSION_BOOKING_RESERVE share is kept for booking writes.
+ADMISSION_CLIENT_RATE = _float("ADMISSION_CLIENT_RATE", 0.0)
+ADMISSION_CLIENT_BURST = _int("ADMISSION_CLIENT_BURST", 20)
+ADMISSION_GLOBAL_RATE = _float("ADMISSION_GLOBAL_RATE", 0.0)
+ADMISSION_GLOBAL_BURST = _int("ADMISSION_GLOBAL_BURST", 200)
+ADMISSION_BOOKING_RESERVE = _float("ADMISSION_BOOKING_RESERVE", 0.2)
+# Concurrent requests per worker for the expensive routes; 0 means unlimited.
+ADMISSION_AVAILABILITY_ALL_CONCURRENCY = _int(
+    "ADMISSION_AVAILABILITY_ALL_CONCURRENCY", 4
+)
+ADMISSION_ANALYTICS_CONCURRENCY = _int("ADMISSION_ANALYTICS_CONCURRENCY", 2)
+ADMISSION_IMPORT_CONCURRENCY = _int("ADMISSION_IMPORT_CONCURRENCY", 1)
+
+# Slot holds taken during checkout (POST /holds): how long they last and how
+# many a user may have at once.
+HOLD_TTL_SECONDS = _float("HOLD_TTL_SECONDS", 300.0)
+HOLD_MAX_PER_USER = _int("HOLD_MAX_PER_USER", 3)
+
+# Bookings still PENDING after BOOKING_PENDING_TTL_SECONDS are cancelled by the
+# sweeper, which looks for them every BOOKING_SWEEP_INTERVAL_SECONDS and expires
+# at most BOOKING_SWEEP_BATCH_SIZE per transaction. A TTL of 0 disables it.
+BOOKING_PENDING_TTL_SECONDS = _float("BOOKING_PENDING_TTL_SECONDS", 86400.0)
+BOOKING_SWEEP_INTERVAL_SECONDS = _float("BOOKING_SWEEP_INTERVAL_SECONDS", 60.0)
+BOOKING_SWEEP_BATCH_SIZE = _int("BOOKING_SWEEP_BATCH_SIZE", 500)
+
+# Users with at most PURGE_INLINE_MAX_ROWS bookings and notifications are deleted
+# in one transaction, others by a background job deleting PURGE_CHUNK_SIZE rows
+# per statement.
+PURGE_INLINE_MAX_ROWS = _int("PURGE_INLINE_MAX_ROWS", 5000)
+PURGE_CHUNK_SIZE = _int("PURGE_CHUNK_SIZE", 1000)
+
+# Processes hashing passwords for each worker (see project.passwords), and the
+# most users a single bulk import request may create.
+PASSWORD_HASH_PROCESSES = _int("PASSWORD_HASH_PROCESSES", min(4, os.cpu_count() or 1))
+USER_IMPORT_MAX_ROWS = _int("USER_IMPORT_MAX_ROWS", 5000)
+
+# bcrypt cost of new password hashes. With BCRYPT_TARGET_MS set, every worker
+# measures at startup the highest cost (at least BCRYPT_MIN_ROUNDS) that hashes
+# within that many milliseconds and uses it instead. Logins rehash passwords
+# stored with another cost in the background, at most PASSWORD_REHASH_CONCURRENCY
+# at a time per worker; the others are rehashed on a later login.
+BCRYPT_ROUNDS = _int("BCRYPT_ROUNDS", 12)
+BCRYPT_TARGET_MS = _float("BCRYPT_TARGET_MS", 0.0)
+BCRYPT_MIN_ROUNDS = _int("BCRYPT_MIN_ROUNDS", 10)
+PASSWORD_REHASH_CONCURRENCY = _int("PASSWORD_REHASH_CONCURRENCY", 1)
@@ -0,0 +1,69 @@
+"""
+Coalescing of concurrent identical calls.
+
+A :class:`Group` runs at most one call per key at a time: callers arriving while
+a call with the same key is in flight wait for it and share its result (or its
+exception) instead of starting their own. Nothing is cached, the next caller
+after the call finished starts a new one, so results are exactly as fresh as
+without coalescing. This only helps within one worker process.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+import project.metrics
+
+T = TypeVar("T")
+
+
+class Group:
+    """
+    A namespace of in-flight calls, usually one per service function.
+
+    Args:
+        name (str): Label of the group in the ``singleflight_calls`` metric.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Returns the result of ``call()``, or of the call already in flight for the same key.
+
+        The call runs in its own task, so a caller that is cancelled (e.g. because its
+        client disconnected) stops waiting without cancelling it for the others.
+
+        Args:
+            key (Hashable): Identifies identical calls, e.g. their normalized arguments.
+            call (Callable[[], Awaitable[T]]): Starts the call when none is in flight.
+
+        Returns:
+            T: The result of the call.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            project.metrics.SINGLEFLIGHT_CALLS.labels(self.name, "leader").inc()
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            project.metrics.SINGLEFLIGHT_CALLS.labels(self.name, "shared").inc()
+        return await asyncio.shield(task)
+
+    def reset(self) -> None:
+        """
+        Makes callers arriving from now on start new calls instead of joining the
+        ones in flight, which keep running for the callers already waiting. Used when
+        the data changed, as calls in flight may have read it before the change.
+        """
+        self._calls.clear()
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Nobody may be waiting any more if all callers were cancelled; reading
+        # the exception keeps asyncio from logging it as never retrieved.
+        if not task.cancelled():
+            task.exception()
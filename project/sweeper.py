@@ -0,0 +1,116 @@
+"""
+Expiry of stale pending bookings.
+
+Bookings are created PENDING and wait for the professional to confirm or
+decline them (``POST /bookings/confirm``). Those still pending after
+BOOKING_PENDING_TTL_SECONDS are cancelled by :func:`run`, which the app starts
+in every worker. Each batch of at most BOOKING_SWEEP_BATCH_SIZE bookings is
+expired in its own transaction under a Postgres advisory lock, so only one
+worker sweeps at a time and a batch never holds row locks for long. Bookings
+locked by a confirmation or decline in progress are skipped, and left to it.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.events
+import project.settings
+
+logger = logging.getLogger(__name__)
+
+# Key of the transaction-level advisory lock serializing sweeps across workers.
+ADVISORY_LOCK_KEY = 0x50454E44  # "PEND"
+
+
+async def sweep_once() -> int:
+    """
+    Cancels one batch of bookings pending for longer than BOOKING_PENDING_TTL_SECONDS
+    and notifies their users.
+
+    Returns:
+        int: The number of bookings expired, 0 if another worker holds the lock.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=project.settings.BOOKING_PENDING_TTL_SECONDS
+    )
+    async with prisma.get_client().tx(timeout=timedelta(seconds=60)) as tx:
+        locked = await tx.query_first(
+            "SELECT pg_try_advisory_xact_lock($1) AS locked", ADVISORY_LOCK_KEY
+        )
+        if not locked or not locked["locked"]:
+            return 0
+        # Locked until the end of the transaction, the bookings stay pending for
+        # the update below, so every one of them is expired by this sweep.
+        rows = await tx.query_raw(
+            """
+            SELECT id
+            FROM "Booking"
+            WHERE status = 'PENDING' AND "createdAt" < $1::text::timestamp
+            ORDER BY id
+            LIMIT $2
+            FOR UPDATE SKIP LOCKED
+            """,
+            cutoff.replace(tzinfo=None).isoformat(),
+            project.settings.BOOKING_SWEEP_BATCH_SIZE,
+        )
+        if not rows:
+            return 0
+        stale = await prisma.models.Booking.prisma(tx).find_many(
+            where={"id": {"in": [row["id"] for row in rows]}},
+            include={"slot": True},
+            order={"id": "asc"},
+        )
+        await prisma.models.Booking.prisma(tx).update_many(
+            where={
+                "id": {"in": [booking.id for booking in stale]},
+                "status": prisma.enums.BookingStatus.PENDING,
+            },
+            data={"status": prisma.enums.BookingStatus.CANCELLED},
+        )
+        await prisma.models.Notification.prisma(tx).create_many(
+            data=[
+                {
+                    "userId": booking.userId,
+                    "message": f"CANCELLATION: Your booking #{booking.id} expired before it was confirmed.",
+                }
+                for booking in stale
+            ]
+        )
+    users_by_professional: Dict[int, List[int]] = defaultdict(list)
+    for booking in stale:
+        if booking.slot is not None:
+            users_by_professional[booking.slot.professionalId].append(booking.userId)
+    for professional_id, user_ids in users_by_professional.items():
+        await project.events.publish(
+            project.events.BOOKING_CHANGED,
+            professionalId=professional_id,
+            userIds=sorted(set(user_ids)),
+        )
+    await project.events.publish(
+        project.events.NOTIFICATION_CHANGED,
+        userIds=sorted({booking.userId for booking in stale}),
+    )
+    logger.info("Expired %d pending bookings", len(stale))
+    return len(stale)
+
+
+async def run() -> None:
+    """
+    Expires stale pending bookings every BOOKING_SWEEP_INTERVAL_SECONDS, batch after
+    batch until none are left. Runs until cancelled.
+    """
+    while True:
+        try:
+            while await sweep_once() >= project.settings.BOOKING_SWEEP_BATCH_SIZE:
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Failed to expire pending bookings")
+        await asyncio.sleep(project.settings.BOOKING_SWEEP_INTERVAL_SECONDS)
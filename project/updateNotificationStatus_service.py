@@ -1,5 +1,6 @@
 import prisma
 import prisma.models
+import project.events
 from pydantic import BaseModel
 
 
@@ -44,7 +45,10 @@ async def updateNotificationStatus(
     if notification is None:
         raise ValueError("Notification not found with the specified ID.")
     updated_notification = await prisma.models.Notification.prisma().update(
-        {"where": {"id": id}, "data": {"read": read}}
+        where={"id": id}, data={"read": read}
+    )
+    await project.events.publish(
+        project.events.NOTIFICATION_CHANGED, userIds=[updated_notification.userId]
     )
     return UpdateNotificationStatusResponse(
         id=updated_notification.id, read=updated_notification.read
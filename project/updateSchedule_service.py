@@ -2,6 +2,7 @@ from datetime import datetime
 
 import prisma
 import prisma.models
+import project.events
 from pydantic import BaseModel
 
 
@@ -76,6 +77,15 @@ async def updateSchedule(
             "read": False,
         }
     )
+    for affected_professional_id in {slot.professionalId, updated_slot.professionalId}:
+        await project.events.publish(
+            project.events.SCHEDULE_CHANGED,
+            professionalId=affected_professional_id,
+            slotId=scheduleId,
+        )
+    await project.events.publish(
+        project.events.NOTIFICATION_CHANGED, userIds=[notification.userId]
+    )
     notification_model = Notification(
         id=notification.id,
         userId=notification.userId,
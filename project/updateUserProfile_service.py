@@ -2,6 +2,7 @@ from typing import List
 
 import prisma
 import prisma.models
+import project.events
 from pydantic import BaseModel
 
 
@@ -46,6 +47,7 @@ async def updateUserProfile(
         },
         include={"profiles": {"include": {"favorites": True}}},
     )
+    await project.events.publish(project.events.USER_CHANGED, userId=userId)
     updated_profile = updated_user.profiles[0]
     favorites_ids = [f.id for f in updated_profile.favorites]
     return UserProfileUpdateResponse(
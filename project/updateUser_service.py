@@ -2,6 +2,7 @@ from typing import Optional
 
 import prisma
 import prisma.models
+import project.events
 from pydantic import BaseModel
 
 
@@ -66,6 +67,7 @@ async def updateUser(
             message=f"Failed to update user due to error: {str(e)}",
             updatedDetails=None,
         )
+    await project.events.publish(project.events.USER_CHANGED, userId=updated_user.id)
     updated_details = UpdatedUserDetails(
         email=updated_user.email, userId=str(updated_user.id)
     )
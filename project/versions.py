@@ -0,0 +1,90 @@
+"""
+Version counters of the data behind the availability and schedule listings,
+used as ETags so that clients can revalidate them without a download.
+
+Schedule, booking and hold events carry a version from a Postgres sequence
+shared by all workers (see project.events.VERSION_SEQUENCE). Every worker
+keeps the highest version it has seen, per professional and in total, so a
+version changes whenever the data it covers may have, and workers that have
+applied the same events issue the same ETags: a client revalidating with
+another worker or container, or after a restart, still gets its 304.
+
+When the event listener (re)connects, events may have been missed, so the
+sequence's current value becomes the least version of every professional.
+Until then, and after a change that could not be numbered, ETags carry the
+worker's id and never match those of other workers.
+
+Holds expire without an event, so ETags of listings that leave held slots out
+also cover the set of slots held at the time.
+"""
+
+from typing import Any, Dict, Optional
+
+import project.events
+import project.holds
+
+_total = 0
+_floor = 0
+_by_professional: Dict[int, int] = {}
+# Changes applied without a shared version since the last sync; 1 before the first.
+_unshared = 1
+
+
+def _bump(payload: Dict[str, Any]) -> None:
+    global _total, _unshared
+    version = payload.get("version")
+    if version is None:
+        _unshared += 1
+        return
+    _total = max(_total, version)
+    professional_id = payload.get("professionalId")
+    if professional_id is not None:
+        _by_professional[professional_id] = max(
+            _by_professional.get(professional_id, 0), version
+        )
+
+
+def _sync(payload: Dict[str, Any]) -> None:
+    global _total, _floor, _unshared
+    version = payload.get("version")
+    if version is None:
+        _unshared += 1
+        return
+    _floor = max(_floor, version)
+    _total = max(_total, version)
+    _unshared = 0
+
+
+project.events.subscribe(project.events.SCHEDULE_CHANGED, _bump)
+project.events.subscribe(project.events.BOOKING_CHANGED, _bump)
+project.events.subscribe(project.events.HOLD_PLACED, _bump)
+project.events.subscribe(project.events.HOLD_RELEASED, _bump)
+project.events.subscribe(project.events.RESYNC, _sync)
+
+
+def etag(professional_id: Optional[int] = None, holds: bool = False) -> str:
+    """
+    Returns the ETag of data of one professional, or of all professionals. It must be
+    taken before the data is read, so that a change made meanwhile is not missed.
+
+    Args:
+        professional_id (Optional[int]): The professional, or None for all of them.
+        holds (bool): Whether the data leaves held slots out.
+
+    Returns:
+        str: A weak ETag, quoted as sent in the header.
+    """
+    if professional_id is None:
+        version = f"{_total}"
+    else:
+        version = f"{max(_floor, _by_professional.get(professional_id, 0))}"
+    if holds:
+        held = (
+            project.holds.held_slot_ids()
+            if professional_id is None
+            else [hold.slotId for hold in project.holds.held_slots(professional_id)]
+        )
+        version += f".{hash(frozenset(held)) & 0xFFFFFFFF:x}"
+    if _unshared:
+        version = f"{project.events.WORKER_ID[:12]}.{_unshared}.{version}"
+    return f'W/"{version}"'